@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 import json
+import mmap
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def load_json_safe(filepath):
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if orjson is not None:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+                return json.loads(mm[:])
     except:
         return {}
 
@@ -32,30 +42,34 @@ report = {
     "details": {}
 }
 
+# Scan-file name fragment -> (key path to the issue list, details key, summary bucket)
+HANDLERS = {
+    'safety-results': (['vulnerabilities'], 'python_vulnerabilities', 'high_issues'),
+    'bandit-results': (['results'], 'security_issues', 'medium_issues'),
+    'checkov-results': (['results', 'failed_checks'], 'infrastructure_issues', 'medium_issues'),
+}
+
+def iter_json_files(path):
+    try:
+        entries = os.scandir(path)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_json_files(entry.path)
+            elif entry.name.endswith('.json'):
+                yield entry
+
 # Check all security scan results
-for root, dirs, files in os.walk("security-results"):
-    for file in files:
-        if file.endswith('.json'):
-            filepath = os.path.join(root, file)
-            data = load_json_safe(filepath)
-            
-            if 'safety-results' in file:
-                vulns = count_issues(data, ['vulnerabilities'])
-                report["details"]["python_vulnerabilities"] = vulns
-                if vulns > 0:
-                    report["summary"]["high_issues"] += vulns
-                    
-            elif 'bandit-results' in file:
-                issues = count_issues(data, ['results'])
-                report["details"]["security_issues"] = issues
-                if issues > 0:
-                    report["summary"]["medium_issues"] += issues
-                    
-            elif 'checkov-results' in file:
-                failed = count_issues(data, ['results', 'failed_checks'])
-                report["details"]["infrastructure_issues"] = failed
-                if failed > 0:
-                    report["summary"]["medium_issues"] += failed
+for scan_file in iter_json_files("security-results"):
+    for fragment, (key_path, detail, bucket) in HANDLERS.items():
+        if fragment in scan_file.name:
+            count = count_issues(load_json_safe(scan_file.path), key_path)
+            report["details"][detail] = count
+            if count > 0:
+                report["summary"][bucket] += count
+            break
 
 # Determine overall compliance status
 total_critical = report["summary"]["critical_issues"]
@@ -0,0 +1,126 @@
+"""
+Compiled kernels for the arbitrage scanner.
+
+The inner best-price / profit reduction runs over pre-flattened, CSR-style
+arrays (see ``app.arbitrage._flatten_events``).  When Numba is installed the
+reduction is JIT-compiled to a native loop; otherwise an equivalent NumPy
+implementation is used.  Both paths return identical results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _NUMBA_AVAILABLE = False
+
+
+def implied_probs(prices: np.ndarray) -> np.ndarray:
+    """Vectorized, branchless ``american_to_implied_prob``."""
+    p = prices.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(p > 0, 100.0 / (p + 100.0), -p / (100.0 - p))
+
+
+def _best_and_profit_numpy(
+    prices: np.ndarray,
+    group_starts: np.ndarray,
+    market_starts: np.ndarray,
+    max_total: float = np.inf,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy fallback for :func:`best_and_profit` (always reduces every market)."""
+    n_groups = group_starts.size - 1
+    implied = implied_probs(prices)
+
+    # Best line per outcome = lowest implied prob; lexsort is stable so the
+    # first line wins ties, matching the scalar loop.
+    group_ids = np.repeat(np.arange(n_groups), np.diff(group_starts))
+    order = np.lexsort((implied, group_ids))
+    best_idx = order[group_starts[:-1]]
+
+    totals = np.add.reduceat(implied[best_idx], market_starts[:-1])
+    with np.errstate(divide="ignore"):
+        profits = np.where(totals > 0, (1.0 / totals - 1.0) * 100.0, -100.0)
+    return best_idx, totals, profits
+
+
+def _implied_scalar(price):
+    if price > 0:
+        return 100.0 / (price + 100.0)
+    return -price / (100.0 - price)
+
+
+def _best_and_profit_loop(prices, group_starts, market_starts, max_total=np.inf):
+    n_groups = group_starts.size - 1
+    n_markets = market_starts.size - 1
+    best_idx = np.empty(n_groups, dtype=np.int64)
+    totals = np.empty(n_markets, dtype=np.float64)
+    profits = np.empty(n_markets, dtype=np.float64)
+
+    for m in range(n_markets):
+        total = 0.0
+        for g in range(market_starts[m], market_starts[m + 1]):
+            if total > max_total:
+                # Past the threshold already; the remaining outcomes can
+                # only push the total higher, so skip them.
+                best_idx[g] = -1
+                continue
+            start = group_starts[g]
+            best = start
+            best_implied = _implied_scalar(prices[start])
+            for i in range(start + 1, group_starts[g + 1]):
+                implied = _implied_scalar(prices[i])
+                if implied < best_implied:
+                    best = i
+                    best_implied = implied
+            best_idx[g] = best
+            total += best_implied
+        totals[m] = total
+        profits[m] = (1.0 / total - 1.0) * 100.0 if total > 0 else -100.0
+
+    return best_idx, totals, profits
+
+
+if _NUMBA_AVAILABLE:
+    _implied_scalar = njit(cache=True)(_implied_scalar)
+    _best_and_profit = njit(cache=True)(_best_and_profit_loop)
+else:
+    _best_and_profit = _best_and_profit_numpy
+
+
+def best_and_profit(
+    prices: np.ndarray,
+    group_starts: np.ndarray,
+    market_starts: np.ndarray,
+    max_total: float = np.inf,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the best line per outcome and the arbitrage profit per market.
+
+    A market whose running implied total exceeds ``max_total`` may be cut
+    short: its total and profit are then partial (a lower / upper bound
+    respectively) and its remaining outcomes get a best index of -1.
+
+    Args:
+        prices: int32 American odds, sorted by (market, outcome).
+        group_starts: int32 CSR offsets of each outcome segment in ``prices``
+            (length n_outcomes + 1).
+        market_starts: int32 CSR offsets of each market's outcome segments
+            in ``group_starts`` (length n_markets + 1).
+        max_total: Implied total above which a market is of no interest.
+
+    Returns:
+        (best_idx per outcome, total implied prob per market, profit % per market)
+    """
+    return _best_and_profit(prices, group_starts, market_starts, max_total)
+
+
+if _NUMBA_AVAILABLE:
+    # Warm up the JIT so the first real scan isn't charged compile time.
+    best_and_profit(
+        np.array([150, -200, -300, 120], dtype=np.int32),
+        np.array([0, 2, 4], dtype=np.int32),
+        np.array([0, 2], dtype=np.int32),
+        1.0,
+    )
@@ -0,0 +1,150 @@
+"""
+Compiled kernels for the value-bet detector.
+
+``compute_value_edges`` turns each side's best price and our probability
+into implied probability, edge and Kelly stake in one pass;
+``kelly_batch`` sizes many bets at once (backtests, ``min_edge`` sweeps).
+When Numba is installed both are JIT-compiled to parallel native loops;
+otherwise equivalent NumPy implementations are used.  Both paths return
+the same results as the scalar helpers in ``app.arbitrage`` and
+``app.value_bets.kelly_criterion``.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _NUMBA_AVAILABLE = False
+    prange = range
+
+KELLY_FRACTION = 0.25  # quarter Kelly
+KELLY_CAP = 0.25
+
+
+def _kelly_batch_numpy(probs: np.ndarray, decimals: np.ndarray) -> np.ndarray:
+    """NumPy fallback for :func:`kelly_batch`."""
+    probs = np.asarray(probs, dtype=np.float64)
+    decimals = np.asarray(decimals, dtype=np.float64)
+    valid = (decimals > 1.0) & (probs > 0.0) & (probs < 1.0)
+    b = decimals - 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kelly = (probs * b - (1.0 - probs)) / b
+    return np.where(valid, np.clip(kelly * KELLY_FRACTION, 0.0, KELLY_CAP), 0.0)
+
+
+def _value_edges_numpy(
+    prices: np.ndarray,
+    probs: np.ndarray,
+    min_edge: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy fallback for :func:`compute_value_edges`."""
+    p = prices.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        implied = np.where(p > 0, 100.0 / (p + 100.0), -p / (100.0 - p))
+        decimal = np.where(p > 0, p / 100.0 + 1.0, 100.0 / -p + 1.0)
+    edges = probs - implied
+    mask = (prices != 0) & (edges >= min_edge)
+    kellys = np.where(mask, _kelly_batch_numpy(probs, decimal), 0.0)
+    return implied, edges, kellys, mask
+
+
+def _kelly_scalar(p, d):
+    if d <= 1.0 or p <= 0.0 or p >= 1.0:
+        return 0.0
+    b = d - 1.0
+    kelly = (p * b - (1.0 - p)) / b * KELLY_FRACTION
+    return max(0.0, min(kelly, KELLY_CAP))
+
+
+def _kelly_batch_loop(probs, decimals):
+    out = np.empty(probs.size, dtype=np.float64)
+    for i in prange(probs.size):
+        out[i] = _kelly_scalar(probs[i], decimals[i])
+    return out
+
+
+def _value_edges_loop(prices, probs, min_edge):
+    n = prices.size
+    implied = np.zeros(n, dtype=np.float64)
+    edges = np.zeros(n, dtype=np.float64)
+    kellys = np.zeros(n, dtype=np.float64)
+    mask = np.zeros(n, dtype=np.bool_)
+    for i in prange(n):
+        price = prices[i]
+        if price == 0:  # side not quoted
+            continue
+        if price > 0:
+            imp = 100.0 / (price + 100.0)
+            dec = price / 100.0 + 1.0
+        else:
+            imp = -price / (100.0 - price)
+            dec = 100.0 / -price + 1.0
+        edge = probs[i] - imp
+        implied[i] = imp
+        edges[i] = edge
+        if edge >= min_edge:
+            mask[i] = True
+            kellys[i] = _kelly_scalar(probs[i], dec)
+    return implied, edges, kellys, mask
+
+
+if _NUMBA_AVAILABLE:
+    # Explicit signatures compile eagerly at import (or load the on-disk
+    # cache), so no request pays the JIT cost and no warm-up call is needed.
+    _kelly_scalar = njit("float64(float64, float64)", cache=True)(_kelly_scalar)
+    _kelly_batch = njit("float64[:](float64[:], float64[:])", parallel=True, cache=True)(
+        _kelly_batch_loop
+    )
+    _value_edges = njit(
+        "Tuple((float64[:], float64[:], float64[:], boolean[:]))(int64[:], float64[:], float64)",
+        parallel=True,
+        cache=True,
+    )(_value_edges_loop)
+else:
+    _kelly_batch = _kelly_batch_numpy
+    _value_edges = _value_edges_numpy
+
+
+def compute_value_edges(
+    prices: np.ndarray,
+    probs: np.ndarray,
+    min_edge: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Implied probability, edge and quarter-Kelly stake for each side, in one pass.
+
+    Args:
+        prices: int64 best American price per side; 0 marks a side no book quotes.
+        probs: Our win probability per side, parallel to ``prices``.
+        min_edge: Smallest edge (our prob - implied prob) worth surfacing.
+
+    Returns:
+        (implied prob, edge, Kelly fraction, mask) per side, where ``mask``
+        flags quoted sides with ``edge >= min_edge``.  Kelly is 0 outside
+        the mask; implied and edge are not meaningful for unquoted sides.
+    """
+    return _value_edges(
+        np.ascontiguousarray(prices, dtype=np.int64),
+        np.ascontiguousarray(probs, dtype=np.float64),
+        float(min_edge),
+    )
+
+
+def kelly_batch(probs: np.ndarray, decimals: np.ndarray) -> np.ndarray:
+    """
+    Quarter-Kelly stake fraction for each (win probability, decimal odds) pair.
+
+    Args:
+        probs: Our win probabilities.
+        decimals: Decimal odds offered, parallel to ``probs``.
+
+    Returns:
+        float64 array of stake fractions in [0, 0.25]; 0 where there is no
+        edge or the inputs are out of range.
+    """
+    return _kelly_batch(
+        np.ascontiguousarray(probs, dtype=np.float64),
+        np.ascontiguousarray(decimals, dtype=np.float64),
+    )
@@ -6,10 +6,13 @@ situations where the combined implied probabilities sum to less than 100%,
 guaranteeing a risk-free profit when staked correctly.
 """
 
-import json
+import hashlib
 import logging
 
-from app.models import Event, ArbitrageOpportunity, ArbLeg
+import numpy as np
+
+from app._arb_kernels import best_and_profit, implied_probs
+from app.models import Event, RawArbLeg, RawArbOpportunity, iso_now
 from app.config import settings
 from app.database import save_arbitrage
 
@@ -18,6 +21,23 @@ logger = logging.getLogger(__name__)
 
 # ── Odds math helpers ─────────────────────────────────────────────────
 
+# American odds are integers concentrated in a narrow range, so the
+# conversions are precomputed for every price in [-LUT_MAX, LUT_MAX] and the
+# scalar helpers become a single list index.  Out-of-range and non-int
+# prices (floats, NumPy scalars: unvalidated models may carry them) fall
+# back to the formula.
+_LUT_MAX = 10_000
+_LUT_PRICES = np.arange(-_LUT_MAX, _LUT_MAX + 1, dtype=np.float64)
+with np.errstate(divide="ignore"):
+    _DEC_LUT = np.where(_LUT_PRICES > 0, _LUT_PRICES / 100.0 + 1.0, 100.0 / -_LUT_PRICES + 1.0)
+_DEC_LUT[_LUT_MAX] = np.nan  # 0 is not a valid American price
+_IMP_LUT = implied_probs(_LUT_PRICES)
+_IMP_LUT[_LUT_MAX] = 0.0  # the formula gives 0.0 for a 0 price, not -0.0
+# Python-float copies: indexing a list is cheaper than boxing a NumPy scalar
+_DEC_TABLE: list[float] = _DEC_LUT.tolist()
+_IMP_TABLE: list[float] = _IMP_LUT.tolist()
+
+
 def american_to_implied_prob(price: int) -> float:
     """
     Convert American odds to implied probability.
@@ -25,6 +45,8 @@ def american_to_implied_prob(price: int) -> float:
     +150 → 100 / (150 + 100) = 0.4000
     -130 → 130 / (130 + 100) = 0.5652
     """
+    if type(price) is int and -_LUT_MAX <= price <= _LUT_MAX:
+        return _IMP_TABLE[price + _LUT_MAX]
     if price > 0:
         return 100.0 / (price + 100.0)
     else:
@@ -33,6 +55,8 @@ def american_to_implied_prob(price: int) -> float:
 
 def american_to_decimal(price: int) -> float:
     """Convert American odds to decimal odds."""
+    if type(price) is int and price and -_LUT_MAX <= price <= _LUT_MAX:
+        return _DEC_TABLE[price + _LUT_MAX]
     if price > 0:
         return (price / 100.0) + 1.0
     else:
@@ -65,85 +89,247 @@ def optimal_stakes(implied_probs: list[float], bankroll: float = 100.0) -> list[
 
 # ── Core detection ────────────────────────────────────────────────────
 
-def detect_arbitrage(events: list[Event], min_profit_pct: float | None = None) -> list[ArbitrageOpportunity]:
+def _flatten_events(
+    events: list[Event],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, list, list[str], list[str], list[bytes]]:
+    """
+    Flatten every bookmaker line into a Structure-of-Arrays layout.
+
+    Returns ``(market_idx, outcome_idx, prices, markets, outcome_names, books,
+    digests)`` where the three int32 arrays are parallel (one entry per line)
+    and the lists are the label tables they index into:
+
+      markets[m]        = (event_position, market_key)
+      outcome_names[o]  = outcome name of outcome slot ``o``
+      books[i]          = bookmaker title for line ``i``
+      digests[m]        = content hash of market ``m``'s lines, in order
+
+    Slots are numbered in first-seen order, so sorting by
+    ``(market_idx, outcome_idx)`` reproduces the original per-market
+    outcome ordering.  Markets with fewer than two distinct outcomes are
+    left out.
+    """
+    market_slots: dict[tuple[int, str], int] = {}
+    outcome_slots: dict[tuple[int, str], int] = {}
+    markets: list[tuple[int, str]] = []
+    outcome_names: list[str] = []
+    market_idx: list[int] = []
+    outcome_idx: list[int] = []
+    prices: list[int] = []
+    books: list[str] = []
+    hashers: list = []
+
+    for pos, event in enumerate(events):
+        # Markets quoting fewer than two distinct outcomes (futures, props)
+        # can never be an arb, so their lines are not flattened at all.
+        market_names: dict[str, set[str]] = {}
+        for bm in event.bookmakers:
+            market_names.setdefault(bm.market, set()).update(o.name for o in bm.outcomes)
+
+        for bm in event.bookmakers:
+            if len(market_names[bm.market]) < 2:
+                continue
+            mkey = (pos, bm.market)
+            m = market_slots.get(mkey)
+            if m is None:
+                m = market_slots[mkey] = len(markets)
+                markets.append(mkey)
+                hashers.append(hashlib.blake2b(digest_size=8))
+            hashers[m].update(
+                "\x1e".join([bm.bookmaker_title, *(f"{o.name}\x1f{o.price}" for o in bm.outcomes)])
+                .encode() + b"\x1d"
+            )
+            for outcome in bm.outcomes:
+                okey = (m, outcome.name)
+                o = outcome_slots.get(okey)
+                if o is None:
+                    o = outcome_slots[okey] = len(outcome_names)
+                    outcome_names.append(outcome.name)
+                market_idx.append(m)
+                outcome_idx.append(o)
+                prices.append(outcome.price)
+                books.append(bm.bookmaker_title)
+
+    return (
+        np.asarray(market_idx, dtype=np.int32),
+        np.asarray(outcome_idx, dtype=np.int32),
+        np.asarray(prices, dtype=np.int32),
+        markets,
+        outcome_names,
+        books,
+        [h.digest() for h in hashers],
+    )
+
+
+def _max_arb_total(min_profit_pct: float) -> float:
+    """
+    Largest total implied probability that can still reach ``min_profit_pct``.
+
+    Padded slightly so float rounding never prunes a market that sits right
+    on the threshold; the exact ``profit >= min_profit_pct`` test still runs.
+    """
+    if min_profit_pct <= -100.0:
+        return float("inf")
+    return 1.0 / (1.0 + min_profit_pct / 100.0) * (1.0 + 1e-9)
+
+
+# (profit %, total implied prob, legs) for a market that clears the profit
+# threshold, else None
+_MarketResult = tuple[float, float, tuple[RawArbLeg, ...]]
+
+# (event_id, market) -> (content digest, result) from the previous scans
+_MARKET_CACHE: dict[tuple[str, str], tuple[bytes, _MarketResult | None]] = {}
+_MARKET_CACHE_MIN_PROFIT: float | None = None
+
+
+def _scan_lines(
+    lines: np.ndarray,
+    market_idx: np.ndarray,
+    outcome_idx: np.ndarray,
+    prices: np.ndarray,
+    outcome_names: list[str],
+    books: list[str],
+    min_profit_pct: float,
+) -> dict[int, _MarketResult]:
+    """
+    Run the best-price / profit kernel over the given lines.
+
+    ``lines`` must hold every line of each market it touches.  Returns the
+    result for each market that clears ``min_profit_pct``, keyed by market.
+    """
+    if not lines.size:
+        return {}
+
+    # CSR layout: lines sorted by (market, outcome), with offsets of each
+    # outcome segment and of each market's run of outcome segments.
+    # The sort is stable, so bookmaker order is kept within an outcome.
+    order = lines[np.lexsort((outcome_idx[lines], market_idx[lines]))]
+    sorted_outcomes = outcome_idx[order]
+    outcome_starts = np.flatnonzero(np.r_[True, sorted_outcomes[1:] != sorted_outcomes[:-1]])
+    outcome_market = market_idx[order[outcome_starts]]
+    market_starts = np.flatnonzero(np.r_[True, outcome_market[1:] != outcome_market[:-1]])
+    n_outcomes = np.diff(np.r_[market_starts, outcome_starts.size])
+
+    best, totals, profits = best_and_profit(
+        prices[order],
+        np.r_[outcome_starts, order.size].astype(np.int32),
+        np.r_[market_starts, outcome_starts.size].astype(np.int32),
+        _max_arb_total(min_profit_pct),
+    )
+    best_line = order[best]  # index of the best line per outcome
+
+    results: dict[int, _MarketResult] = {}
+    for g in np.flatnonzero((n_outcomes >= 2) & (profits >= min_profit_pct)):
+        start = market_starts[g]
+        leg_lines = best_line[start:start + n_outcomes[g]].tolist()
+
+        leg_prices = prices[leg_lines].tolist()
+        leg_probs = [_IMP_TABLE[p + _LUT_MAX] if -_LUT_MAX <= p <= _LUT_MAX
+                     else american_to_implied_prob(p) for p in leg_prices]
+        stakes = optimal_stakes(leg_probs)
+        results[int(outcome_market[start])] = (
+            float(profits[g]),
+            float(totals[g]),
+            tuple(
+                RawArbLeg(
+                    outcome=outcome_names[outcome_idx[i]],
+                    bookmaker=books[i],
+                    price=price,
+                    implied_prob=round(prob, 6),
+                    stake_pct=round(stake, 2),
+                )
+                for i, price, prob, stake in zip(leg_lines, leg_prices, leg_probs, stakes, strict=True)
+            ),
+        )
+    return results
+
+
+def detect_arbitrage(events: list[Event], min_profit_pct: float | None = None) -> list[RawArbOpportunity]:
     """
     Scan a list of events for arbitrage opportunities.
 
     For each event and each market, find the best price for every outcome
     across all bookmakers.  If the combined implied probability < 1.0,
     there is an arbitrage opportunity.
+
+    The odds math runs over a flattened SoA layout in ``best_and_profit``
+    (Numba-compiled when available); result objects are only built for
+    markets that clear the threshold, as slotted ``RawArbOpportunity``
+    structs (use ``to_pydantic()`` where the validated model is needed).
+    Markets whose lines are unchanged since the previous scan (same
+    content hash) reuse that scan's result instead of being recomputed.
     """
     if min_profit_pct is None:
         min_profit_pct = settings.MIN_PROFIT_PCT
 
-    opportunities: list[ArbitrageOpportunity] = []
+    opportunities: list[RawArbOpportunity] = []
+    detected_at = iso_now()  # one timestamp for the whole scan
 
-    for event in events:
-        # Group bookmaker odds by market
-        markets: dict[str, dict[str, list[tuple[str, int]]]] = {}
-        #  markets[market_key][outcome_name] = [(bookmaker_title, price), ...]
+    market_idx, outcome_idx, prices, markets, outcome_names, books, digests = _flatten_events(events)
 
-        for bm in event.bookmakers:
-            mkt = bm.market
-            if mkt not in markets:
-                markets[mkt] = {}
-            for outcome in bm.outcomes:
-                if outcome.name not in markets[mkt]:
-                    markets[mkt][outcome.name] = []
-                markets[mkt][outcome.name].append((bm.bookmaker_title, outcome.price))
-
-        # For each market, find best odds per outcome
-        for market_key, outcome_map in markets.items():
-            outcome_names = list(outcome_map.keys())
-            if len(outcome_names) < 2:
-                continue
+    # Markets whose lines are byte-for-byte unchanged since the previous scan
+    # reuse its result; only the rest go through the odds kernel.
+    global _MARKET_CACHE_MIN_PROFIT
+    if _MARKET_CACHE_MIN_PROFIT != min_profit_pct:
+        _MARKET_CACHE.clear()
+        _MARKET_CACHE_MIN_PROFIT = min_profit_pct
 
-            # Find the best (highest decimal / lowest implied prob) price for each outcome
-            best_per_outcome: list[tuple[str, str, int, float]] = []  # (outcome, book, price, impl_prob)
-            for name in outcome_names:
-                lines = outcome_map[name]
-                # Best = highest American odds → highest decimal → lowest implied prob
-                best_book, best_price = max(lines, key=lambda x: american_to_decimal(x[1]))
-                impl_prob = american_to_implied_prob(best_price)
-                best_per_outcome.append((name, best_book, best_price, impl_prob))
-
-            implied_probs = [x[3] for x in best_per_outcome]
-            total_implied = sum(implied_probs)
-            profit = calculate_arb_profit(implied_probs)
-
-            if profit >= min_profit_pct:
-                stakes = optimal_stakes(implied_probs)
-                legs = [
-                    ArbLeg(
-                        outcome=name,
-                        bookmaker=book,
-                        price=price,
-                        implied_prob=round(prob, 6),
-                        stake_pct=round(stake, 2),
-                    )
-                    for (name, book, price, prob), stake in zip(best_per_outcome, stakes, strict=True)
-                ]
-
-                opp = ArbitrageOpportunity(
-                    sport_key=event.sport_key,
-                    event_id=event.id,
-                    event_name=f"{event.away_team} @ {event.home_team}",
-                    home_team=event.home_team,
-                    away_team=event.away_team,
-                    commence_time=event.commence_time,
-                    market=market_key,
-                    profit_pct=round(profit, 4),
-                    total_implied_prob=round(total_implied, 6),
-                    legs=legs,
-                )
-                opportunities.append(opp)
-                logger.info(
-                    "ARB FOUND: %s (%s) – %.2f%% profit across %s",
-                    opp.event_name,
-                    market_key,
-                    profit,
-                    [leg.bookmaker for leg in legs],
-                )
+    keys = [(events[pos].id, market_key) for pos, market_key in markets]
+    results: list[_MarketResult | None] = [None] * len(markets)
+    changed: list[int] = []
+    for m, (key, digest) in enumerate(zip(keys, digests, strict=True)):
+        cached = _MARKET_CACHE.get(key)
+        if cached is not None and cached[0] == digest:
+            results[m] = cached[1]
+        else:
+            changed.append(m)
+
+    if changed:
+        if len(changed) < len(markets):
+            lines = np.flatnonzero(np.isin(market_idx, changed))
+        else:
+            lines = np.arange(prices.size)
+        for m, result in _scan_lines(
+            lines, market_idx, outcome_idx, prices, outcome_names, books, min_profit_pct,
+        ).items():
+            results[m] = result
+        for m in changed:
+            _MARKET_CACHE[keys[m]] = (digests[m], results[m])
+
+    # Forget markets that are gone (started / removed from the feed)
+    if len(_MARKET_CACHE) > len(keys):
+        live = set(keys)
+        for key in [k for k in _MARKET_CACHE if k not in live]:
+            del _MARKET_CACHE[key]
+
+    for m, result in enumerate(results):
+        if result is None:
+            continue
+        profit, total_implied, legs = result
+        pos, market_key = markets[m]
+        event = events[pos]
+
+        opp = RawArbOpportunity(
+            sport_key=event.sport_key,
+            event_id=event.id,
+            event_name=f"{event.away_team} @ {event.home_team}",
+            home_team=event.home_team,
+            away_team=event.away_team,
+            commence_time=event.commence_time,
+            market=market_key,
+            profit_pct=round(profit, 4),
+            total_implied_prob=round(total_implied, 6),
+            legs=legs,
+            detected_at=detected_at,
+        )
+        opportunities.append(opp)
+        logger.info(
+            "ARB FOUND: %s (%s) – %.2f%% profit across %s",
+            opp.event_name,
+            market_key,
+            profit,
+            [leg.bookmaker for leg in legs],
+        )
 
     # Persist to database
     if opportunities:
@@ -157,7 +343,16 @@ def detect_arbitrage(events: list[Event], min_profit_pct: float | None = None) -
                 "commence_time": o.commence_time,
                 "market": o.market,
                 "profit_pct": o.profit_pct,
-                "legs": json.dumps([leg.model_dump() for leg in o.legs]),
+                "legs": [
+                    {
+                        "outcome": leg.outcome,
+                        "bookmaker": leg.bookmaker,
+                        "price": leg.price,
+                        "implied_prob": leg.implied_prob,
+                        "stake_pct": leg.stake_pct,
+                    }
+                    for leg in o.legs
+                ],
                 "total_implied_prob": o.total_implied_prob,
                 "detected_at": o.detected_at,
             }
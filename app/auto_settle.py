@@ -3,39 +3,40 @@ Auto-settle service — checks ESPN scores and settles pending bets.
 
 Runs periodically (or on-demand) to:
 1. Get all pending bets
-2. For each sport with pending bets, fetch the ESPN scoreboard
+2. For each sport with pending bets, fetch the ESPN scoreboard (concurrently)
 3. Match completed games to pending bets by team names
 4. Settle bets based on final scores
 """
 
+import asyncio
 import logging
+import re
+from collections import defaultdict
+from collections.abc import Mapping
+from types import MappingProxyType
 
 from app.config import settings
-from app.database import get_pending_bets, auto_settle_with_score
+from app.database import compute_settlement, auto_settle_bulk, get_pending_bets
 from app.espn_client import ESPNClient
 
 logger = logging.getLogger(__name__)
 
-# Map sport display names → Odds API sport keys → ESPN paths
-SPORT_LABEL_TO_KEY: dict[str, str] = {
-    v: k for k, v in {
-        "americanfootball_nfl": "NFL",
-        "basketball_nba": "NBA",
-        "baseball_mlb": "MLB",
-        "icehockey_nhl": "NHL",
-        "americanfootball_ncaaf": "NCAAF",
-        "basketball_ncaab": "NCAAM",
-        "soccer_epl": "EPL",
-        "soccer_spain_la_liga": "LA LIGA",
-        "soccer_italy_serie_a": "SERIE A",
-        "soccer_uefa_champs_league": "UCL",
-    }.items()
-}
-
-# Reverse: label → sport_key
-LABEL_TO_SPORT_KEY: dict[str, str] = {
-    v: k for k, v in SPORT_LABEL_TO_KEY.items()
-}
+# Map sport display labels → Odds API sport keys
+LABEL_TO_SPORT_KEY: Mapping[str, str] = MappingProxyType({
+    "NFL": "americanfootball_nfl",
+    "NBA": "basketball_nba",
+    "MLB": "baseball_mlb",
+    "NHL": "icehockey_nhl",
+    "NCAAF": "americanfootball_ncaaf",
+    "NCAAM": "basketball_ncaab",
+    "EPL": "soccer_epl",
+    "LA LIGA": "soccer_spain_la_liga",
+    "SERIE A": "soccer_italy_serie_a",
+    "UCL": "soccer_uefa_champs_league",
+})
+
+# Max ESPN scoreboard requests in flight at once
+SCOREBOARD_CONCURRENCY = 5
 
 
 async def auto_settle_bets() -> dict:
@@ -53,22 +54,35 @@ async def auto_settle_bets() -> dict:
     for bet in pending:
         sports_needed.add(bet["sport"].upper())
 
-    # Fetch scoreboards for each sport
+    # Resolve sport keys, then fetch their scoreboards concurrently
+    sport_keys: list[str] = []
+    for sport_label in sports_needed:
+        sport_key = LABEL_TO_SPORT_KEY.get(sport_label)
+        if not sport_key:
+            # Try direct lookup in settings
+            sport_key = settings.SPORT_KEYS.get(sport_label)
+        if sport_key:
+            sport_keys.append(sport_key)
+
     espn = ESPNClient()
     completed_games: list[dict] = []
     try:
-        for sport_label in sports_needed:
-            sport_key = LABEL_TO_SPORT_KEY.get(sport_label)
-            if not sport_key:
-                # Try direct lookup in settings
-                sport_key = settings.SPORT_KEYS.get(sport_label)
-            if not sport_key:
-                continue
+        limit = asyncio.Semaphore(SCOREBOARD_CONCURRENCY)
 
-            games = await espn.get_scoreboard(sport_key)
+        async def fetch(sport_key: str) -> list[dict]:
+            async with limit:
+                return await espn.get_scoreboard(sport_key)
+
+        scoreboards = await asyncio.gather(
+            *(fetch(k) for k in sport_keys), return_exceptions=True,
+        )
+        for sport_key, games in zip(sport_keys, scoreboards, strict=True):
+            if isinstance(games, BaseException):
+                logger.error("Error fetching scoreboard for %s: %s", sport_key, games)
+                continue
             for g in games:
                 if g.get("completed"):
-                    completed_games.append(g)
+                    completed_games.append(_add_team_tokens(g))
 
         logger.info(
             "Auto-settle: %d pending bets, %d completed games found",
@@ -85,11 +99,12 @@ async def auto_settle_bets() -> dict:
         }
 
     # Try to match each pending bet to a completed game
-    settled_count = 0
+    settlements: list[tuple[int, str, float, int, int]] = []
     results: list[dict] = []
 
+    index = _index_games(completed_games)
     for bet in pending:
-        match = _find_matching_game(bet, completed_games)
+        match = _find_matching_game(bet, completed_games, index)
         if not match:
             continue
 
@@ -99,80 +114,162 @@ async def auto_settle_bets() -> dict:
         except (ValueError, TypeError):
             continue
 
-        settled = auto_settle_with_score(bet["id"], home_score, away_score)
-        if settled and settled["result"] != "pending":
-            settled_count += 1
-            results.append({
-                "bet_id": bet["id"],
-                "event": bet["event_name"],
-                "pick": bet["pick"],
-                "score": f"{match['home_team']} {home_score} - {match['away_team']} {away_score}",
-                "result": settled["result"],
-                "pnl": settled["actual_pnl"],
-            })
-            logger.info(
-                "Auto-settled bet #%d: %s → %s (score: %d-%d, P&L: %+.2f)",
-                bet["id"],
-                bet["pick"],
-                settled["result"],
-                home_score,
-                away_score,
-                settled["actual_pnl"],
-            )
+        result, pnl = compute_settlement(bet, home_score, away_score)
+        settlements.append((bet["id"], result, pnl, home_score, away_score))
+        results.append({
+            "bet_id": bet["id"],
+            "event": bet["event_name"],
+            "pick": bet["pick"],
+            "score": f"{match['home_team']} {home_score} - {match['away_team']} {away_score}",
+            "result": result,
+            "pnl": pnl,
+        })
+
+    # One transaction for every settlement in this run.  A bet settled
+    # elsewhere since get_pending_bets() is skipped, so only report the
+    # ones actually written.
+    settled_ids = set(auto_settle_bulk(settlements))
+    settled_results: list[dict] = []
+    for (bet_id, result, pnl, home_score, away_score), entry in zip(settlements, results):
+        if bet_id not in settled_ids:
+            continue
+        settled_results.append(entry)
+        logger.info(
+            "Auto-settled bet #%d: %s → %s (score: %d-%d, P&L: %+.2f)",
+            bet_id,
+            entry["pick"],
+            result,
+            home_score,
+            away_score,
+            pnl,
+        )
 
     return {
-        "settled": settled_count,
-        "pending": len(pending) - settled_count,
-        "results": results,
+        "settled": len(settled_results),
+        "pending": len(pending) - len(settled_results),
+        "results": settled_results,
         "games_checked": len(completed_games),
     }
 
 
-def _find_matching_game(bet: dict, games: list[dict]) -> dict | None:
+def _add_team_tokens(game: dict) -> dict:
+    """Attach team-name token sets and last words to a scoreboard game."""
+    game["_home_tokens"], game["_home_last"] = _team_tokens(game.get("home_team", ""))
+    game["_away_tokens"], game["_away_last"] = _team_tokens(game.get("away_team", ""))
+    return game
+
+
+_Team = tuple[frozenset[str], str]
+
+
+def _index_games(games: list[dict]) -> tuple[list[tuple[_Team, _Team]], dict[str, list[int]]]:
+    """
+    Index games by every token of their team names.
+
+    Uses the tokens from :func:`_add_team_tokens`, adding them if missing.
+
+    Returns ``(teams, by_token)`` where ``teams[i]`` is
+    ``((home_tokens, home_last), (away_tokens, away_last))`` for ``games[i]``
+    and ``by_token`` maps a token to the indices of games featuring it.
+    """
+    teams: list[tuple[_Team, _Team]] = []
+    by_token: dict[str, list[int]] = defaultdict(list)
+    for idx, game in enumerate(games):
+        if "_home_tokens" not in game:
+            _add_team_tokens(game)
+        teams.append((
+            (game["_home_tokens"], game["_home_last"]),
+            (game["_away_tokens"], game["_away_last"]),
+        ))
+        for token in game["_home_tokens"] | game["_away_tokens"]:
+            by_token[token].append(idx)
+    return teams, by_token
+
+
+def _find_matching_game(
+    bet: dict,
+    games: list[dict],
+    index: tuple[list[tuple[_Team, _Team]], dict[str, list[int]]] | None = None,
+) -> dict | None:
     """
     Find a completed game that matches a pending bet.
 
     Matches by checking if both team names from the bet appear in the game.
+    Every strategy needs the bet and game to share a token, so only games
+    found through ``index`` (see :func:`_index_games`) are checked.
     """
-    bet_event = bet.get("event_name", "").lower()
-    bet_home = (bet.get("home_team") or "").lower()
-    bet_away = (bet.get("away_team") or "").lower()
-    bet_pick = bet.get("pick", "").lower()
-
-    for game in games:
-        game_home = game.get("home_team", "").lower()
-        game_away = game.get("away_team", "").lower()
-
-        # Strategy 1: match home_team + away_team fields directly
-        if bet_home and bet_away:
-            if (_fuzzy_team(bet_home, game_home) and _fuzzy_team(bet_away, game_away)):
-                return game
-            if (_fuzzy_team(bet_home, game_away) and _fuzzy_team(bet_away, game_home)):
-                return game
-
-        # Strategy 2: match from event_name (e.g. "Team A vs Team B")
-        if game_home and game_away:
-            if _fuzzy_team(game_home, bet_event) and _fuzzy_team(game_away, bet_event):
-                return game
-
-        # Strategy 3: match from pick + event_name
-        if _fuzzy_team(game_home, bet_pick) or _fuzzy_team(game_away, bet_pick):
-            if _fuzzy_team(game_home, bet_event) or _fuzzy_team(game_away, bet_event):
-                return game
+    if index is None:
+        index = _index_games(games)
+    teams, by_token = index
 
+    bet_event = _tokens(bet.get("event_name", ""))
+    bet_home = _team_tokens(bet.get("home_team") or "")
+    bet_away = _team_tokens(bet.get("away_team") or "")
+    bet_pick = _tokens(bet.get("pick", ""))
+
+    words = bet_event | bet_home[0] | bet_away[0] | bet_pick
+    for i in sorted({i for w in words for i in by_token.get(w, ())}):
+        if _game_matches(bet_event, bet_home, bet_away, bet_pick, *teams[i]):
+            return games[i]
     return None
 
 
-def _fuzzy_team(team: str, text: str) -> bool:
-    """Check if a team name (or its last word) appears in text."""
-    if not team or not text:
-        return False
-    team = team.lower().strip()
-    text = text.lower().strip()
-    if team in text:
-        return True
-    # Try last word (e.g. "Pistons" from "Detroit Pistons")
-    last_word = team.split()[-1] if team else ""
-    if last_word and len(last_word) > 3 and last_word in text:
+def _game_matches(
+    bet_event: frozenset[str],
+    bet_home: _Team,
+    bet_away: _Team,
+    bet_pick: frozenset[str],
+    game_home: _Team,
+    game_away: _Team,
+) -> bool:
+    """Apply the bet ↔ game matching strategies to pre-tokenized names."""
+    # Strategy 1: match home_team + away_team fields directly
+    if bet_home[0] and bet_away[0]:
+        if (_fuzzy_team_set(bet_home, game_home[0])
+                and _fuzzy_team_set(bet_away, game_away[0])):
+            return True
+        if (_fuzzy_team_set(bet_home, game_away[0])
+                and _fuzzy_team_set(bet_away, game_home[0])):
+            return True
+
+    home_in_event = _fuzzy_team_set(game_home, bet_event)
+    away_in_event = _fuzzy_team_set(game_away, bet_event)
+
+    # Strategy 2: match from event_name (e.g. "Team A vs Team B")
+    if home_in_event and away_in_event:
         return True
+
+    # Strategy 3: match from pick + event_name
+    if _fuzzy_team_set(game_home, bet_pick) or _fuzzy_team_set(game_away, bet_pick):
+        if home_in_event or away_in_event:
+            return True
+
     return False
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> frozenset[str]:
+    """Lower-cased word tokens of ``text`` (punctuation is ignored)."""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+def _team_tokens(team: str) -> _Team:
+    """Token set of a team name plus its last word, if long enough to match on."""
+    words = _WORD_RE.findall(team.lower())
+    last_word = words[-1] if words and len(words[-1]) > 3 else ""
+    return frozenset(words), last_word
+
+
+def _fuzzy_team_set(team: _Team, text_tokens: frozenset[str]) -> bool:
+    """
+    Check if a team name (or its last word) appears in a token set.
+
+    The whole name matches when all its tokens are present; otherwise its
+    last word alone (e.g. "pistons" from "Detroit Pistons") must be.
+    """
+    team_tokens, last_word = team
+    if not team_tokens:
+        return False
+    return team_tokens <= text_tokens or last_word in text_tokens
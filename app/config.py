@@ -4,7 +4,11 @@ Loads settings from .env file and provides defaults.
 """
 
 import os
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
+
 from dotenv import load_dotenv
 
 # Load .env from project root
@@ -12,15 +16,25 @@ env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
 
+def _env(name: str, default: str):
+    """Default factory reading ``name`` from the environment at construction."""
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """Application settings loaded from environment variables."""
+    """Application settings loaded from environment variables.
+
+    Immutable; override fields by passing keyword arguments, e.g.
+    ``Settings(ODDS_API_KEY="...")``.
+    """
 
     # The Odds API (https://the-odds-api.com)
-    ODDS_API_KEY: str = os.getenv("ODDS_API_KEY", "")
+    ODDS_API_KEY: str = _env("ODDS_API_KEY", "")
     ODDS_API_BASE_URL: str = "https://api.the-odds-api.com/v4"
 
     # Sports to track (The Odds API sport keys)
-    SPORT_KEYS: dict[str, str] = {
+    SPORT_KEYS: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({
         "NFL": "americanfootball_nfl",
         "NBA": "basketball_nba",
         "MLB": "baseball_mlb",
@@ -31,29 +45,29 @@ class Settings:
         "LA LIGA": "soccer_spain_la_liga",
         "SERIE A": "soccer_italy_serie_a",
         "UCL": "soccer_uefa_champs_league",
-    }
+    }))
 
     # Odds format: "american" | "decimal" | "iso"
-    ODDS_FORMAT: str = os.getenv("ODDS_FORMAT", "american")
+    ODDS_FORMAT: str = _env("ODDS_FORMAT", "american")
 
     # Markets to fetch: h2h (moneyline), spreads, totals
-    MARKETS: str = os.getenv("MARKETS", "h2h")
+    MARKETS: str = _env("MARKETS", "h2h")
 
     # Regions determine which bookmakers appear: us, us2, uk, eu, au
-    REGIONS: str = os.getenv("REGIONS", "us,us2")
+    REGIONS: str = _env("REGIONS", "us,us2")
 
     # Minimum arbitrage profit % to surface (e.g. 0.5 means 0.5%)
-    MIN_PROFIT_PCT: float = float(os.getenv("MIN_PROFIT_PCT", "0.0"))
+    MIN_PROFIT_PCT: float = field(default_factory=lambda: float(os.getenv("MIN_PROFIT_PCT", "0.0")))
 
     # Auto-refresh interval in seconds (0 = manual only, 14400 = 4 hours)
-    REFRESH_INTERVAL: int = int(os.getenv("REFRESH_INTERVAL", "14400"))
+    REFRESH_INTERVAL: int = field(default_factory=lambda: int(os.getenv("REFRESH_INTERVAL", "14400")))
 
     # SQLite database path
-    DB_PATH: str = os.getenv("DB_PATH", str(Path(__file__).resolve().parent.parent / "data" / "arbitrage.db"))
+    DB_PATH: str = _env("DB_PATH", str(Path(__file__).resolve().parent.parent / "data" / "arbitrage.db"))
 
     # Server
-    HOST: str = os.getenv("HOST", "127.0.0.1")
-    PORT: int = int(os.getenv("PORT", "8000"))
+    HOST: str = _env("HOST", "127.0.0.1")
+    PORT: int = field(default_factory=lambda: int(os.getenv("PORT", "8000")))
 
     @property
     def has_api_key(self) -> bool:
@@ -3,9 +3,16 @@ SQLite database layer for persisting odds snapshots and arbitrage opportunities.
 """
 
 import sqlite3
+import threading
+import weakref
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
+import orjson
+
 from app.config import settings
 
 
@@ -13,185 +20,495 @@ def _ensure_dir():
     Path(settings.DB_PATH).parent.mkdir(parents=True, exist_ok=True)
 
 
-def get_connection() -> sqlite3.Connection:
+def get_connection(*, check_same_thread: bool = True) -> sqlite3.Connection:
     _ensure_dir()
-    conn = sqlite3.connect(settings.DB_PATH)
+    # Autocommit at the driver level; get_db() issues BEGIN/COMMIT itself so
+    # a whole batch is one explicit transaction.
+    conn = sqlite3.connect(
+        settings.DB_PATH, check_same_thread=check_same_thread, isolation_level=None,
+        # Room for every distinct statement the app issues, so pooled
+        # connections never re-prepare hot SQL after LRU eviction
+        cached_statements=256,
+    )
     conn.row_factory = sqlite3.Row
+    # Only applies to a brand-new file, and must precede the switch to WAL
+    conn.execute("PRAGMA page_size=8192")
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL makes NORMAL durable against app crashes; only an OS crash / power
+    # loss can drop the last commits, in exchange for no fsync per commit.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # Read-heavy API queries page through the file via mmap instead of read()
+    conn.execute("PRAGMA mmap_size=1073741824")  # 1 GB
+    conn.execute("PRAGMA busy_timeout=5000")
     conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
+def _close_each(conns: dict[str, sqlite3.Connection]):
+    for conn in conns.values():
+        conn.close()
+
+
+class _ThreadPool:
+    """One thread's pooled connections, by database file.
+
+    Closed as soon as the owning thread exits and drops its thread-local
+    storage; sqlite3 connections sit in reference cycles, so leaving them to
+    the garbage collector would keep their files open for a while.
+    """
+
+    def __init__(self):
+        self.conns: dict[str, sqlite3.Connection] = {}
+        weakref.finalize(self, _close_each, self.conns)
+
+
+# Long-lived connections reused by get_db(), one per database file in each
+# thread, so the page cache and pragma setup survive between calls.  Each
+# thread's pool lives in thread-local storage; _POOLS only holds weak
+# references, so close_all() can reach every live thread's connections.
+_LOCAL = threading.local()
+_POOLS: "weakref.WeakSet[_ThreadPool]" = weakref.WeakSet()
+_POOL_LOCK = threading.Lock()
+
+
+def _pooled_connection() -> sqlite3.Connection:
+    pool = getattr(_LOCAL, "pool", None)
+    if pool is None:
+        pool = _LOCAL.pool = _ThreadPool()
+        with _POOL_LOCK:
+            _POOLS.add(pool)
+    conn = pool.conns.get(settings.DB_PATH)
+    if conn is None:
+        # Only ever used by its own thread; check_same_thread is off so
+        # close_all() can close it from the shutdown thread.
+        conn = pool.conns[settings.DB_PATH] = get_connection(check_same_thread=False)
+    return conn
+
+
+def close_all():
+    """Close every pooled connection (call on shutdown).
+
+    Also forgets which databases init_db() has set up, so the next
+    init_db() runs the schema and migrations again.
+    """
+    conns = []
+    with _POOL_LOCK:
+        for pool in list(_POOLS):
+            conns.extend(pool.conns.values())
+            pool.conns.clear()
+        _INITIALISED.clear()
+    for conn in conns:
+        conn.close()
+
+
 @contextmanager
-def get_db():
-    conn = get_connection()
+def get_db(immediate: bool = False):
+    """
+    Yield the pooled connection inside one transaction.
+
+    ``immediate=True`` takes the write lock up front (``BEGIN IMMEDIATE``),
+    which bulk writers use so they never fail on a lock upgrade mid-batch.
+    Nested use joins the outer transaction.
+    """
+    conn = _pooled_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
     try:
         yield conn
-        conn.commit()
-    finally:
-        conn.close()
+        if conn.in_transaction:
+            conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """A cursor yielding plain tuples, bypassing the connection's sqlite3.Row factory."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+def _fetch_dicts(conn: sqlite3.Connection, sql: str, params=()) -> list[dict]:
+    """Run a query and return its rows as dicts.
+
+    Zipping plain tuples against the column names once is cheaper than
+    building a sqlite3.Row per row and converting each with dict().
+    """
+    cursor = _tuple_cursor(conn).execute(sql, params)
+    cols = [d[0] for d in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor]
+
+
+# Database files init_db() has already set up in this process
+_INITIALISED: set[str] = set()
 
 
 def init_db():
-    """Create tables if they don't exist."""
+    """Create tables if they don't exist (once per database file per process)."""
+    db_path = settings.DB_PATH
+    if db_path in _INITIALISED:
+        return
+    # executescript() commits any open transaction before it runs, so the
+    # (idempotent) schema script goes first, outside get_db(), and the
+    # migrations below get a transaction of their own.
+    _pooled_connection().executescript("""
+        CREATE TABLE IF NOT EXISTS odds_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sport_key TEXT NOT NULL,
+            event_id TEXT NOT NULL,
+            event_name TEXT NOT NULL,
+            home_team TEXT NOT NULL,
+            away_team TEXT NOT NULL,
+            commence_time TEXT NOT NULL,
+            bookmaker TEXT NOT NULL,
+            market TEXT NOT NULL,
+            outcome_name TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            point REAL,
+            fetched_at TEXT NOT NULL DEFAULT (datetime('now')),
+            UNIQUE(event_id, bookmaker, market, outcome_name, fetched_at)
+        );
+
+        -- Superseded by the composite indexes in _ODDS_INDEXES (created below)
+        DROP INDEX IF EXISTS idx_odds_sport;
+        DROP INDEX IF EXISTS idx_odds_fetched;
+
+        CREATE TABLE IF NOT EXISTS arbitrage_opportunities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sport_key TEXT NOT NULL,
+            event_id TEXT NOT NULL,
+            event_name TEXT NOT NULL,
+            home_team TEXT NOT NULL,
+            away_team TEXT NOT NULL,
+            commence_time TEXT NOT NULL,
+            market TEXT NOT NULL,
+            profit_pct REAL NOT NULL,
+            legs TEXT NOT NULL,          -- legacy JSON array of legs; new rows store '[]'
+                                         -- and keep their legs in arbitrage_legs
+            total_implied_prob REAL NOT NULL,
+            detected_at TEXT NOT NULL DEFAULT (datetime('now')),
+            still_live INTEGER NOT NULL DEFAULT 1
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_arb_profit ON arbitrage_opportunities(profit_pct DESC);
+        CREATE INDEX IF NOT EXISTS idx_arb_detected ON arbitrage_opportunities(detected_at);
+        -- Only live rows are indexed, so marking them stale and listing
+        -- them by profit never walks the (much larger) history
+        CREATE INDEX IF NOT EXISTS idx_arb_live_profit
+            ON arbitrage_opportunities(profit_pct DESC) WHERE still_live = 1;
+        DROP INDEX IF EXISTS idx_arb_live;
+
+        -- One row per leg, so reads get typed columns instead of parsing JSON
+        CREATE TABLE IF NOT EXISTS arbitrage_legs (
+            arb_id INTEGER NOT NULL
+                REFERENCES arbitrage_opportunities(id) ON DELETE CASCADE,
+            leg_idx INTEGER NOT NULL,
+            outcome TEXT NOT NULL,
+            bookmaker TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            implied_prob REAL,
+            stake_pct REAL,
+            PRIMARY KEY (arb_id, leg_idx)
+        ) WITHOUT ROWID;
+
+        -- Single row (id = 1) holding the latest quota reading
+        CREATE TABLE IF NOT EXISTS api_usage (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            requests_used INTEGER,
+            requests_remaining INTEGER,
+            recorded_at TEXT NOT NULL DEFAULT (datetime('now'))
+        );
+
+        CREATE TABLE IF NOT EXISTS bet_tracker (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sport TEXT NOT NULL,
+            event_name TEXT NOT NULL,
+            home_team TEXT,
+            away_team TEXT,
+            bet_type TEXT NOT NULL,         -- 'moneyline', 'spread', 'total', 'other'
+            pick TEXT NOT NULL,             -- who/what you bet on
+            pick_side TEXT CHECK(pick_side IN ('home', 'away', 'over', 'under')),
+            spread_line REAL,              -- spread line if bet_type='spread' (e.g. -3.5)
+            total_line REAL,               -- total line if bet_type='total' (e.g. 220.5)
+            odds INTEGER NOT NULL,          -- American odds received
+            stake REAL NOT NULL,            -- amount wagered
+            potential_win REAL NOT NULL,     -- potential profit (not including stake)
+            our_confidence REAL,            -- model confidence at time of bet (0-1)
+            result TEXT DEFAULT 'pending',  -- 'win', 'loss', 'push', 'pending'
+            actual_pnl REAL DEFAULT 0,      -- actual profit/loss after result
+            home_score INTEGER,             -- final home score (filled by auto-settle)
+            away_score INTEGER,             -- final away score (filled by auto-settle)
+            notes TEXT,
+            placed_at TEXT NOT NULL DEFAULT (datetime('now')),
+            settled_at TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_bet_result ON bet_tracker(result);
+        CREATE INDEX IF NOT EXISTS idx_bet_placed ON bet_tracker(placed_at);
+        CREATE INDEX IF NOT EXISTS idx_bet_sport ON bet_tracker(sport);
+    """)
+    # Indexes and data migrations commit together or not at all, so an
+    # interrupted upgrade is simply redone on the next start.
     with get_db() as conn:
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS odds_snapshots (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sport_key TEXT NOT NULL,
-                event_id TEXT NOT NULL,
-                event_name TEXT NOT NULL,
-                home_team TEXT NOT NULL,
-                away_team TEXT NOT NULL,
-                commence_time TEXT NOT NULL,
-                bookmaker TEXT NOT NULL,
-                market TEXT NOT NULL,
-                outcome_name TEXT NOT NULL,
-                price INTEGER NOT NULL,
-                point REAL,
-                fetched_at TEXT NOT NULL DEFAULT (datetime('now')),
-                UNIQUE(event_id, bookmaker, market, outcome_name, fetched_at)
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_odds_event ON odds_snapshots(event_id);
-            CREATE INDEX IF NOT EXISTS idx_odds_sport ON odds_snapshots(sport_key);
-            CREATE INDEX IF NOT EXISTS idx_odds_fetched ON odds_snapshots(fetched_at);
-
-            CREATE TABLE IF NOT EXISTS arbitrage_opportunities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sport_key TEXT NOT NULL,
-                event_id TEXT NOT NULL,
-                event_name TEXT NOT NULL,
-                home_team TEXT NOT NULL,
-                away_team TEXT NOT NULL,
-                commence_time TEXT NOT NULL,
-                market TEXT NOT NULL,
-                profit_pct REAL NOT NULL,
-                legs TEXT NOT NULL,          -- JSON array of {outcome, bookmaker, price, stake_pct}
-                total_implied_prob REAL NOT NULL,
-                detected_at TEXT NOT NULL DEFAULT (datetime('now')),
-                still_live INTEGER NOT NULL DEFAULT 1
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_arb_profit ON arbitrage_opportunities(profit_pct DESC);
-            CREATE INDEX IF NOT EXISTS idx_arb_detected ON arbitrage_opportunities(detected_at);
-            CREATE INDEX IF NOT EXISTS idx_arb_live ON arbitrage_opportunities(still_live);
-
-            CREATE TABLE IF NOT EXISTS api_usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                requests_used INTEGER,
-                requests_remaining INTEGER,
-                recorded_at TEXT NOT NULL DEFAULT (datetime('now'))
-            );
-
-            CREATE TABLE IF NOT EXISTS bet_tracker (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sport TEXT NOT NULL,
-                event_name TEXT NOT NULL,
-                home_team TEXT,
-                away_team TEXT,
-                bet_type TEXT NOT NULL,         -- 'moneyline', 'spread', 'total', 'other'
-                pick TEXT NOT NULL,             -- who/what you bet on
-                spread_line REAL,              -- spread line if bet_type='spread' (e.g. -3.5)
-                total_line REAL,               -- total line if bet_type='total' (e.g. 220.5)
-                odds INTEGER NOT NULL,          -- American odds received
-                stake REAL NOT NULL,            -- amount wagered
-                potential_win REAL NOT NULL,     -- potential profit (not including stake)
-                our_confidence REAL,            -- model confidence at time of bet (0-1)
-                result TEXT DEFAULT 'pending',  -- 'win', 'loss', 'push', 'pending'
-                actual_pnl REAL DEFAULT 0,      -- actual profit/loss after result
-                home_score INTEGER,             -- final home score (filled by auto-settle)
-                away_score INTEGER,             -- final away score (filled by auto-settle)
-                notes TEXT,
-                placed_at TEXT NOT NULL DEFAULT (datetime('now')),
-                settled_at TEXT
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_bet_result ON bet_tracker(result);
-            CREATE INDEX IF NOT EXISTS idx_bet_placed ON bet_tracker(placed_at);
-            CREATE INDEX IF NOT EXISTS idx_bet_sport ON bet_tracker(sport);
+        for create_index in _ODDS_INDEXES.values():
+            conn.execute(create_index)
+        _migrate_pick_side(conn)
+        _migrate_api_usage(conn)
+        # Warm the page cache of the startup connection
+        conn.execute("SELECT count(*) FROM odds_snapshots").fetchone()
+    with _POOL_LOCK:
+        _INITIALISED.add(db_path)
+
+
+def _migrate_pick_side(conn: sqlite3.Connection):
+    """Add bet_tracker.pick_side on databases created before it, and backfill it.
+
+    The backfill covers every bet still without a side, not just a freshly
+    added column, so it also completes an earlier upgrade.
+    """
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(bet_tracker)")}
+    if "pick_side" not in columns:
+        conn.execute("""
+            ALTER TABLE bet_tracker ADD COLUMN pick_side TEXT
+                CHECK(pick_side IN ('home', 'away', 'over', 'under'))
         """)
+    rows = conn.execute(
+        "SELECT id, bet_type, pick, home_team, away_team FROM bet_tracker"
+        " WHERE pick_side IS NULL"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE bet_tracker SET pick_side = ? WHERE id = ?",
+        [(side, row["id"]) for row in rows if (side := pick_side(dict(row))) is not None],
+    )
+
+
+def _migrate_api_usage(conn: sqlite3.Connection):
+    """Collapse the old append-only api_usage log to its latest row, as id 1.
+
+    Runs inside init_db's migration transaction: the DELETE and the id
+    rewrite commit together, so the guard never sees a half-collapsed log.
+    """
+    if conn.execute("SELECT 1 FROM api_usage WHERE id != 1 LIMIT 1").fetchone() is None:
+        return
+    conn.execute("""
+        DELETE FROM api_usage WHERE id != (
+            SELECT id FROM api_usage ORDER BY recorded_at DESC, id DESC LIMIT 1
+        )
+    """)
+    conn.execute("UPDATE api_usage SET id = 1")
+
+
+# Secondary indexes on odds_snapshots, by name.  The UNIQUE constraint's
+# automatic index is not listed: save_odds relies on it to dedupe.
+_ODDS_INDEXES = {
+    "idx_odds_event": "CREATE INDEX IF NOT EXISTS idx_odds_event ON odds_snapshots(event_id)",
+    # Latest snapshot per sport, and the latest snapshot in display order
+    "idx_odds_sport_fetched": """
+        CREATE INDEX IF NOT EXISTS idx_odds_sport_fetched
+            ON odds_snapshots(sport_key, fetched_at DESC)
+    """,
+    "idx_odds_fetched_order": """
+        CREATE INDEX IF NOT EXISTS idx_odds_fetched_order
+            ON odds_snapshots(fetched_at, commence_time, event_name, bookmaker)
+    """,
+}
+
+# Column order of the row tuples taken by save_odds_rows
+ODDS_COLUMNS = (
+    "sport_key", "event_id", "event_name", "home_team", "away_team", "commence_time",
+    "bookmaker", "market", "outcome_name", "price", "point", "fetched_at",
+)
+_ODDS_INSERT = f"INSERT OR REPLACE INTO odds_snapshots ({', '.join(ODDS_COLUMNS)}) VALUES "
+_ODDS_ROW = f"({', '.join('?' * len(ODDS_COLUMNS))})"
+# Rows per multi-row INSERT, keeping bound parameters under SQLite's
+# historical 999-variable limit
+_ODDS_CHUNK = 999 // len(ODDS_COLUMNS)
+_ODDS_INSERT_CHUNK = _ODDS_INSERT + ", ".join([_ODDS_ROW] * _ODDS_CHUNK)
+
+
+_odds_row_values = itemgetter(*ODDS_COLUMNS)
+
+
+def _insert_odds(conn: sqlite3.Connection, rows: list[tuple]):
+    full = len(rows) - len(rows) % _ODDS_CHUNK
+    # Full chunks go through one multi-row statement each; the tail is
+    # inserted row by row with the single-row statement.
+    for start in range(0, full, _ODDS_CHUNK):
+        conn.execute(_ODDS_INSERT_CHUNK, [
+            value for row in rows[start:start + _ODDS_CHUNK] for value in row
+        ])
+    if full < len(rows):
+        conn.executemany(_ODDS_INSERT + _ODDS_ROW, rows[full:])
+
+
+def save_odds_rows(rows: list[tuple]):
+    """Bulk-insert odds snapshot rows given as tuples in ``ODDS_COLUMNS`` order."""
+    if not rows:
+        return
+    with get_db(immediate=True) as conn:
+        _insert_odds(conn, rows)
 
 
 def save_odds(rows: list[dict]):
     """Bulk-insert odds snapshot rows."""
+    save_odds_rows([_odds_row_values(row) for row in rows])
+
+
+def save_odds_bulk(rows: list[dict]):
+    """
+    Insert a large batch of odds rows with the secondary indexes rebuilt once.
+
+    The non-unique indexes are dropped for the load and recreated in the
+    same transaction, so SQLite builds each from sorted data instead of
+    updating it per row.  The rebuild covers the whole table, so this only
+    pays off for loads that are large relative to it (e.g. a full reload);
+    use :func:`save_odds` for routine refreshes.
+    """
     if not rows:
         return
-    with get_db() as conn:
-        conn.executemany("""
-            INSERT OR REPLACE INTO odds_snapshots
-            (sport_key, event_id, event_name, home_team, away_team, commence_time,
-             bookmaker, market, outcome_name, price, point, fetched_at)
-            VALUES (:sport_key, :event_id, :event_name, :home_team, :away_team,
-                    :commence_time, :bookmaker, :market, :outcome_name, :price,
-                    :point, :fetched_at)
-        """, rows)
+    with get_db(immediate=True) as conn:
+        for name in _ODDS_INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+        _insert_odds(conn, [_odds_row_values(row) for row in rows])
+        for create_index in _ODDS_INDEXES.values():
+            conn.execute(create_index)
+
+
+_LEG_FIELDS = ("outcome", "bookmaker", "price", "implied_prob", "stake_pct")
 
 
 def save_arbitrage(opps: list[dict]):
-    """Save detected arbitrage opportunities."""
+    """Save detected arbitrage opportunities.
+
+    ``legs`` may be a list of leg dicts or the equivalent JSON string.  Legs
+    are stored as ``arbitrage_legs`` rows; the legacy ``legs`` column only
+    gets an empty JSON array.
+    """
     if not opps:
         return
-    with get_db() as conn:
+    with get_db(immediate=True) as conn:
         # Mark all previous as stale
-        conn.execute("UPDATE arbitrage_opportunities SET still_live = 0")
+        conn.execute("UPDATE arbitrage_opportunities SET still_live = 0 WHERE still_live = 1")
+        # The immediate transaction holds the write lock and ids only grow
+        # (AUTOINCREMENT), so the rows above this id are exactly this batch
+        last_id = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM arbitrage_opportunities"
+        ).fetchone()[0]
         conn.executemany("""
             INSERT INTO arbitrage_opportunities
             (sport_key, event_id, event_name, home_team, away_team, commence_time,
              market, profit_pct, legs, total_implied_prob, detected_at, still_live)
             VALUES (:sport_key, :event_id, :event_name, :home_team, :away_team,
-                    :commence_time, :market, :profit_pct, :legs,
+                    :commence_time, :market, :profit_pct, '[]',
                     :total_implied_prob, :detected_at, 1)
         """, opps)
+        arb_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM arbitrage_opportunities WHERE id > ? ORDER BY id", (last_id,)
+        )]
+        leg_rows = []
+        for arb_id, opp in zip(arb_ids, opps, strict=True):
+            legs = opp["legs"]
+            if isinstance(legs, str):
+                legs = orjson.loads(legs)
+            leg_rows.extend(
+                (arb_id, i, *(leg.get(f) for f in _LEG_FIELDS))
+                for i, leg in enumerate(legs)
+            )
+        conn.executemany("""
+            INSERT INTO arbitrage_legs
+            (arb_id, leg_idx, outcome, bookmaker, price, implied_prob, stake_pct)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, leg_rows)
+
+
+def _select_arbitrage(conn: sqlite3.Connection, opps_sql: str, order_by: str,
+                      params: tuple = ()) -> list[dict]:
+    """
+    Run an arbitrage_opportunities query joined to its legs.
+
+    Each returned dict has ``legs`` as a list of leg dicts; rows saved before
+    arbitrage_legs existed keep their stored JSON string instead.
+    """
+    cursor = _tuple_cursor(conn).execute(f"""
+        SELECT a.*, l.leg_idx AS leg_idx,
+               {", ".join(f"l.{f} AS leg_{f}" for f in _LEG_FIELDS)}
+        FROM ({opps_sql}) AS a
+        LEFT JOIN arbitrage_legs l ON l.arb_id = a.id
+        ORDER BY {order_by}, a.id, l.leg_idx
+    """, params)
+    n_arb_cols = len(cursor.description) - len(_LEG_FIELDS) - 1
+    arb_cols = [d[0] for d in cursor.description[:n_arb_cols]]
+
+    arbs: list[dict] = []
+    for _, group in groupby(cursor, key=itemgetter(arb_cols.index("id"))):
+        group = list(group)
+        arb = dict(zip(arb_cols, group[0][:n_arb_cols], strict=True))
+        if group[0][n_arb_cols] is not None:
+            arb["legs"] = [
+                dict(zip(_LEG_FIELDS, row[n_arb_cols + 1:], strict=True))
+                for row in group
+            ]
+        arbs.append(arb)
+    return arbs
 
 
 def get_live_arbitrage() -> list[dict]:
     """Return currently-live arbitrage opportunities."""
     with get_db() as conn:
-        rows = conn.execute("""
-            SELECT * FROM arbitrage_opportunities
-            WHERE still_live = 1
-            ORDER BY profit_pct DESC
-        """).fetchall()
-        return [dict(r) for r in rows]
+        return _select_arbitrage(
+            conn,
+            "SELECT * FROM arbitrage_opportunities WHERE still_live = 1",
+            "a.profit_pct DESC",
+        )
 
 
 def get_arbitrage_history(limit: int = 100) -> list[dict]:
     """Return recent historical arbitrage opportunities."""
     with get_db() as conn:
-        rows = conn.execute("""
-            SELECT * FROM arbitrage_opportunities
-            ORDER BY detected_at DESC
-            LIMIT ?
-        """, (limit,)).fetchall()
-        return [dict(r) for r in rows]
+        return _select_arbitrage(
+            conn,
+            "SELECT * FROM arbitrage_opportunities ORDER BY detected_at DESC LIMIT ?",
+            "a.detected_at DESC",
+            (limit,),
+        )
 
 
 def get_latest_odds(sport_key: str | None = None) -> list[dict]:
     """Get the latest odds snapshot."""
     with get_db() as conn:
         if sport_key:
-            rows = conn.execute("""
+            return _fetch_dicts(conn, """
                 SELECT * FROM odds_snapshots
-                WHERE fetched_at = (SELECT MAX(fetched_at) FROM odds_snapshots WHERE sport_key = ?)
+                WHERE fetched_at = (
+                    SELECT fetched_at FROM odds_snapshots
+                    WHERE sport_key = ? ORDER BY fetched_at DESC LIMIT 1
+                )
                 AND sport_key = ?
                 ORDER BY commence_time, event_name, bookmaker
-            """, (sport_key, sport_key)).fetchall()
-        else:
-            rows = conn.execute("""
-                SELECT * FROM odds_snapshots
-                WHERE fetched_at = (SELECT MAX(fetched_at) FROM odds_snapshots)
-                ORDER BY commence_time, event_name, bookmaker
-            """).fetchall()
-        return [dict(r) for r in rows]
+            """, (sport_key, sport_key))
+        return _fetch_dicts(conn, """
+            SELECT * FROM odds_snapshots
+            WHERE fetched_at = (SELECT MAX(fetched_at) FROM odds_snapshots)
+            ORDER BY commence_time, event_name, bookmaker
+        """)
 
 
 def save_api_usage(used: int, remaining: int):
-    """Record API usage stats."""
+    """Record API usage stats, replacing the previous reading."""
     with get_db() as conn:
         conn.execute("""
-            INSERT INTO api_usage (requests_used, requests_remaining)
-            VALUES (?, ?)
+            INSERT INTO api_usage (id, requests_used, requests_remaining)
+            VALUES (1, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                requests_used = excluded.requests_used,
+                requests_remaining = excluded.requests_remaining,
+                recorded_at = datetime('now')
         """, (used, remaining))
 
 
@@ -199,7 +516,7 @@ def get_api_usage() -> dict | None:
     """Get latest API usage stats."""
     with get_db() as conn:
         row = conn.execute("""
-            SELECT * FROM api_usage ORDER BY recorded_at DESC LIMIT 1
+            SELECT * FROM api_usage WHERE id = 1
         """).fetchone()
         return dict(row) if row else None
 
@@ -211,75 +528,57 @@ def add_bet(bet: dict) -> int:
     with get_db() as conn:
         cursor = conn.execute("""
             INSERT INTO bet_tracker
-            (sport, event_name, home_team, away_team, bet_type, pick,
+            (sport, event_name, home_team, away_team, bet_type, pick, pick_side,
              spread_line, total_line, odds, stake, potential_win,
              our_confidence, result, notes)
-            VALUES (:sport, :event_name, :home_team, :away_team, :bet_type, :pick,
+            VALUES (:sport, :event_name, :home_team, :away_team, :bet_type, :pick, :pick_side,
                     :spread_line, :total_line, :odds, :stake,
                     :potential_win, :our_confidence, 'pending', :notes)
-        """, bet)
+        """, {**bet, "pick_side": pick_side(bet)})
         return cursor.lastrowid
 
 
 def settle_bet(bet_id: int, result: str) -> dict | None:
     """Settle a pending bet as 'win', 'loss', or 'push'."""
     with get_db() as conn:
-        # Get the bet first
-        row = conn.execute("SELECT * FROM bet_tracker WHERE id = ?", (bet_id,)).fetchone()
-        if not row:
-            return None
-        bet = dict(row)
-
-        if result == "win":
-            pnl = bet["potential_win"]
-        elif result == "loss":
-            pnl = -bet["stake"]
-        else:  # push
-            pnl = 0.0
-
-        conn.execute("""
+        row = conn.execute("""
             UPDATE bet_tracker
-            SET result = ?, actual_pnl = ?, settled_at = datetime('now')
-            WHERE id = ?
-        """, (result, pnl, bet_id))
-
-        bet["result"] = result
-        bet["actual_pnl"] = pnl
-        return bet
+            SET result = :result,
+                actual_pnl = CASE :result
+                    WHEN 'win' THEN potential_win
+                    WHEN 'loss' THEN -stake
+                    ELSE 0.0  -- push
+                END,
+                settled_at = datetime('now')
+            WHERE id = :id
+            RETURNING *
+        """, {"result": result, "id": bet_id}).fetchone()
+        return dict(row) if row else None
 
 
 def get_all_bets(limit: int = 200) -> list[dict]:
     """Get all tracked bets, newest first."""
     with get_db() as conn:
-        rows = conn.execute("""
+        return _fetch_dicts(conn, """
             SELECT * FROM bet_tracker ORDER BY placed_at DESC LIMIT ?
-        """, (limit,)).fetchall()
-        return [dict(r) for r in rows]
+        """, (limit,))
 
 
 def get_bet_summary() -> dict:
     """Get aggregate stats for the bet tracker."""
     with get_db() as conn:
-        total = conn.execute("SELECT COUNT(*) FROM bet_tracker").fetchone()[0]
-        settled = conn.execute(
-            "SELECT COUNT(*) FROM bet_tracker WHERE result != 'pending'"
-        ).fetchone()[0]
-        wins = conn.execute(
-            "SELECT COUNT(*) FROM bet_tracker WHERE result = 'win'"
-        ).fetchone()[0]
-        losses = conn.execute(
-            "SELECT COUNT(*) FROM bet_tracker WHERE result = 'loss'"
-        ).fetchone()[0]
-        pushes = conn.execute(
-            "SELECT COUNT(*) FROM bet_tracker WHERE result = 'push'"
-        ).fetchone()[0]
+        row = conn.execute("""
+            SELECT COUNT(*),
+                   COALESCE(SUM(result != 'pending'), 0),
+                   COALESCE(SUM(result = 'win'), 0),
+                   COALESCE(SUM(result = 'loss'), 0),
+                   COALESCE(SUM(result = 'push'), 0),
+                   COALESCE(SUM(CASE WHEN result != 'pending' THEN stake END), 0),
+                   COALESCE(SUM(CASE WHEN result != 'pending' THEN actual_pnl END), 0)
+            FROM bet_tracker
+        """).fetchone()
+        total, settled, wins, losses, pushes, total_staked, total_pnl = row
         pending = total - settled
-        total_staked = conn.execute(
-            "SELECT COALESCE(SUM(stake), 0) FROM bet_tracker WHERE result != 'pending'"
-        ).fetchone()[0]
-        total_pnl = conn.execute(
-            "SELECT COALESCE(SUM(actual_pnl), 0) FROM bet_tracker WHERE result != 'pending'"
-        ).fetchone()[0]
         roi = (total_pnl / total_staked * 100) if total_staked > 0 else 0.0
 
         return {
@@ -299,11 +598,10 @@ def get_bet_summary() -> dict:
 def get_pending_bets() -> list[dict]:
     """Get all bets with result='pending'."""
     with get_db() as conn:
-        rows = conn.execute("""
+        return _fetch_dicts(conn, """
             SELECT * FROM bet_tracker WHERE result = 'pending'
             ORDER BY placed_at ASC
-        """).fetchall()
-        return [dict(r) for r in rows]
+        """)
 
 
 def auto_settle_with_score(bet_id: int, home_score: int, away_score: int) -> dict | None:
@@ -316,98 +614,219 @@ def auto_settle_with_score(bet_id: int, home_score: int, away_score: int) -> dic
     - total: did total score go over/under the total_line?
     """
     with get_db() as conn:
-        row = conn.execute("SELECT * FROM bet_tracker WHERE id = ?", (bet_id,)).fetchone()
-        if not row:
-            return None
-        bet = dict(row)
+        row = conn.execute(
+            _AUTO_SETTLE_SQL, {"id": bet_id, "home": home_score, "away": away_score},
+        ).fetchone()
+        if row is None:
+            # Unknown or already settled
+            row = conn.execute("SELECT * FROM bet_tracker WHERE id = ?", (bet_id,)).fetchone()
+        return dict(row) if row else None
+
+
+def auto_settle_bulk(settlements: list[tuple[int, str, float, int, int]]) -> list[int]:
+    """
+    Write many auto-settlements in one transaction.
+
+    Each item is ``(bet_id, result, pnl, home_score, away_score)``, typically
+    computed with :func:`compute_settlement`.  Bets that are no longer
+    pending are left untouched.  Returns the ids of the bets updated, in
+    ``settlements`` order.
+    """
+    if not settlements:
+        return []
+    settled: list[int] = []
+    with get_db(immediate=True) as conn:
+        # One statement per bet (re-used from the statement cache), so each
+        # rowcount says whether that bet was still pending
+        for bet_id, result, pnl, home, away in settlements:
+            cursor = conn.execute("""
+                UPDATE bet_tracker
+                SET result = ?, actual_pnl = ?, home_score = ?, away_score = ?,
+                    settled_at = datetime('now')
+                WHERE id = ? AND result = 'pending'
+            """, (result, pnl, home, away, bet_id))
+            if cursor.rowcount:
+                settled.append(bet_id)
+    return settled
+
+
+def settle_all_pending(scores_by_event: dict[str, tuple[int, int]]) -> list[dict]:
+    """
+    Settle every pending bet whose event has a final score, in one transaction.
+
+    ``scores_by_event`` maps a bet's ``event_name`` to ``(home_score,
+    away_score)``.  Returns ``{id, result, actual_pnl, home_score,
+    away_score}`` for each bet settled.
+    """
+    if not scores_by_event:
+        return []
+    with get_db(immediate=True) as conn:
+        bets = _fetch_dicts(conn, """
+            SELECT id, event_name, home_team, away_team, bet_type, pick, pick_side,
+                   spread_line, total_line, stake, potential_win
+            FROM bet_tracker WHERE result = 'pending'
+        """)
+        settlements: list[tuple[int, str, float, int, int]] = []
+        for bet in bets:
+            score = scores_by_event.get(bet["event_name"])
+            if score is None:
+                continue
+            home_score, away_score = score
+            result, pnl = compute_settlement(bet, home_score, away_score)
+            settlements.append((bet["id"], result, pnl, home_score, away_score))
+        auto_settle_bulk(settlements)  # joins this transaction
+
+    return [
+        {"id": bet_id, "result": result, "actual_pnl": pnl,
+         "home_score": home_score, "away_score": away_score}
+        for bet_id, result, pnl, home_score, away_score in settlements
+    ]
+
+
+# SQL twin of compute_settlement's result logic, over bet_tracker columns
+# and the :home / :away score parameters.
+_SETTLE_RESULT_SQL = """
+    CASE
+        WHEN bet_type = 'moneyline' AND pick_side = 'home' THEN
+            CASE WHEN :home > :away THEN 'win' WHEN :home = :away THEN 'push' ELSE 'loss' END
+        WHEN bet_type = 'moneyline' AND pick_side = 'away' THEN
+            CASE WHEN :away > :home THEN 'win' WHEN :home = :away THEN 'push' ELSE 'loss' END
+        WHEN bet_type = 'spread' AND spread_line IS NOT NULL AND pick_side = 'home' THEN
+            CASE WHEN :home + spread_line > :away THEN 'win'
+                 WHEN :home + spread_line = :away THEN 'push' ELSE 'loss' END
+        WHEN bet_type = 'spread' AND spread_line IS NOT NULL AND pick_side = 'away' THEN
+            CASE WHEN :away + (-spread_line) > :home THEN 'win'
+                 WHEN :away + (-spread_line) = :home THEN 'push' ELSE 'loss' END
+        WHEN bet_type = 'total' AND total_line IS NOT NULL AND pick_side = 'over' THEN
+            CASE WHEN :home + :away > total_line THEN 'win'
+                 WHEN :home + :away = total_line THEN 'push' ELSE 'loss' END
+        WHEN bet_type = 'total' AND total_line IS NOT NULL AND pick_side = 'under' THEN
+            CASE WHEN :home + :away < total_line THEN 'win'
+                 WHEN :home + :away = total_line THEN 'push' ELSE 'loss' END
+        ELSE 'loss'
+    END
+"""
+
 
-        if bet["result"] != "pending":
-            return bet  # already settled
+# Built once so every call hands sqlite3 the identical (cached) statement
+_AUTO_SETTLE_SQL = f"""
+    UPDATE bet_tracker
+    SET result = s.result,
+        actual_pnl = CASE s.result
+            WHEN 'win' THEN potential_win
+            WHEN 'loss' THEN -stake
+            ELSE 0.0
+        END,
+        home_score = :home, away_score = :away,
+        settled_at = datetime('now')
+    FROM (SELECT id, {_SETTLE_RESULT_SQL} AS result
+          FROM bet_tracker WHERE id = :id) AS s
+    WHERE bet_tracker.id = s.id AND bet_tracker.result = 'pending'
+    RETURNING *
+"""
 
-        pick = bet["pick"]
-        bet_type = bet["bet_type"]
-        home_team = bet.get("home_team", "")
-        away_team = bet.get("away_team", "")
+def pick_side(bet: dict) -> str | None:
+    """
+    Resolve which side a bet's free-text pick is on.
 
-        result = "loss"  # default
+    'home' / 'away' for moneyline and spread bets, 'over' / 'under' for
+    totals, None when the pick can't be resolved.  Stored on the bet at
+    placement so settlement never has to fuzzy-match text.
+    """
+    pick = bet["pick"]
+    if bet["bet_type"] == "total":
+        pick_lower = pick.lower()
+        if "over" in pick_lower:
+            return "over"
+        if "under" in pick_lower:
+            return "under"
+        return None
+    pick_lc = pick.lower().strip()
+    if _team_matches_lc(pick_lc, _norm_team(bet.get("home_team") or "")):
+        return "home"
+    if _team_matches_lc(pick_lc, _norm_team(bet.get("away_team") or "")):
+        return "away"
+    return None
+
+
+def compute_settlement(bet: dict, home_score: int, away_score: int) -> tuple[str, float]:
+    """Work out ``(result, pnl)`` for a bet row given the final score."""
+    bet_type = bet["bet_type"]
+    side = bet.get("pick_side") or pick_side(bet)
+
+    result = "loss"  # default
+
+    if bet_type == "moneyline":
+        if side == "home":
+            if home_score > away_score:
+                result = "win"
+            elif home_score == away_score:
+                result = "push"
+        elif side == "away":
+            if away_score > home_score:
+                result = "win"
+            elif home_score == away_score:
+                result = "push"
+
+    elif bet_type == "spread":
+        spread_line = bet.get("spread_line")
+        if spread_line is not None:
+            if side == "home":
+                adjusted = home_score + spread_line
+                if adjusted > away_score:
+                    result = "win"
+                elif adjusted == away_score:
+                    result = "push"
+            elif side == "away":
+                # Away spread is the inverse
+                adjusted = away_score + (-spread_line)
+                if adjusted > home_score:
+                    result = "win"
+                elif adjusted == home_score:
+                    result = "push"
 
-        if bet_type == "moneyline":
-            # Determine which team was picked
-            if _team_matches(pick, home_team):
-                if home_score > away_score:
+    elif bet_type == "total":
+        total_line = bet.get("total_line")
+        if total_line is not None:
+            actual_total = home_score + away_score
+            if side == "over":
+                if actual_total > total_line:
                     result = "win"
-                elif home_score == away_score:
+                elif actual_total == total_line:
                     result = "push"
-            elif _team_matches(pick, away_team):
-                if away_score > home_score:
+            elif side == "under":
+                if actual_total < total_line:
                     result = "win"
-                elif home_score == away_score:
+                elif actual_total == total_line:
                     result = "push"
 
-        elif bet_type == "spread":
-            spread_line = bet.get("spread_line")
-            if spread_line is not None:
-                # Determine if pick is home or away
-                if _team_matches(pick, home_team):
-                    adjusted = home_score + spread_line
-                    if adjusted > away_score:
-                        result = "win"
-                    elif adjusted == away_score:
-                        result = "push"
-                elif _team_matches(pick, away_team):
-                    # Away spread is the inverse
-                    adjusted = away_score + (-spread_line)
-                    if adjusted > home_score:
-                        result = "win"
-                    elif adjusted == home_score:
-                        result = "push"
-
-        elif bet_type == "total":
-            total_line = bet.get("total_line")
-            if total_line is not None:
-                actual_total = home_score + away_score
-                pick_lower = pick.lower()
-                if "over" in pick_lower:
-                    if actual_total > total_line:
-                        result = "win"
-                    elif actual_total == total_line:
-                        result = "push"
-                elif "under" in pick_lower:
-                    if actual_total < total_line:
-                        result = "win"
-                    elif actual_total == total_line:
-                        result = "push"
-
-        # Calculate P&L
-        if result == "win":
-            pnl = bet["potential_win"]
-        elif result == "loss":
-            pnl = -bet["stake"]
-        else:
-            pnl = 0.0
+    # Calculate P&L
+    if result == "win":
+        pnl = bet["potential_win"]
+    elif result == "loss":
+        pnl = -bet["stake"]
+    else:
+        pnl = 0.0
 
-        conn.execute("""
-            UPDATE bet_tracker
-            SET result = ?, actual_pnl = ?, home_score = ?, away_score = ?,
-                settled_at = datetime('now')
-            WHERE id = ?
-        """, (result, pnl, home_score, away_score, bet_id))
+    return result, pnl
 
-        bet.update({"result": result, "actual_pnl": pnl,
-                     "home_score": home_score, "away_score": away_score})
-        return bet
+
+@lru_cache(maxsize=512)
+def _norm_team(team_name: str) -> tuple[str, str]:
+    """Lower-cased, stripped team name and its last word (cached per name)."""
+    team_lower = team_name.lower().strip()
+    return team_lower, (team_lower.split()[-1] if team_lower else "")
 
 
-def _team_matches(pick: str, team_name: str) -> bool:
-    """Check if the pick string likely refers to this team.
+def _team_matches_lc(pick_lower: str, team: tuple[str, str]) -> bool:
+    """Check if a lower-cased pick likely refers to a :func:`_norm_team` team.
 
-    Handles cases like 'Detroit Pistons -3.5' matching 'Detroit Pistons',
-    or 'Pistons' matching 'Detroit Pistons'.
+    Handles cases like 'detroit pistons -3.5' matching 'Detroit Pistons',
+    or 'pistons' matching 'Detroit Pistons'.
     """
-    if not team_name:
+    team_lower, team_last = team
+    if not team_lower:
         return False
-    pick_lower = pick.lower().strip()
-    team_lower = team_name.lower().strip()
     # Exact or prefix match
     if pick_lower.startswith(team_lower):
         return True
@@ -415,7 +834,6 @@ def _team_matches(pick: str, team_name: str) -> bool:
     if team_lower in pick_lower:
         return True
     # Last word of team name (e.g. "Pistons") in pick
-    team_last = team_lower.split()[-1] if team_lower else ""
     if team_last and team_last in pick_lower:
         return True
     return False
@@ -5,12 +5,18 @@ Uses the free ESPN API (no key required) to pull real sports data
 for ML feature engineering.
 """
 
+import asyncio
 import logging
+import time
 from datetime import UTC, datetime
+from typing import Any
 
 import httpx
+import orjson
 
+from app.http import get_client
 from app.models import TeamRecord
+from app.predictor import bump_stats_version
 
 logger = logging.getLogger(__name__)
 
@@ -31,15 +37,48 @@ ESPN_SPORTS = {
     "soccer_uefa_champs_league": ("soccer", "uefa.champions"),
 }
 
+# Seconds a response is served from memory before ESPN is asked again
+STANDINGS_TTL = 3600.0
+SCOREBOARD_TTL = 60.0
+
+# url -> (expires at, ETag, decoded JSON body)
+_RESPONSE_CACHE: dict[str, tuple[float, str | None, Any]] = {}
+# url -> (decoded body, records parsed from it).  Reusing the records while
+# the body is unchanged keeps the same TeamRecord objects across requests,
+# and only a changed body invalidates the predictor's cache.
+_STANDINGS_CACHE: dict[str, tuple[Any, list[TeamRecord]]] = {}
 
 class ESPNClient:
     """Fetch team stats and scores from ESPN's free API."""
 
-    def __init__(self):
-        self._client = httpx.AsyncClient(timeout=20.0)
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        self._client = client or get_client()
 
     async def close(self):
-        await self._client.aclose()
+        # The HTTP client is shared (see app.http) and closed at shutdown
+        pass
+
+    async def _get_json(self, url: str, ttl: float) -> Any:
+        """
+        GET and decode a JSON body, cached in-process for ``ttl`` seconds.
+
+        Once an entry expires it is revalidated with If-None-Match, so an
+        unchanged body comes back as a bodiless 304.
+        """
+        now = time.monotonic()
+        cached = _RESPONSE_CACHE.get(url)
+        if cached is not None and cached[0] > now:
+            return cached[2]
+
+        headers = {"If-None-Match": cached[1]} if cached is not None and cached[1] else None
+        resp = await self._client.get(url, headers=headers, timeout=20.0)
+        if resp.status_code == 304 and cached is not None:
+            _RESPONSE_CACHE[url] = (now + ttl, cached[1], cached[2])
+            return cached[2]
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        _RESPONSE_CACHE[url] = (now + ttl, resp.headers.get("etag"), data)
+        return data
 
     async def get_standings(self, sport_key: str) -> list[TeamRecord]:
         """Fetch current season standings for a sport."""
@@ -51,10 +90,12 @@ class ESPNClient:
         url = f"{ESPN_V2_BASE}/{sport}/{league}/standings"
 
         try:
-            resp = await self._client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
-            return self._parse_standings(data, sport_key)
+            data = await self._get_json(url, STANDINGS_TTL)
+            parsed = _STANDINGS_CACHE.get(url)
+            if parsed is None or parsed[0] is not data:
+                parsed = _STANDINGS_CACHE[url] = (data, self._parse_standings(data, sport_key))
+                bump_stats_version()
+            return list(parsed[1])
         except Exception as e:
             logger.error("Error fetching standings for %s: %s", sport_key, e)
             return []
@@ -68,9 +109,7 @@ class ESPNClient:
         url = f"{ESPN_SITE_BASE}/{sport}/{league}/scoreboard"
 
         try:
-            resp = await self._client.get(url)
-            resp.raise_for_status()
-            data = resp.json()
+            data = await self._get_json(url, SCOREBOARD_TTL)
             return self._parse_scoreboard(data, sport_key)
         except Exception as e:
             logger.error("Error fetching scoreboard for %s: %s", sport_key, e)
@@ -84,6 +123,19 @@ class ESPNClient:
         records = await self.get_standings(sport_key)
         return {r.team: r for r in records}
 
+    async def get_all_standings(self) -> dict[str, list[TeamRecord]]:
+        """Fetch standings for every sport in ESPN_SPORTS concurrently."""
+        results = await asyncio.gather(
+            *(self.get_standings(k) for k in ESPN_SPORTS), return_exceptions=True,
+        )
+        standings: dict[str, list[TeamRecord]] = {}
+        for sport_key, records in zip(ESPN_SPORTS, results, strict=True):
+            if isinstance(records, Exception):
+                logger.error("Error fetching standings for %s: %s", sport_key, records)
+                records = []
+            standings[sport_key] = records
+        return standings
+
     # ── Parsers ───────────────────────────────────────────────────────
 
     @staticmethod
@@ -95,8 +147,6 @@ class ESPNClient:
         Stats come as a flat list with names like 'wins', 'losses',
         'avgPointsFor', 'avgPointsAgainst', 'differential', etc.
         """
-        records: list[TeamRecord] = []
-
         # Collect entries from all conferences / groups
         all_entries: list[dict] = []
         for group in data.get("children", []):
@@ -107,13 +157,14 @@ class ESPNClient:
         if not all_entries:
             all_entries = data.get("standings", {}).get("entries", [])
 
-        for entry in all_entries:
+        records: list[TeamRecord] = [None] * len(all_entries)  # type: ignore[list-item]
+        for i, entry in enumerate(all_entries):
             team_info = entry.get("team", {})
             team_name = team_info.get("displayName", "Unknown")
-            stats_map: dict[str, str] = {}
-
-            for stat in entry.get("stats", []):
-                stats_map[stat.get("name", "")] = stat.get("displayValue", "0")
+            stats_map: dict[str, str] = {
+                stat.get("name", ""): stat.get("displayValue", "0")
+                for stat in entry.get("stats", ())
+            }
 
             try:
                 wins = int(stats_map.get("wins", "0"))
@@ -139,17 +190,15 @@ class ESPNClient:
                 pf = pa = 0.0
                 streak_val = 0
 
-            records.append(
-                TeamRecord(
-                    team=team_name,
-                    wins=wins,
-                    losses=losses,
-                    ties=ties,
-                    points_for=pf,
-                    points_against=pa,
-                    streak=streak_val,
-                    sport_key=sport_key,
-                )
+            records[i] = TeamRecord(
+                team=team_name,
+                wins=wins,
+                losses=losses,
+                ties=ties,
+                points_for=pf,
+                points_against=pa,
+                streak=streak_val,
+                sport_key=sport_key,
             )
 
         logger.info("Parsed %d team records for %s", len(records), sport_key)
@@ -158,39 +207,37 @@ class ESPNClient:
     @staticmethod
     def _parse_scoreboard(data: dict, sport_key: str) -> list[dict]:
         """Parse ESPN scoreboard into simplified game dicts."""
+        _get = dict.get
         games: list[dict] = []
+        append = games.append
 
-        for event in data.get("events", []):
-            competition = event.get("competitions", [{}])[0]
-            competitors = competition.get("competitors", [])
+        for event in _get(data, "events", ()):
+            competitions = _get(event, "competitions") or ({},)
+            competitors = _get(competitions[0], "competitors", ())
             if len(competitors) < 2:
                 continue
 
+            # Last home / non-home competitor wins, as ESPN lists exactly one of each
             home = away = None
             for c in competitors:
-                info = {
-                    "team": c.get("team", {}).get("displayName", ""),
-                    "abbreviation": c.get("team", {}).get("abbreviation", ""),
-                    "score": c.get("score", "0"),
-                    "winner": c.get("winner", False),
-                }
-                if c.get("homeAway") == "home":
-                    home = info
+                if _get(c, "homeAway") == "home":
+                    home = c
                 else:
-                    away = info
-
-            if home and away:
-                status = event.get("status", {}).get("type", {})
-                games.append({
-                    "event_id": event.get("id"),
-                    "sport_key": sport_key,
-                    "home_team": home["team"],
-                    "away_team": away["team"],
-                    "home_score": home["score"],
-                    "away_score": away["score"],
-                    "status": status.get("name", ""),
-                    "completed": status.get("completed", False),
-                    "commence_time": event.get("date", ""),
-                })
+                    away = c
+            if home is None or away is None:
+                continue
+
+            status = _get(_get(event, "status", {}), "type", {})
+            append({
+                "event_id": _get(event, "id"),
+                "sport_key": sport_key,
+                "home_team": _get(_get(home, "team", {}), "displayName", ""),
+                "away_team": _get(_get(away, "team", {}), "displayName", ""),
+                "home_score": _get(home, "score", "0"),
+                "away_score": _get(away, "score", "0"),
+                "status": _get(status, "name", ""),
+                "completed": _get(status, "completed", False),
+                "commence_time": _get(event, "date", ""),
+            })
 
         return games
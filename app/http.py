@@ -0,0 +1,33 @@
+"""
+Shared outbound HTTP client.
+
+ESPNClient, ESPNInjuryClient and OddsClient all send requests through one
+pooled HTTP/2 ``httpx.AsyncClient``, so connections to ESPN and The Odds
+API stay open between requests instead of paying a TCP + TLS handshake
+per API call.  The app lifespan opens it at startup and closes it on
+shutdown.
+"""
+
+import httpx
+
+_CLIENT: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use (or after close)."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _CLIENT
+
+
+async def close_client():
+    """Close the shared client (called once at app shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
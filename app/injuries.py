@@ -8,14 +8,64 @@ Uses ESPN's free API to pull:
 """
 
 import logging
+import sys
+import time
+from collections import defaultdict
 from datetime import UTC, datetime
+from functools import cached_property
 
 import httpx
+import orjson
+from rapidfuzz import fuzz, process, utils
+
+from app.http import get_client
 
 logger = logging.getLogger(__name__)
 
 ESPN_CORE = "https://site.api.espn.com/apis/site/v2/sports"
 
+# ESPN injury status (lower-cased) -> InjuryReport list it belongs in;
+# anything unlisted counts as questionable
+STATUS_BUCKET = {
+    "out": "out",
+    "injured reserve": "out",
+    "ir": "out",
+    "suspension": "out",
+    "doubtful": "doubtful",
+    "questionable": "questionable",
+    "probable": "probable",
+    "available": "probable",
+    "day-to-day": "day_to_day",
+    "day to day": "day_to_day",
+}
+
+# Raw ESPN status -> (interned status, bucket).  The vocabulary is tiny, so
+# each spelling is lower-cased and looked up only once per process.
+_STATUS_CACHE: dict[str, tuple[str, str]] = {}
+
+
+def _classify_status(raw: str) -> tuple[str, str]:
+    """Return the interned status string and its ``STATUS_BUCKET`` list."""
+    hit = _STATUS_CACHE.get(raw)
+    if hit is None:
+        status = sys.intern(raw)
+        hit = _STATUS_CACHE[status] = (status, STATUS_BUCKET.get(status.lower(), "questionable"))
+    return hit
+
+
+# Injury reports change over hours and rosters over days, so parsed
+# results are reused in-process for this many seconds.
+INJURIES_TTL = 600.0
+ROSTER_TTL = 1800.0
+
+# sport_key -> (fetched at, reports)
+_INJURY_CACHE: dict[str, tuple[float, dict[str, "InjuryReport"]]] = {}
+# (sport_key, team_id) -> (fetched at, players)
+_ROSTER_CACHE: dict[tuple[str, str], tuple[float, list[dict]]] = {}
+
+# Minimum token-set similarity (0-100) for two team names to count as a match
+FUZZY_MATCH_CUTOFF = 70
+
 # Sport paths for ESPN
 SPORT_PATHS = {
     "americanfootball_nfl": ("football", "nfl"),
@@ -32,25 +82,39 @@ SPORT_PATHS = {
 
 
 class InjuryReport:
-    """Parsed injury data for a team."""
-
-    def __init__(self, team: str):
+    """Parsed injury data for a team.
+
+    The counts, impact score and summary are computed from the player lists
+    on first access and cached on the instance, so a report is complete
+    however it was constructed.  Fill the lists before reading them; they
+    are not expected to change afterwards.
+    """
+
+    def __init__(
+        self,
+        team: str,
+        out: list[dict] | None = None,
+        doubtful: list[dict] | None = None,
+        questionable: list[dict] | None = None,
+        probable: list[dict] | None = None,
+        day_to_day: list[dict] | None = None,
+    ):
         self.team = team
-        self.out: list[dict] = []       # Definitely not playing
-        self.doubtful: list[dict] = []  # Unlikely to play
-        self.questionable: list[dict] = []  # Uncertain
-        self.probable: list[dict] = []  # Likely to play
-        self.day_to_day: list[dict] = []
+        self.out: list[dict] = out or []       # Definitely not playing
+        self.doubtful: list[dict] = doubtful or []  # Unlikely to play
+        self.questionable: list[dict] = questionable or []  # Uncertain
+        self.probable: list[dict] = probable or []  # Likely to play
+        self.day_to_day: list[dict] = day_to_day or []
 
-    @property
+    @cached_property
     def total_out(self) -> int:
         return len(self.out) + len(self.doubtful)
 
-    @property
+    @cached_property
     def total_questionable(self) -> int:
         return len(self.questionable) + len(self.day_to_day)
 
-    @property
+    @cached_property
     def impact_score(self) -> float:
         """0-1 injury impact score. Higher = more players missing."""
         # Weight: out=1.0, doubtful=0.8, questionable=0.4, probable=0.1
@@ -64,7 +128,8 @@ class InjuryReport:
         # Normalize: 5+ injuries = max impact
         return min(score / 5.0, 1.0)
 
-    def summary(self) -> str:
+    @cached_property
+    def _summary(self) -> str:
         parts = []
         if self.out:
             names = ", ".join(p["name"] for p in self.out[:3])
@@ -76,7 +141,11 @@ class InjuryReport:
             parts.append(f"{len(self.questionable)} questionable")
         return "; ".join(parts) if parts else "No significant injuries"
 
-    def to_dict(self) -> dict:
+    def summary(self) -> str:
+        return self._summary
+
+    @cached_property
+    def _dict(self) -> dict:
         return {
             "team": self.team,
             "out": self.out,
@@ -87,35 +156,68 @@ class InjuryReport:
             "total_out": self.total_out,
             "total_questionable": self.total_questionable,
             "impact_score": round(self.impact_score, 3),
-            "summary": self.summary(),
+            "summary": self._summary,
         }
 
+    def to_dict(self) -> dict:
+        """Serializable view; built once per report, then shared."""
+        return self._dict
+
+
+class InjuryReports(dict[str, InjuryReport]):
+    """Team name -> InjuryReport, with a case-folded name index for matching.
+
+    ``name_index`` maps each lower-cased, stripped team name to the
+    canonical name; it is built at construction.  ``fuzzy_cache`` remembers
+    fuzzy-match results for names the index misses, for as long as the
+    reports are cached.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Last words ("pistons") are deliberately not indexed: whether one
+        # is unique depends on which teams happen to have reports, so "Boston
+        # Red Sox" could resolve to the White Sox when Boston has none.
+        self.name_index: dict[str, str] = {name.lower().strip(): name for name in self}
+        self.fuzzy_cache: dict[str, str | None] = {}
+
 
 class ESPNInjuryClient:
     """Fetch injury reports and player data from ESPN."""
 
-    def __init__(self):
-        self._client = httpx.AsyncClient(timeout=15.0)
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        self._client = client or get_client()
 
     async def close(self):
-        await self._client.aclose()
+        # The HTTP client is shared (see app.http) and closed at shutdown
+        pass
 
     async def get_injuries(self, sport_key: str) -> dict[str, InjuryReport]:
         """
         Fetch injury reports for all teams in a sport.
         Returns dict keyed by team display name.
         """
-        if sport_key not in SPORT_PATHS:
-            return {}
+        # Only supported sports are ever cached, so a hit skips the path lookup
+        cached = _INJURY_CACHE.get(sport_key)
+        if cached is not None and time.monotonic() - cached[0] < INJURIES_TTL:
+            return cached[1]
 
-        sport, league = SPORT_PATHS[sport_key]
+        paths = SPORT_PATHS.get(sport_key)
+        if paths is None:
+            return {}
+        sport, league = paths
         url = f"{ESPN_CORE}/{sport}/{league}/injuries"
 
         try:
-            resp = await self._client.get(url)
+            resp = await self._client.get(url, timeout=15.0)
             resp.raise_for_status()
-            data = resp.json()
-            return self._parse_injuries(data)
+            data = orjson.loads(resp.content)
+            reports = self._parse_injuries(data)
+            _INJURY_CACHE[sport_key] = (time.monotonic(), reports)
+            # app.predictor imports this module, hence the local import
+            from app.predictor import bump_stats_version
+            bump_stats_version()
+            return reports
         except Exception as e:
             logger.warning("Could not fetch injuries for %s: %s", sport_key, e)
             return {}
@@ -124,17 +226,24 @@ class ESPNInjuryClient:
         self, sport_key: str, team_id: str
     ) -> list[dict]:
         """Fetch key player stats for a specific team."""
-        if sport_key not in SPORT_PATHS:
-            return []
+        # Only supported sports are ever cached, so a hit skips the path lookup
+        cached = _ROSTER_CACHE.get((sport_key, team_id))
+        if cached is not None and time.monotonic() - cached[0] < ROSTER_TTL:
+            return cached[1]
 
-        sport, league = SPORT_PATHS[sport_key]
+        paths = SPORT_PATHS.get(sport_key)
+        if paths is None:
+            return []
+        sport, league = paths
         url = f"{ESPN_CORE}/{sport}/{league}/teams/{team_id}/roster"
 
         try:
-            resp = await self._client.get(url)
+            resp = await self._client.get(url, timeout=15.0)
             resp.raise_for_status()
-            data = resp.json()
-            return self._parse_roster(data)
+            data = orjson.loads(resp.content)
+            players = self._parse_roster(data)
+            _ROSTER_CACHE[(sport_key, team_id)] = (time.monotonic(), players)
+            return players
         except Exception as e:
             logger.debug("Could not fetch roster for team %s: %s", team_id, e)
             return []
@@ -150,86 +259,122 @@ class ESPNInjuryClient:
 
         # Fuzzy match if exact name didn't work
         if not home_report.out and not home_report.questionable:
-            for name, report in all_injuries.items():
-                if _fuzzy_match(home_team, name):
-                    home_report = report
-                    break
+            name = _match_team(home_team, all_injuries)
+            if name is not None:
+                home_report = all_injuries[name]
 
         if not away_report.out and not away_report.questionable:
-            for name, report in all_injuries.items():
-                if _fuzzy_match(away_team, name):
-                    away_report = report
-                    break
+            name = _match_team(away_team, all_injuries)
+            if name is not None:
+                away_report = all_injuries[name]
 
         return home_report, away_report
 
     # ── Parsers ───────────────────────────────────────────────────
 
     @staticmethod
-    def _parse_injuries(data: dict) -> dict[str, InjuryReport]:
+    def _parse_injuries(data: dict) -> InjuryReports:
         """Parse ESPN injuries response."""
         reports: dict[str, InjuryReport] = {}
+        classify = _classify_status
 
-        for team_entry in data.get("injuries", []):
+        for team_entry in data.get("injuries", ()):
             team_info = team_entry.get("team", {})
             team_name = team_info.get("displayName", "Unknown")
-            report = InjuryReport(team_name)
-
-            for item in team_entry.get("injuries", []):
+            # Group players by bucket, then build the report from the
+            # finished lists in one call
+            buckets: defaultdict[str, list[dict]] = defaultdict(list)
+            for item in team_entry.get("injuries", ()):
+                athlete = item.get("athlete") or {}
+                details = item.get("details") or {}
+                status, bucket = classify(item.get("status", ""))
                 player = {
-                    "name": item.get("athlete", {}).get("displayName", "Unknown"),
-                    "position": item.get("athlete", {}).get("position", {}).get("abbreviation", ""),
-                    "status": item.get("status", ""),
-                    "injury": item.get("details", {}).get("type", ""),
-                    "detail": item.get("details", {}).get("detail", ""),
+                    "name": athlete.get("displayName", "Unknown"),
+                    "position": (athlete.get("position") or {}).get("abbreviation", ""),
+                    "status": status,
+                    "injury": details.get("type", ""),
+                    "detail": details.get("detail", ""),
                 }
+                buckets[bucket].append(player)
 
-                status = player["status"].lower()
-                if status in ("out", "injured reserve", "ir", "suspension"):
-                    report.out.append(player)
-                elif status == "doubtful":
-                    report.doubtful.append(player)
-                elif status == "questionable":
-                    report.questionable.append(player)
-                elif status in ("probable", "available"):
-                    report.probable.append(player)
-                elif status in ("day-to-day", "day to day"):
-                    report.day_to_day.append(player)
-                else:
-                    report.questionable.append(player)
-
-            reports[team_name] = report
+            reports[team_name] = InjuryReport(team_name, **buckets)
 
         logger.info("Parsed injury reports for %d teams", len(reports))
-        return reports
+        return InjuryReports(reports)
 
     @staticmethod
     def _parse_roster(data: dict) -> list[dict]:
         """Parse ESPN roster response into player stat dicts."""
-        players = []
-        for group in data.get("athletes", []):
-            for athlete in group.get("items", []):
-                players.append({
-                    "name": athlete.get("displayName", ""),
-                    "position": athlete.get("position", {}).get("abbreviation", ""),
-                    "jersey": athlete.get("jersey", ""),
-                    "age": athlete.get("age"),
-                    "experience": athlete.get("experience", {}).get("years", 0),
-                })
-        return players
+        return [
+            {
+                "name": athlete.get("displayName", ""),
+                "position": (athlete.get("position") or {}).get("abbreviation", ""),
+                "jersey": athlete.get("jersey", ""),
+                "age": athlete.get("age"),
+                "experience": (athlete.get("experience") or {}).get("years", 0),
+            }
+            for group in data.get("athletes", ())
+            for athlete in group.get("items", ())
+        ]
+
+
+def _same_team(a: str, b: str) -> bool:
+    """
+    Whether two processed names can be one team: same last word (nickname),
+    or one name's words are all in the other ("detroit" / "detroit pistons").
+
+    Token-set similarity alone rates city rivals such as "Los Angeles
+    Clippers" / "Los Angeles Lakers" well above the cutoff.
+    """
+    a_words = a.split()
+    b_words = b.split()
+    if not a_words or not b_words:
+        return False
+    return a_words[-1] == b_words[-1] or set(a_words) <= set(b_words) or set(b_words) <= set(a_words)
 
 
 def _fuzzy_match(a: str, b: str) -> bool:
-    """Check if two team names match fuzzily."""
-    a_lower = a.lower().strip()
-    b_lower = b.lower().strip()
-    if a_lower == b_lower:
-        return True
-    if a_lower in b_lower or b_lower in a_lower:
-        return True
-    # Last word match (e.g. "Pistons" in "Detroit Pistons")
-    a_last = a_lower.split()[-1] if a_lower else ""
-    b_last = b_lower.split()[-1] if b_lower else ""
-    if a_last and len(a_last) > 3 and (a_last in b_lower or b_last in a_lower):
-        return True
-    return False
+    """Check if two team names match fuzzily (e.g. "Pistons" / "Detroit Pistons")."""
+    a = utils.default_process(a)
+    b = utils.default_process(b)
+    return fuzz.token_set_ratio(a, b) >= FUZZY_MATCH_CUTOFF and _same_team(a, b)
+
+
+def _best_match(team: str, names: list[str]) -> str | None:
+    """The name in ``names`` most similar to ``team``, or None below the cutoff."""
+    query = utils.default_process(team)
+    candidates = process.extract(
+        query, names,
+        scorer=fuzz.token_set_ratio,
+        processor=utils.default_process,
+        score_cutoff=FUZZY_MATCH_CUTOFF,
+        limit=None,
+    )
+    for name, _score, _index in candidates:
+        if _same_team(query, utils.default_process(name)):
+            return name
+    return None
+
+
+def _match_team(team: str, reports: dict[str, InjuryReport]) -> str | None:
+    """
+    Name of the report in ``reports`` for ``team``, or None.
+
+    Probes the ``InjuryReports.name_index`` for the case-folded name first;
+    only misses fall back to the fuzzy scorer, whose result is memoized in
+    ``InjuryReports.fuzzy_cache``.  Either way the answer is the one
+    ``_best_match`` gives over the report names.
+    """
+    index = getattr(reports, "name_index", None)
+    if index is not None:
+        name = index.get(team.lower().strip())
+        if name is not None:
+            return name
+    cache = getattr(reports, "fuzzy_cache", None)
+    if cache is None:
+        return _best_match(team, list(reports))
+    try:
+        return cache[team]
+    except KeyError:
+        name = cache[team] = _best_match(team, list(reports))
+        return name
@@ -4,19 +4,22 @@ FastAPI application – Sports Arbitrage Finder.
 Serves the web dashboard and API endpoints for odds and arbitrage data.
 """
 
-import json
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from datetime import UTC, datetime
 from pathlib import Path
 
+import orjson
 from fastapi import FastAPI, Query, Request
 from fastapi.responses import HTMLResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
-from app.models import Event
+from app.orjson_response import ORJSONResponse
+from app.models import Event, iso_now
 from app.database import (
     init_db,
+    close_all,
     get_live_arbitrage,
     get_arbitrage_history,
     get_latest_odds,
@@ -28,6 +31,7 @@ from app.database import (
 )
 from app.scheduler import refresh_odds, start_scheduler, stop_scheduler, get_last_result
 from app.espn_client import ESPNClient
+from app.http import close_client, get_client
 from app.injuries import ESPNInjuryClient
 from app.predictor import predict_events, predict_game, build_features, add_injury_features
 from app.value_bets import find_value_bets
@@ -48,6 +52,10 @@ async def lifespan(app: FastAPI):
     )
     init_db()
     logger.info("Database initialized at %s", settings.DB_PATH)
+    # One pooled HTTP client for every outbound API call
+    app.state.http = get_client()
+    # The dashboard is static: read it once instead of on every GET /
+    app.state.dashboard_html = (TEMPLATES_DIR / "dashboard.html").read_bytes()
 
     if settings.has_api_key:
         logger.info("API key found – running initial odds fetch…")
@@ -63,6 +71,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     stop_scheduler()
+    await close_client()
+    close_all()
 
 
 # ── App ───────────────────────────────────────────────────────────────
@@ -72,6 +82,7 @@ app = FastAPI(
     description="Detect risk-free arbitrage opportunities across sportsbooks",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -80,8 +91,7 @@ app = FastAPI(
 @app.get("/", response_class=HTMLResponse)
 async def dashboard():
     """Serve the main dashboard."""
-    html_path = TEMPLATES_DIR / "dashboard.html"
-    return HTMLResponse(content=html_path.read_text())
+    return HTMLResponse(content=app.state.dashboard_html)
 
 
 # ── API routes ────────────────────────────────────────────────────────
@@ -89,21 +99,21 @@ async def dashboard():
 @app.get("/api/arbitrage")
 async def api_arbitrage():
     """Return currently-live arbitrage opportunities."""
-    arbs = get_live_arbitrage()
+    arbs = await run_in_threadpool(get_live_arbitrage)
     # Parse legs JSON back to objects
     for a in arbs:
         if isinstance(a.get("legs"), str):
-            a["legs"] = json.loads(a["legs"])
-    return {"arbitrage": arbs, "count": len(arbs), "timestamp": datetime.now(UTC).isoformat()}
+            a["legs"] = orjson.loads(a["legs"])
+    return {"arbitrage": arbs, "count": len(arbs), "timestamp": iso_now()}
 
 
 @app.get("/api/arbitrage/history")
 async def api_arbitrage_history(limit: int = Query(50, ge=1, le=500)):
     """Return historical arbitrage opportunities."""
-    arbs = get_arbitrage_history(limit)
+    arbs = await run_in_threadpool(get_arbitrage_history, limit)
     for a in arbs:
         if isinstance(a.get("legs"), str):
-            a["legs"] = json.loads(a["legs"])
+            a["legs"] = orjson.loads(a["legs"])
     return {"arbitrage": arbs, "count": len(arbs)}
 
 
@@ -113,7 +123,7 @@ async def api_odds(sport: str = Query(None)):
     sport_key = None
     if sport:
         sport_key = settings.SPORT_KEYS.get(sport.upper(), sport)
-    rows = get_latest_odds(sport_key)
+    rows = await run_in_threadpool(get_latest_odds, sport_key)
     return {"odds": rows, "count": len(rows)}
 
 
@@ -127,7 +137,9 @@ async def api_refresh():
 @app.get("/api/status")
 async def api_status():
     """Application status, config, and API usage."""
-    usage = get_api_usage()
+    # get_api_usage is the only lookup here that blocks; the last refresh
+    # result and settings are in memory, so there is nothing to gather it with.
+    usage = await run_in_threadpool(get_api_usage)
     last = get_last_result()
     return {
         "api_key_configured": settings.has_api_key,
@@ -159,33 +171,68 @@ async def api_predictions(sport: str = Query("NFL")):
     """
     sport_key = settings.SPORT_KEYS.get(sport.upper(), sport)
 
-    # Fetch team stats from ESPN
+    from app.odds_client import OddsClient
+
+    async def fetch_odds() -> list[Event]:
+        if not settings.has_api_key:
+            return []
+        # Fetch both moneyline and spreads for spread coverage analysis
+        events, _ = await OddsClient().get_odds(sport_key, markets="h2h,spreads")
+        return events
+
+    # ESPN stats, live odds and injury reports are independent: fetch them
+    # concurrently so the endpoint waits for the slowest, not the sum.
     espn = ESPNClient()
+    stats_task = asyncio.ensure_future(espn.get_team_stats(sport_key))
+    odds_task = asyncio.ensure_future(fetch_odds())
+    injuries_task = asyncio.ensure_future(ESPNInjuryClient().get_injuries(sport_key))
     try:
-        team_stats = await espn.get_team_stats(sport_key)
-    finally:
-        await espn.close()
+        team_stats = await stats_task
+    except BaseException:
+        odds_task.cancel()
+        injuries_task.cancel()
+        raise
+
+    # Without team stats every prediction is degenerate: drop the in-flight
+    # odds/injury requests and skip the predictor entirely.
+    if not team_stats:
+        odds_task.cancel()
+        injuries_task.cancel()
+        return ORJSONResponse({
+            "predictions": [],
+            "value_bets": [],
+            "prediction_count": 0,
+            "value_bet_count": 0,
+            "teams_with_stats": 0,
+            "injuries_loaded": 0,
+            "sport": sport.upper(),
+            "timestamp": iso_now(),
+            "note": "no team stats available",
+        })
 
-    # Get current events with odds (from last refresh)
-    from app.odds_client import OddsClient
-    events = []
-    odds_error = ""
-    if settings.has_api_key:
-        client = OddsClient()
-        try:
-            # Fetch both moneyline and spreads for spread coverage analysis
-            events, _ = await client.get_odds(sport_key, markets="h2h,spreads")
-        except Exception as e:
-            odds_error = str(e)
-            logger.error("Error fetching odds for predictions: %s", e)
-        finally:
-            await client.close()
-
-    # Fallback: if no odds events, create matchups from ESPN scoreboard
-    if not events and team_stats:
-        espn2 = ESPNClient()
+    try:
+        events = await odds_task
+    except Exception as e:
+        logger.error("Error fetching odds for predictions: %s", e)
+        events = []
+
+    # Fallback: if no odds events, create matchups from ESPN scoreboard.
+    # The scoreboard request overlaps the still-running injury fetch.
+    if events:
+        (injury_reports,) = await asyncio.gather(injuries_task, return_exceptions=True)
+        scoreboard = None
+    else:
+        scoreboard, injury_reports = await asyncio.gather(
+            espn.get_scoreboard(sport_key), injuries_task, return_exceptions=True,
+        )
+    if isinstance(injury_reports, BaseException):
+        logger.warning("Could not fetch injuries: %s", injury_reports)
+        injury_reports = {}
+
+    if scoreboard is not None:
         try:
-            scoreboard = await espn2.get_scoreboard(sport_key)
+            if isinstance(scoreboard, BaseException):
+                raise scoreboard
             for g in scoreboard:
                 if not g.get("completed"):
                     events.append(Event(
@@ -210,47 +257,30 @@ async def api_predictions(sport: str = Query("NFL")):
                     ))
         except Exception as e:
             logger.error("Error fetching ESPN scoreboard: %s", e)
-        finally:
-            await espn2.close()
-
-    # Fetch injury reports from ESPN
-    injury_client = ESPNInjuryClient()
-    injury_data: dict = {}
-    try:
-        injury_reports = await injury_client.get_injuries(sport_key)
-        injury_data = {name: r.to_dict() for name, r in injury_reports.items()}
-    except Exception as e:
-        logger.warning("Could not fetch injuries: %s", e)
-    finally:
-        await injury_client.close()
 
     # Run predictions (injuries included in feature engineering)
-    predictions = predict_events(events, team_stats, injury_reports=injury_reports if injury_data else None)
+    predictions = predict_events(events, team_stats, injury_reports=injury_reports or None)
 
     # Find value bets
     value_bets = find_value_bets(predictions, events)
 
-    return {
-        "predictions": [p.model_dump() for p in predictions],
-        "value_bets": [v.model_dump() for v in value_bets],
+    return ORJSONResponse({
+        "predictions": predictions,
+        "value_bets": value_bets,
         "prediction_count": len(predictions),
         "value_bet_count": len(value_bets),
         "teams_with_stats": len(team_stats),
-        "injuries_loaded": len(injury_data),
+        "injuries_loaded": len(injury_reports),
         "sport": sport.upper(),
-        "timestamp": datetime.now(UTC).isoformat(),
-    }
+        "timestamp": iso_now(),
+    })
 
 
 @app.get("/api/standings")
 async def api_standings(sport: str = Query("NFL")):
     """Get current team standings from ESPN."""
     sport_key = settings.SPORT_KEYS.get(sport.upper(), sport)
-    espn = ESPNClient()
-    try:
-        records = await espn.get_team_stats(sport_key)
-    finally:
-        await espn.close()
+    records = await ESPNClient().get_team_stats(sport_key)
 
     # Sort by win percentage
     sorted_teams = sorted(records.values(), key=lambda r: r.win_pct, reverse=True)
@@ -277,11 +307,7 @@ async def api_standings(sport: str = Query("NFL")):
 async def api_injuries(sport: str = Query("NBA")):
     """Get current injury reports from ESPN."""
     sport_key = settings.SPORT_KEYS.get(sport.upper(), sport)
-    client = ESPNInjuryClient()
-    try:
-        reports = await client.get_injuries(sport_key)
-    finally:
-        await client.close()
+    reports = await ESPNInjuryClient().get_injuries(sport_key)
 
     return {
         "injuries": {name: r.to_dict() for name, r in reports.items()},
@@ -295,11 +321,9 @@ async def api_live(sport: str = Query("NBA")):
     """Live scoreboard with scores, predictions, and watch links."""
     sport_key = settings.SPORT_KEYS.get(sport.upper(), sport)
     espn = ESPNClient()
-    try:
-        scoreboard = await espn.get_scoreboard(sport_key)
-        team_stats = await espn.get_team_stats(sport_key)
-    finally:
-        await espn.close()
+    scoreboard, team_stats = await asyncio.gather(
+        espn.get_scoreboard(sport_key), espn.get_team_stats(sport_key),
+    )
 
     from app.predictor import predict_game as pg
     sp_map = {"americanfootball_nfl": "nfl", "basketball_nba": "nba", "baseball_mlb": "mlb",
@@ -329,7 +353,7 @@ async def api_live(sport: str = Query("NBA")):
                       "espn_link": espn_link, "youtube_tv_link": "https://tv.youtube.com/",
                       "prediction": pred_data})
     return {"games": games, "count": len(games), "sport": sport.upper(),
-            "timestamp": datetime.now(UTC).isoformat()}
+            "timestamp": iso_now()}
 
 
 # ── Bet Tracker routes ────────────────────────────────────────────────
@@ -368,7 +392,7 @@ async def api_add_bet(request: Request):
         "notes": body.get("notes", ""),
     }
 
-    bet_id = add_bet(bet_data)
+    bet_id = await run_in_threadpool(add_bet, bet_data)
     return {"id": bet_id, "potential_win": round(potential_win, 2), "status": "pending"}
 
 
@@ -380,7 +404,7 @@ async def api_settle_bet(bet_id: int, request: Request):
     if result not in ("win", "loss", "push"):
         return {"error": "result must be 'win', 'loss', or 'push'"}
 
-    bet = settle_bet(bet_id, result)
+    bet = await run_in_threadpool(settle_bet, bet_id, result)
     if not bet:
         return {"error": "Bet not found"}
     return bet
@@ -389,8 +413,9 @@ async def api_settle_bet(bet_id: int, request: Request):
 @app.get("/api/bets")
 async def api_get_bets(limit: int = Query(200, ge=1, le=1000)):
     """Get all tracked bets."""
-    bets = get_all_bets(limit)
-    summary = get_bet_summary()
+    bets, summary = await asyncio.gather(
+        run_in_threadpool(get_all_bets, limit), run_in_threadpool(get_bet_summary),
+    )
     return {"bets": bets, "summary": summary}
 
 
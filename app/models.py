@@ -2,13 +2,36 @@
 Pydantic models for the Sports Arbitrage Finder.
 """
 
+import time
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from functools import cached_property
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
+
+
+# (epoch second, its ISO string), replaced once per second
+_ISO_NOW: tuple[int, str] = (-1, "")
+
+
+def iso_now() -> str:
+    """Current UTC time as an ISO-8601 string, at one-second resolution.
+
+    Formatted once per second and shared by every caller in that second.
+    """
+    global _ISO_NOW
+    now = int(time.time())
+    cached = _ISO_NOW
+    if cached[0] != now:
+        cached = _ISO_NOW = (now, datetime.fromtimestamp(now, UTC).isoformat())
+    return cached[1]
 
 
 class OddsOutcome(BaseModel):
     """A single outcome line from a bookmaker."""
+    model_config = ConfigDict(frozen=True)
+
     name: str
     price: int  # American odds
     point: float | None = None  # Spread / total line
@@ -16,6 +39,8 @@ class OddsOutcome(BaseModel):
 
 class BookmakerOdds(BaseModel):
     """Odds offered by one bookmaker for one market on one event."""
+    model_config = ConfigDict(frozen=True)
+
     bookmaker_key: str
     bookmaker_title: str
     market: str
@@ -24,7 +49,11 @@ class BookmakerOdds(BaseModel):
 
 
 class Event(BaseModel):
-    """A sporting event with odds from multiple bookmakers."""
+    """A sporting event with odds from multiple bookmakers.
+
+    Bookmaker lines are not modified after parsing, so ``h2h_bookmakers``
+    is computed on first access and cached on the instance.
+    """
     id: str
     sport_key: str
     sport_title: str
@@ -33,9 +62,22 @@ class Event(BaseModel):
     commence_time: str
     bookmakers: list[BookmakerOdds] = Field(default_factory=list)
 
+    @cached_property
+    def h2h_bookmakers(self) -> list[BookmakerOdds]:
+        """The moneyline (``h2h``) entries of ``bookmakers``, in order."""
+        return [bm for bm in self.bookmakers if bm.market == "h2h"]
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> "Event":
+        copy = super().model_copy(update=update, deep=deep)
+        # Copies may get new or edited lines; rebuild the partition on demand
+        copy.__dict__.pop("h2h_bookmakers", None)
+        return copy
+
 
 class ArbLeg(BaseModel):
     """One leg of an arbitrage opportunity."""
+    model_config = ConfigDict(frozen=True)
+
     outcome: str
     bookmaker: str
     price: int  # American odds
@@ -55,7 +97,60 @@ class ArbitrageOpportunity(BaseModel):
     profit_pct: float
     total_implied_prob: float
     legs: list[ArbLeg]
-    detected_at: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
+    detected_at: str = Field(default_factory=iso_now)
+
+
+# Lightweight, unvalidated counterparts of ArbLeg / ArbitrageOpportunity
+# built by the arbitrage scanner; convert with to_pydantic() at API edges.
+
+@dataclass(slots=True, frozen=True)
+class RawArbLeg:
+    """One leg of an arbitrage opportunity (hot-path struct)."""
+    outcome: str
+    bookmaker: str
+    price: int
+    implied_prob: float
+    stake_pct: float
+
+    def to_pydantic(self) -> ArbLeg:
+        return ArbLeg.model_construct(
+            outcome=self.outcome,
+            bookmaker=self.bookmaker,
+            price=self.price,
+            implied_prob=self.implied_prob,
+            stake_pct=self.stake_pct,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class RawArbOpportunity:
+    """A detected arbitrage opportunity (hot-path struct)."""
+    sport_key: str
+    event_id: str
+    event_name: str
+    home_team: str
+    away_team: str
+    commence_time: str
+    market: str
+    profit_pct: float
+    total_implied_prob: float
+    legs: tuple[RawArbLeg, ...]
+    detected_at: str = field(default_factory=iso_now)
+
+    def to_pydantic(self) -> ArbitrageOpportunity:
+        return ArbitrageOpportunity.model_construct(
+            sport_key=self.sport_key,
+            event_id=self.event_id,
+            event_name=self.event_name,
+            home_team=self.home_team,
+            away_team=self.away_team,
+            commence_time=self.commence_time,
+            market=self.market,
+            profit_pct=self.profit_pct,
+            total_implied_prob=self.total_implied_prob,
+            legs=[leg.to_pydantic() for leg in self.legs],
+            detected_at=self.detected_at,
+        )
 
 
 class RefreshResult(BaseModel):
@@ -65,7 +160,7 @@ class RefreshResult(BaseModel):
     sports_checked: list[str] = Field(default_factory=list)
     errors: list[str] = Field(default_factory=list)
     api_requests_remaining: int | None = None
-    timestamp: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
+    timestamp: str = Field(default_factory=iso_now)
 
 
 class ApiUsage(BaseModel):
@@ -80,7 +175,15 @@ class ApiUsage(BaseModel):
 # ═══════════════════════════════════════════════════════════════════════
 
 class TeamRecord(BaseModel):
-    """Season record for a team."""
+    """Season record for a team.
+
+    The record is frozen, so the derived rates are computed on first access
+    and cached on the instance. Recent form is packed into ``last_5_bits``
+    (one bit per win, most recent game in the lowest bit) plus the number of
+    games it covers; a ``last_5`` list of "W"/"L" results is still accepted.
+    """
+    model_config = ConfigDict(frozen=True)
+
     team: str
     wins: int = 0
     losses: int = 0
@@ -92,44 +195,77 @@ class TeamRecord(BaseModel):
     away_wins: int = 0
     away_losses: int = 0
     streak: int = 0  # positive = win streak, negative = loss streak
-    last_5: list[str] = Field(default_factory=list)  # ["W","L","W","W","L"]
+    last_5_bits: int = 0
+    last_5_len: int = 0
     sport_key: str = ""
     season: str = ""
 
+    @model_validator(mode="before")
+    @classmethod
+    def _pack_last_5(cls, data: Any) -> Any:
+        if isinstance(data, dict) and "last_5" in data:
+            data = dict(data)
+            results = data.pop("last_5")[-5:]
+            bits = 0
+            for r in results:
+                bits = (bits << 1) | (r == "W")
+            data["last_5_bits"] = bits
+            data["last_5_len"] = len(results)
+        return data
+
     @property
+    def last_5(self) -> list[str]:
+        """Recent results oldest first, e.g. ["W","L","W","W","L"]."""
+        bits = self.last_5_bits
+        return ["W" if bits >> i & 1 else "L" for i in range(self.last_5_len - 1, -1, -1)]
+
+    @cached_property
     def win_pct(self) -> float:
         total = self.wins + self.losses + self.ties
         return self.wins / total if total > 0 else 0.0
 
-    @property
+    @cached_property
     def ppg(self) -> float:
         total = self.wins + self.losses + self.ties
         return self.points_for / total if total > 0 else 0.0
 
-    @property
+    @cached_property
     def opp_ppg(self) -> float:
         total = self.wins + self.losses + self.ties
         return self.points_against / total if total > 0 else 0.0
 
-    @property
+    @cached_property
     def point_diff(self) -> float:
         return self.ppg - self.opp_ppg
 
-    @property
+    @cached_property
     def home_win_pct(self) -> float:
         total = self.home_wins + self.home_losses
         return self.home_wins / total if total > 0 else 0.5
 
-    @property
+    @cached_property
     def away_win_pct(self) -> float:
         total = self.away_wins + self.away_losses
         return self.away_wins / total if total > 0 else 0.5
 
-    @property
+    @cached_property
     def last_5_win_pct(self) -> float:
-        if not self.last_5:
+        if not self.last_5_len:
             return 0.5
-        return sum(1 for r in self.last_5 if r == "W") / len(self.last_5)
+        return self.last_5_bits.bit_count() / self.last_5_len
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> "TeamRecord":
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            # Cached rates were copied along with the fields; drop them
+            for name in _TEAM_RECORD_DERIVED:
+                copy.__dict__.pop(name, None)
+        return copy
+
+
+_TEAM_RECORD_DERIVED = tuple(
+    name for name, attr in vars(TeamRecord).items() if isinstance(attr, cached_property)
+)
 
 
 class GamePrediction(BaseModel):
@@ -152,18 +288,52 @@ class GamePrediction(BaseModel):
     cover_side: str | None = None  # "home" or "away" — which side to bet
     cover_confidence: float | None = None  # 0.0 – 1.0
     cover_label: str | None = None  # "lock", "strong", "lean", "toss-up", "fade"
-    cover_reasoning: str | None = None
+    cover_edge: float | None = None  # points our margin beats the spread by, for the covering side
+    reasoning_code: int | None = None  # cover_reasoning template: 0 efficient, 1 slim, 2 moderate, 3 strong
     features: dict[str, float] = Field(default_factory=dict)
     feature_explanations: list[dict] = Field(default_factory=list)  # [{name, value, weight, impact, description}]
     home_injuries: dict | None = None  # {summary, out: [...], impact_score}
     away_injuries: dict | None = None
     reasoning: str = ""
     model_version: str = "v1.0"
-    predicted_at: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
+    predicted_at: str = Field(default_factory=iso_now)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def cover_reasoning(self) -> str | None:
+        """Spread-coverage explanation, formatted from the fields above on each read."""
+        if self.reasoning_code is None:
+            return None
+        spread_str = f"{self.book_spread:+.1f}" if self.book_spread else "PK"
+        if self.cover_side == "home":
+            cover_team = self.home_team
+        else:
+            cover_team = self.away_team
+        return (
+            f"Book spread: {self.home_team} {spread_str}. "
+            f"Our model projects {self.home_team} winning by {self.spread_prediction or 0.0:+.1f}. "
+            + _REASONING_TEMPLATES[self.reasoning_code].format(team=cover_team, edge=self.cover_edge)
+        )
+
+
+# Edge sentence by reasoning_code: 0 efficient (<0.5 points), 1 slim,
+# 2 moderate (>=2), 3 strong (>=4)
+_REASONING_TEMPLATES = (
+    "Market is very efficient here — our model agrees with the spread.",
+    "Slim edge for {team} — only {edge:.1f} points beyond the spread. Could go either way.",
+    "Moderate edge: {team} has about {edge:.1f} points of cushion beyond the spread.",
+    "Strong edge: our margin is {edge:.1f} points beyond the spread — {team} should cover comfortably.",
+)
 
 
 class ValueBet(BaseModel):
     """A bet where our model disagrees with the books — potential edge."""
+    # extra="forbid" only applies to validated construction (ValueBet(...),
+    # model_validate); find_value_bets builds bets with model_construct,
+    # which skips validation, and only re-validates the first one in debug
+    # runs.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     event_id: str
     sport_key: str
     event_name: str
@@ -177,4 +347,4 @@ class ValueBet(BaseModel):
     confidence: float
     confidence_label: str
     kelly_fraction: float  # Kelly criterion suggested stake %
-    predicted_at: str = Field(default_factory=lambda: datetime.now(UTC).isoformat())
+    predicted_at: str = Field(default_factory=iso_now)
@@ -3,14 +3,18 @@ Client for The Odds API (https://the-odds-api.com).
 Fetches live odds from multiple sportsbooks for arbitrage analysis.
 """
 
+import asyncio
 import logging
+import sys
 from datetime import UTC, datetime
 
 import httpx
+import orjson
 
 from app.config import settings
 from app.models import Event, BookmakerOdds, OddsOutcome
-from app.database import save_odds, save_api_usage
+from app.database import save_api_usage, save_odds_rows
+from app.http import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +22,14 @@ logger = logging.getLogger(__name__)
 class OddsClient:
     """HTTP client for The Odds API."""
 
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient | None = None):
         self.base_url = settings.ODDS_API_BASE_URL
         self.api_key = settings.ODDS_API_KEY
-        self._client = httpx.AsyncClient(timeout=30.0)
+        self._client = client or get_client()
 
     async def close(self):
-        await self._client.aclose()
+        # The HTTP client is shared (see app.http) and closed at shutdown
+        pass
 
     # ------------------------------------------------------------------
     # Public helpers
@@ -79,19 +84,36 @@ class OddsClient:
         """
         Fetch odds for multiple sports.  Returns combined events list
         and the latest usage dict.
+
+        The per-sport requests run concurrently over the shared client's
+        connection pool; results are combined in ``sport_keys`` order.
+        Responses can arrive in any order, so the latest usage is the one
+        reporting the fewest requests remaining, not the last sport's.
         """
         keys = sport_keys or list(settings.SPORT_KEYS.values())
         all_events: list[Event] = []
         latest_usage: dict = {}
+        fewest_remaining: int | None = None
 
-        for key in keys:
-            try:
-                events, usage = await self.get_odds(key)
-                all_events.extend(events)
+        results = await asyncio.gather(
+            *(self.get_odds(key) for key in keys), return_exceptions=True,
+        )
+        for key, result in zip(keys, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result  # cancellation etc. is not a per-sport failure
+                logger.error("Error fetching odds for %s: %s", key, result)
+                continue
+            events, usage = result
+            all_events.extend(events)
+            if usage.get("remaining") is not None:
+                remaining = int(usage["remaining"])
+                if fewest_remaining is None or remaining < fewest_remaining:
+                    fewest_remaining = remaining
+                    latest_usage = usage
+            elif not latest_usage:
                 latest_usage = usage
-                logger.info("Fetched %d events for %s", len(events), key)
-            except Exception as e:
-                logger.error("Error fetching odds for %s: %s", key, e)
+            logger.info("Fetched %d events for %s", len(events), key)
 
         return all_events, latest_usage
 
@@ -100,31 +122,21 @@ class OddsClient:
     # ------------------------------------------------------------------
 
     def persist_events(self, events: list[Event]):
-        """Flatten events into rows and save to SQLite."""
+        """Flatten events into ``ODDS_COLUMNS``-ordered row tuples and save to SQLite."""
         now = datetime.now(UTC).isoformat()
-        rows: list[dict] = []
+        rows: list[tuple] = []
 
         for ev in events:
+            # Event-level columns are built once and shared by every outcome row
+            event_cols = (
+                ev.sport_key, ev.id, f"{ev.away_team} @ {ev.home_team}",
+                ev.home_team, ev.away_team, ev.commence_time,
+            )
             for bm in ev.bookmakers:
-                for outcome in bm.outcomes:
-                    rows.append(
-                        {
-                            "sport_key": ev.sport_key,
-                            "event_id": ev.id,
-                            "event_name": f"{ev.away_team} @ {ev.home_team}",
-                            "home_team": ev.home_team,
-                            "away_team": ev.away_team,
-                            "commence_time": ev.commence_time,
-                            "bookmaker": bm.bookmaker_title,
-                            "market": bm.market,
-                            "outcome_name": outcome.name,
-                            "price": outcome.price,
-                            "point": outcome.point,
-                            "fetched_at": now,
-                        }
-                    )
-
-        save_odds(rows)
+                head = event_cols + (bm.bookmaker_title, bm.market)
+                rows.extend([head + (o.name, o.price, o.point, now) for o in bm.outcomes])
+
+        save_odds_rows(rows)
         logger.info("Persisted %d odds rows", len(rows))
 
     # ------------------------------------------------------------------
@@ -135,44 +147,52 @@ class OddsClient:
         url = f"{self.base_url}{path}"
         resp = await self._client.request(method, url, params=params)
         resp.raise_for_status()
+        data = orjson.loads(resp.content)
         if return_headers:
-            return resp.json(), dict(resp.headers)
-        return resp.json()
+            return data, dict(resp.headers)
+        return data
 
     @staticmethod
     def _parse_events(data: list[dict], sport_key: str) -> list[Event]:
+        # Bookmaker, market, team and outcome names repeat across thousands
+        # of lines; interning them shares one string object per distinct
+        # value, and a team name compared against an outcome name (value-bet
+        # and arbitrage scans) then matches on identity.
+        # The payload comes from a trusted API and is destructured field by
+        # field here, so models are built with model_construct (no validation).
+        intern = sys.intern
+        new_outcome = OddsOutcome.model_construct
+        new_bookmaker = BookmakerOdds.model_construct
+        new_event = Event.model_construct
         events: list[Event] = []
         for item in data:
             bookmakers: list[BookmakerOdds] = []
-            for bm in item.get("bookmakers", []):
-                for market in bm.get("markets", []):
-                    outcomes = [
-                        OddsOutcome(
-                            name=o["name"],
-                            price=o["price"],
-                            point=o.get("point"),
-                        )
-                        for o in market.get("outcomes", [])
-                    ]
-                    bookmakers.append(
-                        BookmakerOdds(
-                            bookmaker_key=bm["key"],
-                            bookmaker_title=bm["title"],
-                            market=market["key"],
-                            outcomes=outcomes,
-                            last_update=bm.get("last_update"),
-                        )
-                    )
-
-            events.append(
-                Event(
-                    id=item["id"],
-                    sport_key=item.get("sport_key", sport_key),
-                    sport_title=item.get("sport_title", sport_key),
-                    home_team=item["home_team"],
-                    away_team=item["away_team"],
-                    commence_time=item["commence_time"],
-                    bookmakers=bookmakers,
-                )
-            )
+            add_bookmaker = bookmakers.append
+            for bm in item.get("bookmakers", ()):
+                bm_key = intern(bm["key"])
+                bm_title = intern(bm["title"])
+                last_update = bm.get("last_update")
+                for market in bm.get("markets", ()):
+                    add_bookmaker(new_bookmaker(
+                        bookmaker_key=bm_key,
+                        bookmaker_title=bm_title,
+                        market=intern(market["key"]),
+                        outcomes=[
+                            new_outcome(
+                                name=intern(o["name"]), price=o["price"], point=o.get("point"),
+                            )
+                            for o in market.get("outcomes", ())
+                        ],
+                        last_update=last_update,
+                    ))
+
+            events.append(new_event(
+                id=item["id"],
+                sport_key=item.get("sport_key", sport_key),
+                sport_title=item.get("sport_title", sport_key),
+                home_team=intern(item["home_team"]),
+                away_team=intern(item["away_team"]),
+                commence_time=item["commence_time"],
+                bookmakers=bookmakers,
+            ))
         return events
@@ -11,8 +11,10 @@ trained on historical data or applied heuristically when training
 data is unavailable (cold-start mode).
 """
 
+import heapq
 import logging
 import math
+from collections import OrderedDict
 from typing import Any, TYPE_CHECKING
 
 import numpy as np
@@ -20,7 +22,8 @@ import numpy as np
 if TYPE_CHECKING:
     from app.injuries import InjuryReport
 
-from app.models import Event, GamePrediction, TeamRecord
+from app.injuries import _match_team
+from app.models import Event, GamePrediction, TeamRecord, iso_now
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +42,60 @@ def confidence_label(confidence: float) -> str:
 
 
 def _sigmoid(x: float) -> float:
-    """Numerically stable sigmoid."""
-    if x >= 0:
-        return 1.0 / (1.0 + math.exp(-x))
-    ex = math.exp(x)
-    return ex / (1.0 + ex)
+    """Numerically stable, branchless sigmoid: 0.5 * (1 + tanh(x / 2))."""
+    return 0.5 * (1.0 + math.tanh(0.5 * x))
+
+
+# Positional layout of the feature vector; the dict form used for display
+# and persistence is built from it with these keys, in this order.
+BASE_FEATURES: tuple[str, ...] = (
+    "win_pct_diff",
+    "home_home_win_pct",
+    "away_away_win_pct",
+    "venue_edge",
+    "ppg_diff",
+    "opp_ppg_diff",
+    "point_diff_diff",
+    "streak_diff",
+    "last5_diff",
+    "strength_diff",
+    "home_field",
+)
+INJURY_FEATURES: tuple[str, ...] = ("injury_diff", "home_injury_impact", "away_injury_impact")
+_NO_INJURIES = (0.0, 0.0, 0.0)
+
+
+def build_feature_vector(home: TeamRecord, away: TeamRecord) -> tuple[float, ...]:
+    """
+    Engineer the base features from two team records, in ``BASE_FEATURES`` order.
+
+    All features are from the home team's perspective:
+    positive = home advantage, negative = away advantage.
+    """
+    home_win_pct = home.win_pct
+    away_win_pct = away.win_pct
+    home_home_win_pct = home.home_win_pct
+    away_away_win_pct = away.away_win_pct
+    home_point_diff = home.point_diff
+    away_point_diff = away.point_diff
+
+    # Derived strength metrics
+    home_strength = home_win_pct * 0.5 + home_point_diff * 0.02
+    away_strength = away_win_pct * 0.5 + away_point_diff * 0.02
+
+    return (
+        home_win_pct - away_win_pct,                    # win_pct_diff
+        home_home_win_pct,                              # home_home_win_pct
+        away_away_win_pct,                              # away_away_win_pct
+        home_home_win_pct - away_away_win_pct,          # venue_edge
+        home.ppg - away.ppg,                            # ppg_diff
+        away.opp_ppg - home.opp_ppg,                    # opp_ppg_diff (lower = better D)
+        home_point_diff - away_point_diff,              # point_diff_diff
+        float(home.streak - away.streak),               # streak_diff
+        home.last_5_win_pct - away.last_5_win_pct,      # last5_diff
+        home_strength - away_strength,                  # strength_diff
+        0.03,                                           # home_field: ~3% baseline HFA
+    )
 
 
 def build_features(
@@ -56,37 +108,23 @@ def build_features(
     All features are from the home team's perspective:
     positive = home advantage, negative = away advantage.
     """
-    features: dict[str, float] = {}
-
     if not home or not away:
-        return features
+        return {}
+    return dict(zip(BASE_FEATURES, build_feature_vector(home, away)))
 
-    # ── Win percentage differential ───────────────────────────────
-    features["win_pct_diff"] = home.win_pct - away.win_pct
 
-    # ── Home / away splits ────────────────────────────────────────
-    features["home_home_win_pct"] = home.home_win_pct
-    features["away_away_win_pct"] = away.away_win_pct
-    features["venue_edge"] = home.home_win_pct - away.away_win_pct
-
-    # ── Scoring ───────────────────────────────────────────────────
-    features["ppg_diff"] = home.ppg - away.ppg
-    features["opp_ppg_diff"] = away.opp_ppg - home.opp_ppg  # lower opp ppg = better D
-    features["point_diff_diff"] = home.point_diff - away.point_diff
-
-    # ── Momentum ──────────────────────────────────────────────────
-    features["streak_diff"] = float(home.streak - away.streak)
-    features["last5_diff"] = home.last_5_win_pct - away.last_5_win_pct
-
-    # ── Derived strength metrics ──────────────────────────────────
-    home_strength = home.win_pct * 0.5 + home.point_diff * 0.02
-    away_strength = away.win_pct * 0.5 + away.point_diff * 0.02
-    features["strength_diff"] = home_strength - away_strength
-
-    # ── Home-field advantage baseline ─────────────────────────────
-    features["home_field"] = 0.03  # ~3% baseline HFA across sports
-
-    return features
+def injury_feature_vector(
+    home_injuries: "InjuryReport | None" = None,
+    away_injuries: "InjuryReport | None" = None,
+) -> tuple[float, float, float]:
+    """Injury-based features, in ``INJURY_FEATURES`` order."""
+    home_impact = home_injuries.impact_score if home_injuries else 0.0
+    away_impact = away_injuries.impact_score if away_injuries else 0.0
+    return (
+        away_impact - home_impact,  # positive = home healthier
+        -home_impact,  # negative = worse for home
+        away_impact,   # positive = worse for away (good for home)
+    )
 
 
 def add_injury_features(
@@ -95,13 +133,7 @@ def add_injury_features(
     away_injuries: "InjuryReport | None" = None,
 ) -> dict[str, float]:
     """Add injury-based features to existing feature dict."""
-    home_impact = home_injuries.impact_score if home_injuries else 0.0
-    away_impact = away_injuries.impact_score if away_injuries else 0.0
-
-    features["injury_diff"] = away_impact - home_impact  # positive = home healthier
-    features["home_injury_impact"] = -home_impact  # negative = worse for home
-    features["away_injury_impact"] = away_impact   # positive = worse for away (good for home)
-
+    features.update(zip(INJURY_FEATURES, injury_feature_vector(home_injuries, away_injuries)))
     return features
 
 
@@ -124,6 +156,11 @@ FEATURE_WEIGHTS: dict[str, float] = {
     "away_injury_impact": 0.8,
 }
 
+# Column order and weight vector for scoring (see ``_score_batch``)
+FEATURE_ORDER: tuple[str, ...] = BASE_FEATURES + INJURY_FEATURES
+_W = np.array([FEATURE_WEIGHTS[k] for k in FEATURE_ORDER], dtype=np.float64)
+
+
 FEATURE_DESCRIPTIONS: dict[str, str] = {
     "win_pct_diff": "Overall win percentage differential",
     "home_home_win_pct": "Home team's home win rate",
@@ -164,17 +201,32 @@ def _build_feature_explanations(features: dict[str, float]) -> list[dict]:
     return explanations
 
 
-def predict_game(
+def _score_batch(vectors: list[tuple[float, ...]]) -> np.ndarray:
+    """
+    Home win probability for each ``FEATURE_ORDER`` vector: sigmoid of ``X · _W``.
+
+    The weighted sum is a row-wise ``sum`` rather than ``X @ _W``: BLAS may
+    group the terms differently depending on the number of rows, whereas a
+    row sum reduces every row the same way.  A game therefore scores
+    bit-identically alone (``predict_game``) and in a batch
+    (``predict_events``), which share the prediction cache.
+    """
+    X = np.array(vectors, dtype=np.float64).reshape(len(vectors), len(FEATURE_ORDER))
+    return 0.5 * (1.0 + np.tanh(0.5 * (X * _W).sum(axis=1)))
+
+
+def _confidence(home_win_prob: float) -> float:
+    """Confidence: distance from 50/50, 0 at 50/50 and capped at 95%."""
+    return min(abs(home_win_prob - 0.5) * 2, 0.95)
+
+
+def _game_features(
     event: Event,
     team_stats: dict[str, TeamRecord],
     home_injuries: "InjuryReport | None" = None,
     away_injuries: "InjuryReport | None" = None,
-) -> GamePrediction | None:
-    """
-    Predict the outcome of a single game.
-
-    Returns None if we don't have stats for either team.
-    """
+) -> tuple[TeamRecord, TeamRecord, tuple[float, ...]] | None:
+    """Resolve both teams and build the ``FEATURE_ORDER`` vector; None if unpredictable."""
     home = team_stats.get(event.home_team)
     away = team_stats.get(event.away_team)
 
@@ -188,24 +240,32 @@ def predict_game(
     if not away:
         away = TeamRecord(team=event.away_team, wins=0, losses=0, sport_key=event.sport_key)
 
-    features = build_features(home, away)
-    if not features:
-        return None
-
     # Add injury features if available
-    if home_injuries or away_injuries:
-        features = add_injury_features(features, home_injuries, away_injuries)
-
-    # Score: weighted sum of features → sigmoid → probability
-    raw_score = sum(
-        features.get(f, 0.0) * w for f, w in FEATURE_WEIGHTS.items()
+    injury = (
+        injury_feature_vector(home_injuries, away_injuries)
+        if home_injuries or away_injuries else _NO_INJURIES
     )
-    home_win_prob = _sigmoid(raw_score)
+    return home, away, build_feature_vector(home, away) + injury
+
+
+def _build_prediction(
+    event: Event,
+    home: TeamRecord,
+    away: TeamRecord,
+    vector: tuple[float, ...],
+    home_win_prob: float,
+    home_injuries: "InjuryReport | None" = None,
+    away_injuries: "InjuryReport | None" = None,
+    predicted_at: str | None = None,
+) -> GamePrediction:
+    """Turn a scored game into a ``GamePrediction``."""
     away_win_prob = 1.0 - home_win_prob
+    conf = _confidence(home_win_prob)
 
-    # Confidence: distance from 50/50
-    conf = abs(home_win_prob - 0.5) * 2  # 0 at 50/50, 1 at 100/0
-    conf = min(conf, 0.95)  # cap at 95%
+    # Named features for reasoning and display; injury slots only when
+    # there were injury reports (zip stops at the base features otherwise)
+    names = FEATURE_ORDER if home_injuries or away_injuries else BASE_FEATURES
+    features = dict(zip(names, vector))
 
     winner = event.home_team if home_win_prob >= 0.5 else event.away_team
 
@@ -219,10 +279,11 @@ def predict_game(
     cover_side = None
     cover_confidence = None
     cover_label_str = None
-    cover_reasoning = None
+    cover_edge = None
+    reasoning_code = None
 
     if book_spread is not None and expected_margin is not None:
-        cover_prob, cover_side, cover_confidence, cover_label_str, cover_reasoning = (
+        cover_prob, cover_side, cover_confidence, cover_label_str, cover_edge, reasoning_code = (
             _analyze_spread_coverage(
                 event, home, away, expected_margin, book_spread
             )
@@ -241,7 +302,8 @@ def predict_game(
     if away_injuries:
         away_inj_dict = away_injuries.to_dict() if hasattr(away_injuries, "to_dict") else None
 
-    return GamePrediction(
+    # Every field is computed here, so skip validation
+    return GamePrediction.model_construct(
         event_id=event.id,
         sport_key=event.sport_key,
         home_team=event.home_team,
@@ -259,41 +321,178 @@ def predict_game(
         cover_side=cover_side,
         cover_confidence=round(cover_confidence, 4) if cover_confidence is not None else None,
         cover_label=cover_label_str,
-        cover_reasoning=cover_reasoning,
+        cover_edge=cover_edge,
+        reasoning_code=reasoning_code,
         features=features,
         feature_explanations=feature_explanations,
         home_injuries=home_inj_dict,
         away_injuries=away_inj_dict,
         reasoning=reasoning,
         model_version=MODEL_VERSION,
+        predicted_at=predicted_at or iso_now(),
     )
 
 
+# ── Prediction cache ────────────────────────────────────────────
+#
+# A prediction depends only on the event's identity and spread line, the two
+# team records and the two injury reports.  Every key carries
+# ``_STATS_VERSION``, which ingestion bumps (``bump_stats_version``) whenever
+# it produces new records or reports, so predictions never outlive the data
+# they were built from.  Within a version the inputs are also checked by
+# identity: entries keep references to them, so an id() can't be recycled
+# while its entry is alive.  Anything that edits a record or report in place
+# must bump the version too.
+#
+# Cached predictions are never handed out; each hit is a copy stamped with
+# the caller's ``predicted_at``.  The copy is shallow, so nested containers
+# (features, explanations, injury dicts) are shared and treated as read-only.
+
+_PRED_CACHE_SIZE = 4096
+# key -> ((home, away, home_injuries, away_injuries), prediction)
+_PRED_CACHE: "OrderedDict[tuple, tuple[tuple, GamePrediction]]" = OrderedDict()
+_STATS_VERSION = 0
+
+
+def bump_stats_version() -> None:
+    """Mark all cached predictions stale; called when new stats are ingested."""
+    global _STATS_VERSION
+    _STATS_VERSION += 1
+    _PRED_CACHE.clear()
+
+
+def _prediction_key(
+    event: Event,
+    team_stats: dict[str, TeamRecord],
+    home_injuries: "InjuryReport | None",
+    away_injuries: "InjuryReport | None",
+) -> tuple[tuple, tuple]:
+    """Cache key for a game and the input objects it was derived from."""
+    refs = (
+        team_stats.get(event.home_team), team_stats.get(event.away_team),
+        home_injuries, away_injuries,
+    )
+    key = (
+        _STATS_VERSION,
+        event.id, event.sport_key, event.home_team, event.away_team, event.commence_time,
+        _extract_spread(event, event.home_team), *map(id, refs),
+    )
+    return key, refs
+
+
+def _cache_get(key: tuple, refs: tuple, predicted_at: str) -> GamePrediction | None:
+    entry = _PRED_CACHE.get(key)
+    if entry is None or any(a is not b for a, b in zip(entry[0], refs)):
+        return None
+    _PRED_CACHE.move_to_end(key)
+    return entry[1].model_copy(update={"predicted_at": predicted_at})
+
+
+def _cache_put(key: tuple, refs: tuple, prediction: GamePrediction) -> GamePrediction:
+    """Store ``prediction`` and return a copy for the caller."""
+    _PRED_CACHE[key] = (refs, prediction)
+    _PRED_CACHE.move_to_end(key)
+    if len(_PRED_CACHE) > _PRED_CACHE_SIZE:
+        _PRED_CACHE.popitem(last=False)
+    return prediction.model_copy()
+
+
+def predict_game(
+    event: Event,
+    team_stats: dict[str, TeamRecord],
+    home_injuries: "InjuryReport | None" = None,
+    away_injuries: "InjuryReport | None" = None,
+    predicted_at: str | None = None,
+) -> GamePrediction | None:
+    """
+    Predict the outcome of a single game.
+
+    Returns None if we don't have stats for either team.
+    """
+    predicted_at = predicted_at or iso_now()
+    key, refs = _prediction_key(event, team_stats, home_injuries, away_injuries)
+    cached = _cache_get(key, refs, predicted_at)
+    if cached is not None:
+        return cached
+
+    prepared = _game_features(event, team_stats, home_injuries, away_injuries)
+    if prepared is None:
+        return None
+    home, away, vector = prepared
+
+    # Score: weighted sum of features → sigmoid → probability
+    prediction = _build_prediction(
+        event, home, away, vector, _score_batch([vector]).item(),
+        home_injuries, away_injuries, predicted_at,
+    )
+    return _cache_put(key, refs, prediction)
+
+
 def predict_events(
     events: list[Event],
     team_stats: dict[str, TeamRecord],
     injury_reports: dict | None = None,
+    top_k: int | None = None,
 ) -> list[GamePrediction]:
-    """Predict outcomes for a batch of events."""
-    predictions: list[GamePrediction] = []
-
+    """
+    Predict outcomes for a batch of events, most confident first.
+
+    Features are built per game, then every game is scored at once with a
+    single vectorized weighted sum (see ``_score_batch``).  With ``top_k``,
+    only the ``top_k`` most confident games are selected (same order and
+    ties as a full sort) and only those are turned into predictions.
+    Games whose inputs are unchanged since an earlier call are served from
+    the prediction cache.
+    """
+    # Per predictable event, in event order: a cached prediction, or the
+    # index of its entry in ``prepared``
+    slots: list[GamePrediction | int] = []
+    prepared: list[tuple] = []
+    predicted_at = iso_now()  # one timestamp for the whole batch
     for event in events:
         home_inj = None
         away_inj = None
         if injury_reports:
-            # Try exact match, then fuzzy
-            from app.injuries import _fuzzy_match
-            for name, report in injury_reports.items():
-                if _fuzzy_match(event.home_team, name):
-                    home_inj = report
-                if _fuzzy_match(event.away_team, name):
-                    away_inj = report
+            # Matching report for each team, if any is close enough
+            home_name = _match_team(event.home_team, injury_reports)
+            away_name = _match_team(event.away_team, injury_reports)
+            if home_name is not None:
+                home_inj = injury_reports[home_name]
+            if away_name is not None:
+                away_inj = injury_reports[away_name]
+
+        key, refs = _prediction_key(event, team_stats, home_inj, away_inj)
+        cached = _cache_get(key, refs, predicted_at)
+        if cached is not None:
+            slots.append(cached)
+            continue
+        game = _game_features(event, team_stats, home_inj, away_inj)
+        if game is not None:
+            slots.append(len(prepared))
+            prepared.append((key, refs, event, *game, home_inj, away_inj))
+
+    probs = _score_batch([entry[5] for entry in prepared]).tolist()
 
-        pred = predict_game(event, team_stats, home_inj, away_inj)
-        if pred:
-            predictions.append(pred)
+    def build(i: int) -> GamePrediction:
+        key, refs, event, home, away, vector, home_inj, away_inj = prepared[i]
+        prediction = _build_prediction(
+            event, home, away, vector, probs[i], home_inj, away_inj, predicted_at,
+        )
+        return _cache_put(key, refs, prediction)
 
-    predictions.sort(key=lambda p: p.confidence, reverse=True)
+    if top_k is None:
+        predictions = [s if isinstance(s, GamePrediction) else build(s) for s in slots]
+        predictions.sort(key=lambda p: p.confidence, reverse=True)
+    else:
+        # Rank on the rounded confidence the full sort would compare
+        confidences = [
+            s.confidence if isinstance(s, GamePrediction) else round(_confidence(probs[s]), 4)
+            for s in slots
+        ]
+        keep = heapq.nlargest(top_k, range(len(slots)), key=confidences.__getitem__)
+        predictions = [
+            slots[j] if isinstance(slots[j], GamePrediction) else build(slots[j]) for j in keep
+        ]
 
     logger.info(
         "Generated %d predictions from %d events",
@@ -351,19 +550,19 @@ def _extract_spread(event: Event, home_team: str) -> float | None:
     Looks for 'spreads' market across all bookmakers, averages the
     home team point value. Returns negative for home favorite (e.g. -3.5).
     """
-    spreads: list[float] = []
+    total = 0.0
+    n = 0
 
     for bm in event.bookmakers:
         if bm.market != "spreads":
             continue
         for outcome in bm.outcomes:
-            if outcome.name == home_team and outcome.point is not None:
-                spreads.append(outcome.point)
-
-    if not spreads:
-        return None
+            point = outcome.point
+            if point is not None and outcome.name == home_team:
+                total += point
+                n += 1
 
-    return round(sum(spreads) / len(spreads), 1)
+    return round(total / n, 1) if n else None
 
 
 def _analyze_spread_coverage(
@@ -372,7 +571,7 @@ def _analyze_spread_coverage(
     away: TeamRecord,
     expected_margin: float,
     book_spread: float,
-) -> tuple[float, str, float, str, str]:
+) -> tuple[float, str, float, str, float, int]:
     """
     Determine how likely a team is to cover the spread.
 
@@ -384,7 +583,9 @@ def _analyze_spread_coverage(
     the book spread is -3.5, the home team should cover because we
     expect them to win by more than the spread asks.
 
-    Returns: (cover_prob, cover_side, cover_confidence, cover_label, reasoning)
+    Returns: (cover_prob, cover_side, cover_confidence, cover_label,
+    cover_edge, reasoning_code), where ``reasoning_code`` picks the
+    GamePrediction.cover_reasoning template.
     """
     # How many points better do we think home is vs what the spread asks?
     # book_spread is from home perspective: -3.5 means home must win by 4+
@@ -430,29 +631,8 @@ def _analyze_spread_coverage(
     else:
         cover_label = "fade"
 
-    # Reasoning
-    spread_str = f"{book_spread:+.1f}" if book_spread else "PK"
-    parts = [f"Book spread: {event.home_team} {spread_str}."]
-    parts.append(f"Our model projects {event.home_team} winning by {expected_margin:+.1f}.")
-
-    if abs(edge_over_spread) >= 4:
-        parts.append(
-            f"Strong edge: our margin is {abs(edge_over_spread):.1f} points "
-            f"beyond the spread — {cover_team} should cover comfortably."
-        )
-    elif abs(edge_over_spread) >= 2:
-        parts.append(
-            f"Moderate edge: {cover_team} has about {abs(edge_over_spread):.1f} points "
-            f"of cushion beyond the spread."
-        )
-    elif abs(edge_over_spread) >= 0.5:
-        parts.append(
-            f"Slim edge for {cover_team} — only {abs(edge_over_spread):.1f} points "
-            f"beyond the spread. Could go either way."
-        )
-    else:
-        parts.append("Market is very efficient here — our model agrees with the spread.")
-
-    cover_reasoning = " ".join(parts)
+    # GamePrediction formats the reasoning text from these only when it is read
+    cover_edge = abs(edge_over_spread)
+    reasoning_code = (cover_edge >= 0.5) + (cover_edge >= 2) + (cover_edge >= 4)
 
-    return cover_prob, cover_side, cover_confidence, cover_label, cover_reasoning
+    return cover_prob, cover_side, cover_confidence, cover_label, cover_edge, reasoning_code
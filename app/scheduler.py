@@ -9,6 +9,7 @@ from app.config import settings
 from app.odds_client import OddsClient
 from app.arbitrage import detect_arbitrage
 from app.models import RefreshResult
+from app.predictor import bump_stats_version
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +47,11 @@ async def refresh_odds() -> RefreshResult:
         if usage.get("remaining") is not None:
             result.api_requests_remaining = int(usage["remaining"])
 
-        # Persist raw odds
-        client.persist_events(events)
+        # Persist raw odds in a worker thread so the bulk insert doesn't
+        # block the event loop
+        await asyncio.to_thread(client.persist_events, events)
+        # New lines may come with new matchups; start predictions afresh
+        bump_stats_version()
 
         # Detect arbitrage
         arbs = detect_arbitrage(events)
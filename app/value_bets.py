@@ -8,16 +8,23 @@ books imply, that's a potential value bet.
 Includes Kelly Criterion for optimal stake sizing.
 """
 
+import heapq
 import logging
 import math
+from operator import attrgetter
 
-from app.arbitrage import american_to_implied_prob, american_to_decimal
-from app.models import Event, GamePrediction, ValueBet
+import numpy as np
+
+from app._value_kernels import compute_value_edges
+from app.arbitrage import _DEC_LUT, _LUT_MAX
+from app.models import Event, GamePrediction, ValueBet, iso_now
 
 logger = logging.getLogger(__name__)
 
 MIN_EDGE_PCT = 0.03  # 3% minimum edge to surface a value bet
 
+_edge_key = attrgetter("edge_pct")
+
 
 def kelly_criterion(our_prob: float, decimal_odds: float) -> float:
     """
@@ -40,89 +47,175 @@ def kelly_criterion(our_prob: float, decimal_odds: float) -> float:
     return max(0.0, min(kelly * 0.25, 0.25))
 
 
+def _best_h2h_prices(
+    games: list[tuple[GamePrediction, Event]],
+) -> tuple[np.ndarray, list[str]]:
+    """
+    Best moneyline price, and the bookmaker offering it, for both sides of each game.
+
+    Every h2h line of every game is flattened once into parallel arrays,
+    grouped by ``2 * game + side`` (home side 0, away side 1), and reduced
+    in one pass: a stable sort by (group, -decimal odds) puts each side's
+    best line first, so ties go to the earliest bookmaker.  Returns
+    ``(prices, books)`` indexed by group, prices as int64; a side no book
+    quotes gets price 0 and an empty bookmaker.
+    """
+    groups: list[int] = []
+    prices: list[int] = []
+    books: list[str] = []
+    for g, (pred, event) in enumerate(games):
+        home, away = pred.home_team, pred.away_team
+        for bm in event.h2h_bookmakers:
+            for outcome in bm.outcomes:
+                if outcome.name == home:
+                    groups.append(2 * g)
+                elif outcome.name == away:
+                    groups.append(2 * g + 1)
+                else:
+                    continue
+                prices.append(outcome.price)
+                books.append(bm.bookmaker_title)
+
+    best_prices = np.zeros(2 * len(games), dtype=np.int64)
+    best_books: list[str] = [""] * (2 * len(games))
+    if not prices:
+        return best_prices, best_books
+
+    group_ids = np.asarray(groups, dtype=np.int32)
+    price_arr = np.asarray(prices, dtype=np.int64)
+    if (np.abs(price_arr) >= 100).all():
+        # Valid American prices rank like their decimal odds once negative
+        # prices are shifted up by 200 (so -100 ties +100 at 2.0), which
+        # orders the lines on raw integers with no division.
+        rank = np.where(price_arr < 0, price_arr + 200, price_arr)
+    else:
+        # Decimal odds from the shared lookup table; prices outside it use the formula
+        in_range = np.abs(price_arr) <= _LUT_MAX
+        rank = _DEC_LUT.take(np.where(in_range, price_arr, 0) + _LUT_MAX)
+        if not in_range.all():
+            p = price_arr[~in_range].astype(np.float64)
+            rank[~in_range] = np.where(p > 0, p / 100.0 + 1.0, 100.0 / -p + 1.0)
+    order = np.lexsort((-rank, group_ids))
+    sorted_groups = group_ids[order]
+    first = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    best = order[first]
+    best_prices[sorted_groups[first]] = price_arr[best]
+    for g, i in zip(sorted_groups[first].tolist(), best.tolist()):
+        best_books[g] = books[i]
+    return best_prices, best_books
+
+
+def _predictions_to_soa(predictions: list[GamePrediction]) -> dict[str, np.ndarray]:
+    """Column arrays of the prediction fields the value scan reads, one row per prediction."""
+    n = len(predictions)
+    return {
+        "home_probs": np.fromiter((p.home_win_prob for p in predictions), dtype=np.float64, count=n),
+        "away_probs": np.fromiter((p.away_win_prob for p in predictions), dtype=np.float64, count=n),
+        "confidence": np.fromiter((p.confidence for p in predictions), dtype=np.float64, count=n),
+    }
+
+
 def find_value_bets(
     predictions: list[GamePrediction],
     events: list[Event],
     min_edge: float = MIN_EDGE_PCT,
     min_confidence: float = 0.55,
+    top_k: int | None = None,
 ) -> list[ValueBet]:
     """
     Cross-reference our predictions with bookmaker odds to find value bets.
 
     A value bet exists when:
       our_prob > book_implied_prob + min_edge
+
+    Bets are returned by edge, largest first.  With ``top_k``, only the
+    ``top_k`` largest edges are returned (same order as the full list).
     """
     # Index events by ID for quick lookup
     event_map: dict[str, Event] = {e.id: e for e in events}
 
-    value_bets: list[ValueBet] = []
+    # Confidence filter as one vectorized mask; only the survivors are joined
+    cols = _predictions_to_soa(predictions)
+    games: list[tuple[GamePrediction, Event]] = []
+    rows: list[int] = []
+    for i in np.flatnonzero(~(cols["confidence"] < min_confidence)).tolist():
+        pred = predictions[i]
+        event = event_map.get(pred.event_id)
+        if event and event.h2h_bookmakers:
+            games.append((pred, event))
+            rows.append(i)
 
-    for pred in predictions:
-        if pred.confidence < min_confidence:
-            continue
+    # Our probability for each side, indexed like the best prices
+    side_probs = np.column_stack(
+        (cols["home_probs"][rows], cols["away_probs"][rows])
+    ).ravel()
+    best_prices, best_books = _best_h2h_prices(games)
 
-        event = event_map.get(pred.event_id)
-        if not event or not event.bookmakers:
-            continue
-
-        # Check both sides (home and away)
-        for team, our_prob in [
-            (pred.home_team, pred.home_win_prob),
-            (pred.away_team, pred.away_win_prob),
-        ]:
-            # Find the best price across all bookmakers for this team
-            best_price: int | None = None
-            best_book: str = ""
-
-            for bm in event.bookmakers:
-                if bm.market != "h2h":
-                    continue
-                for outcome in bm.outcomes:
-                    if outcome.name == team:
-                        if best_price is None or american_to_decimal(outcome.price) > american_to_decimal(best_price):
-                            best_price = outcome.price
-                            best_book = bm.bookmaker_title
-
-            if best_price is None:
-                continue
-
-            book_implied = american_to_implied_prob(best_price)
-            edge = our_prob - book_implied
-
-            if edge >= min_edge:
-                decimal_odds = american_to_decimal(best_price)
-                kelly = kelly_criterion(our_prob, decimal_odds)
-
-                vb = ValueBet(
-                    event_id=pred.event_id,
-                    sport_key=pred.sport_key,
-                    event_name=f"{pred.away_team} @ {pred.home_team}",
-                    commence_time=pred.commence_time,
-                    team=team,
-                    our_prob=round(our_prob, 4),
-                    book_implied_prob=round(book_implied, 4),
-                    best_price=best_price,
-                    best_bookmaker=best_book,
-                    edge_pct=round(edge, 4),
-                    confidence=pred.confidence,
-                    confidence_label=pred.confidence_label,
-                    kelly_fraction=round(kelly, 4),
-                )
-                value_bets.append(vb)
-
-                logger.info(
-                    "VALUE BET: %s (%s) — our %.0f%% vs book %.0f%% = %.1f%% edge @ %s (%s)",
-                    team,
-                    pred.sport_key,
-                    our_prob * 100,
-                    book_implied * 100,
-                    edge * 100,
-                    best_book,
-                    best_price,
-                )
+    # Implied prob, edge, Kelly and the edge filter in one fused pass; only
+    # the surviving sides become ValueBet objects.
+    implied, edges, kellys, hits = compute_value_edges(best_prices, side_probs, min_edge)
+
+    value_bets: list[ValueBet] = []
+    predicted_at = iso_now()
+    log_bets = logger.isEnabledFor(logging.INFO)
+
+    last_game = -1
+    for s in np.flatnonzero(hits).tolist():
+        g, side = divmod(s, 2)
+        pred = games[g][0]
+        if g != last_game:
+            # Both sides of a game are adjacent and share the event name
+            last_game = g
+            event_name = pred.away_team + " @ " + pred.home_team
+        team = pred.away_team if side else pred.home_team
+        our_prob = float(side_probs[s])
+        book_implied = float(implied[s])
+        edge = float(edges[s])
+        kelly = float(kellys[s])
+        best_price = int(best_prices[s])
+        best_book = best_books[s]
+
+        # Every field is computed here, so skip validation
+        vb = ValueBet.model_construct(
+            event_id=pred.event_id,
+            sport_key=pred.sport_key,
+            event_name=event_name,
+            commence_time=pred.commence_time,
+            team=team,
+            our_prob=round(our_prob, 4),
+            book_implied_prob=round(book_implied, 4),
+            best_price=best_price,
+            best_bookmaker=best_book,
+            edge_pct=round(edge, 4),
+            confidence=pred.confidence,
+            confidence_label=pred.confidence_label,
+            kelly_fraction=round(kelly, 4),
+            predicted_at=predicted_at,
+        )
+        value_bets.append(vb)
+
+        if log_bets:
+            logger.info(
+                "VALUE BET: %s (%s) — our %.0f%% vs book %.0f%% = %.1f%% edge @ %s (%s)",
+                team,
+                pred.sport_key,
+                our_prob * 100,
+                book_implied * 100,
+                edge * 100,
+                best_book,
+                best_price,
+            )
+
+    if __debug__ and value_bets:
+        # model_construct skipped validation; check one bet against the
+        # model so field drift fails loudly (compiled out under python -O)
+        ValueBet.model_validate(value_bets[0].model_dump())
 
     # Sort by edge descending
-    value_bets.sort(key=lambda v: v.edge_pct, reverse=True)
+    if top_k is None:
+        value_bets.sort(key=_edge_key, reverse=True)
+    else:
+        value_bets = heapq.nlargest(top_k, value_bets, key=_edge_key)
 
     logger.info(
         "Found %d value bets from %d predictions (min edge=%.0f%%, min conf=%.0f%%)",
@@ -1,10 +1,11 @@
 """Tests for app.arbitrage — odds math helpers and arbitrage detection."""
 
-import json
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
+from app._arb_kernels import _best_and_profit_loop, _best_and_profit_numpy
 from app.arbitrage import (
     american_to_decimal,
     american_to_implied_prob,
@@ -50,10 +51,29 @@ class TestAmericanToImpliedProb:
         result = american_to_implied_prob(-10000)
         assert 0.99 < result < 1.0
 
+    def test_outside_lookup_table(self):
+        assert american_to_implied_prob(25000) == pytest.approx(100 / 25100)
+        assert american_to_implied_prob(-25000) == pytest.approx(25000 / 25100)
+
     def test_return_type(self):
         assert isinstance(american_to_implied_prob(150), float)
         assert isinstance(american_to_implied_prob(-110), float)
 
+    @pytest.mark.parametrize("price", [-110.0, 150.0, -110.5, np.int64(-110), np.float64(150)])
+    def test_non_int_prices_use_formula(self, price):
+        p = float(price)
+        expected = 100.0 / (p + 100.0) if p > 0 else -p / (-p + 100.0)
+        assert american_to_implied_prob(price) == pytest.approx(expected)
+
+    def test_zero_is_positive_zero(self):
+        assert str(american_to_implied_prob(0)) == "0.0"
+        assert str(american_to_implied_prob(0.0)) == "0.0"
+
+    def test_table_matches_formula(self):
+        for price in range(-10_000, 10_001, 37):
+            expected = 100.0 / (price + 100.0) if price > 0 else abs(price) / (abs(price) + 100.0)
+            assert american_to_implied_prob(price) == pytest.approx(expected, rel=1e-15)
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # american_to_decimal
@@ -84,9 +104,22 @@ class TestAmericanToDecimal:
         for price in [100, 150, -110, -200, -500, 500]:
             assert american_to_decimal(price) > 1.0
 
+    def test_outside_lookup_table(self):
+        assert american_to_decimal(25000) == pytest.approx(251.0)
+        assert american_to_decimal(-25000) == pytest.approx(1.004)
+
     def test_return_type(self):
         assert isinstance(american_to_decimal(150), float)
 
+    @pytest.mark.parametrize("price,expected", [(-110.0, 1.0 + 100.0 / 110.0), (150.0, 2.5), (np.int64(-200), 1.5)])
+    def test_non_int_prices_use_formula(self, price, expected):
+        assert american_to_decimal(price) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("price", [0, 0.0])
+    def test_zero_is_invalid(self, price):
+        with pytest.raises(ZeroDivisionError):
+            american_to_decimal(price)
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # calculate_arb_profit
@@ -258,12 +291,108 @@ class TestDetectArbitrage:
         row = rows[0]
         assert "sport_key" in row
         assert "legs" in row
-        # legs should be JSON string
-        parsed = json.loads(row["legs"])
-        assert isinstance(parsed, list)
+        # legs are handed over as plain dicts for the arbitrage_legs table
+        assert isinstance(row["legs"], list)
+        assert {"outcome", "bookmaker", "price", "stake_pct"} <= row["legs"][0].keys()
 
     @patch("app.arbitrage.save_arbitrage")
     def test_total_implied_prob_less_than_one_for_arb(self, mock_save, arb_event):
         result = detect_arbitrage([arb_event], min_profit_pct=0.0)
         for opp in result:
             assert opp.total_implied_prob < 1.0
+
+    @patch("app.arbitrage.save_arbitrage")
+    def test_best_price_per_outcome_across_books(self, mock_save):
+        event = Event(
+            id="evt_best",
+            sport_key="basketball_nba",
+            sport_title="NBA",
+            home_team="Team A",
+            away_team="Team B",
+            commence_time="2026-02-16T20:00:00Z",
+            bookmakers=[
+                BookmakerOdds(
+                    bookmaker_key="b1", bookmaker_title="Book 1", market="h2h",
+                    outcomes=[OddsOutcome(name="Team A", price=140), OddsOutcome(name="Team B", price=110)],
+                ),
+                BookmakerOdds(
+                    bookmaker_key="b2", bookmaker_title="Book 2", market="h2h",
+                    outcomes=[OddsOutcome(name="Team A", price=160), OddsOutcome(name="Team B", price=-120)],
+                ),
+                BookmakerOdds(
+                    bookmaker_key="b3", bookmaker_title="Book 3", market="spreads",
+                    outcomes=[OddsOutcome(name="Team A", price=-110)],
+                ),
+            ],
+        )
+        result = detect_arbitrage([event], min_profit_pct=0.0)
+        assert len(result) == 1
+        legs = {leg.outcome: (leg.bookmaker, leg.price) for leg in result[0].legs}
+        assert legs == {"Team A": ("Book 2", 160), "Team B": ("Book 1", 110)}
+        assert [leg.outcome for leg in result[0].legs] == ["Team A", "Team B"]
+
+
+    @patch("app.arbitrage.save_arbitrage")
+    def test_unchanged_markets_reuse_previous_scan(self, mock_save, sample_event, arb_event):
+        import app.arbitrage as arbitrage
+
+        first = detect_arbitrage([sample_event, arb_event], min_profit_pct=0.0)
+        with patch("app.arbitrage.best_and_profit", wraps=arbitrage.best_and_profit) as kernel:
+            again = detect_arbitrage([sample_event, arb_event], min_profit_pct=0.0)
+            kernel.assert_not_called()
+        assert [(o.event_id, o.market, o.profit_pct, o.legs) for o in again] == \
+               [(o.event_id, o.market, o.profit_pct, o.legs) for o in first]
+        assert mock_save.call_count == 2
+
+        # A price move in the arb market re-scans only that market
+        changed = arb_event.model_copy(deep=True)
+        outcome = changed.bookmakers[0].outcomes[0]
+        changed.bookmakers[0].outcomes[0] = outcome.model_copy(update={"price": outcome.price + 50})
+        with patch("app.arbitrage.best_and_profit", wraps=arbitrage.best_and_profit) as kernel:
+            result = detect_arbitrage([sample_event, changed], min_profit_pct=0.0)
+            kernel.assert_called_once()
+            assert kernel.call_args[0][0].size == sum(len(bm.outcomes) for bm in changed.bookmakers)
+        arb = [o for o in result if o.event_id == "evt_arb"][0]
+        assert arb.profit_pct > first[-1].profit_pct
+
+# ═══════════════════════════════════════════════════════════════════════
+# best_and_profit kernel
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestBestAndProfitKernel:
+    """The scalar (Numba) loop and the NumPy fallback must agree."""
+
+    @pytest.fixture
+    def csr(self):
+        # market 0: outcome A [150, 160], outcome B [-200, 120]
+        # market 1: outcome C [-110], outcome D [-110, -105], outcome E [100, -100]
+        prices = np.array([150, 160, -200, 120, -110, -110, -105, 100, -100], dtype=np.int32)
+        group_starts = np.array([0, 2, 4, 5, 7, 9], dtype=np.int32)
+        market_starts = np.array([0, 2, 5], dtype=np.int32)
+        return prices, group_starts, market_starts
+
+    def test_loop_matches_numpy(self, csr):
+        loop = _best_and_profit_loop(*csr)
+        vec = _best_and_profit_numpy(*csr)
+        np.testing.assert_array_equal(loop[0], vec[0])
+        np.testing.assert_allclose(loop[1], vec[1], rtol=0, atol=0)
+        np.testing.assert_allclose(loop[2], vec[2], rtol=0, atol=0)
+
+    def test_best_index_and_ties(self, csr):
+        best, totals, profits = _best_and_profit_numpy(*csr)
+        # 160 beats 150, 120 beats -200, -105 beats -110, +100/-100 tie keeps first
+        assert best.tolist() == [1, 3, 4, 6, 7]
+        assert totals[0] == pytest.approx(100 / 260 + 100 / 220)
+        assert profits[0] > 0
+        assert profits[1] < 0
+
+    def test_loop_prunes_markets_past_max_total(self, csr):
+        best, totals, profits = _best_and_profit_loop(*csr, 1.0)
+        full_best, _, full_profits = _best_and_profit_numpy(*csr)
+        # market 0 is an arb and is reduced in full
+        assert best[:2].tolist() == full_best[:2].tolist()
+        assert profits[0] == full_profits[0]
+        # market 1 crosses 1.0 after two outcomes; the third is skipped
+        assert best[2:].tolist() == [4, 6, -1]
+        assert totals[1] > 1.0
+        assert profits[1] < 0
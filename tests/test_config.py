@@ -35,15 +35,27 @@ class TestSettings:
         from app.config import Settings
         with patch.dict(os.environ, {"ODDS_API_KEY": ""}, clear=False):
             s = Settings()
-            s.ODDS_API_KEY = ""
             assert s.has_api_key is False
 
     def test_has_api_key_true_when_set(self):
         from app.config import Settings
-        s = Settings()
-        s.ODDS_API_KEY = "test-key-123"
+        s = Settings(ODDS_API_KEY="test-key-123")
         assert s.has_api_key is True
 
+    def test_reads_environment_at_construction(self):
+        from app.config import Settings
+        with patch.dict(os.environ, {"ODDS_API_KEY": "env-key", "PORT": "9001"}, clear=False):
+            s = Settings()
+        assert s.ODDS_API_KEY == "env-key"
+        assert s.PORT == 9001
+
+    def test_frozen(self):
+        from dataclasses import FrozenInstanceError
+        from app.config import Settings
+        s = Settings()
+        with pytest.raises(FrozenInstanceError):
+            s.ODDS_API_KEY = "changed"
+
     def test_db_path_is_string(self):
         from app.config import Settings
         s = Settings()
@@ -1,23 +1,38 @@
 """Tests for app.database — SQLite persistence layer."""
 
+import json
 import sqlite3
 import tempfile
+import threading
 import os
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.database import (
+    ODDS_COLUMNS,
+    add_bet,
+    auto_settle_bulk,
+    auto_settle_with_score,
+    close_all,
+    compute_settlement,
     get_api_usage,
     get_arbitrage_history,
+    get_bet_summary,
     get_connection,
     get_db,
     get_latest_odds,
     get_live_arbitrage,
+    get_pending_bets,
     init_db,
+    pick_side,
     save_api_usage,
     save_arbitrage,
     save_odds,
+    save_odds_bulk,
+    save_odds_rows,
+    settle_all_pending,
+    settle_bet,
 )
 
 
@@ -29,6 +44,7 @@ def tmp_db(tmp_path):
         mock_settings.DB_PATH = db_path
         init_db()
         yield db_path, mock_settings
+    close_all()
 
 
 class TestInitDb:
@@ -50,6 +66,19 @@ class TestInitDb:
         with patch("app.database.settings", mock_settings):
             init_db()
 
+    def test_runs_once_per_database(self, tmp_db):
+        import app.database as database
+
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            with patch("app.database.get_db", wraps=database.get_db) as mock_get_db:
+                init_db()
+                mock_get_db.assert_not_called()
+                # close_all() resets it, so the schema is checked again
+                close_all()
+                init_db()
+                mock_get_db.assert_called_once()
+
 
 class TestGetConnection:
     """Tests for get_connection."""
@@ -91,6 +120,83 @@ class TestGetDb:
             check.close()
             assert row is not None
 
+    def test_reuses_connection_per_thread(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            with get_db() as first:
+                pass
+            with get_db() as second:
+                pass
+            assert first is second
+
+    def test_rolls_back_on_error(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            with pytest.raises(RuntimeError):
+                with get_db() as conn:
+                    conn.execute(
+                        "INSERT INTO api_usage (requests_used, requests_remaining) VALUES (1, 499)"
+                    )
+                    raise RuntimeError("boom")
+            with get_db() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0] == 0
+
+    def test_close_all(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            with get_db() as conn:
+                pass
+            close_all()
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+            with get_db() as fresh:
+                assert fresh is not conn
+
+    def test_thread_connection_closed_on_exit(self, tmp_db):
+        _, mock_settings = tmp_db
+        opened = []
+
+        def worker():
+            with get_db() as conn:
+                conn.execute("SELECT 1")
+            opened.append(conn)
+
+        with patch("app.database.settings", mock_settings):
+            with get_db() as main:
+                pass
+            for _ in range(3):
+                thread = threading.Thread(target=worker)
+                thread.start()
+                thread.join()
+            # Each short-lived thread's connection was closed when it exited,
+            # so a later thread (even one reusing its ident) opened its own
+            assert len({id(conn) for conn in opened}) == 3
+            for conn in opened:
+                with pytest.raises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1")
+            main.execute("SELECT 1")
+
+    def test_close_all_reaches_other_threads(self, tmp_db):
+        _, mock_settings = tmp_db
+        ready, done = threading.Event(), threading.Event()
+        opened = []
+
+        def worker():
+            with get_db() as conn:
+                opened.append(conn)
+            ready.set()
+            done.wait()
+
+        with patch("app.database.settings", mock_settings):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            ready.wait()
+            close_all()
+            done.set()
+            thread.join()
+            with pytest.raises(sqlite3.ProgrammingError):
+                opened[0].execute("SELECT 1")
+
 
 class TestSaveOdds:
     """Tests for save_odds."""
@@ -151,6 +257,73 @@ class TestSaveOdds:
             conn.close()
             assert count == 5
 
+    def test_save_odds_rows_takes_column_ordered_tuples(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        row = ("nfl", "e1", "A @ B", "B", "A", "2026-01-01T00:00:00Z",
+               "FanDuel", "spreads", "B", -110, -3.5, "2026-01-01T12:00:00Z")
+        with patch("app.database.settings", mock_settings):
+            save_odds_rows([row])
+            conn = sqlite3.connect(db_path)
+            stored = conn.execute(
+                f"SELECT {', '.join(ODDS_COLUMNS)} FROM odds_snapshots"
+            ).fetchall()
+            conn.close()
+            assert stored == [row]
+
+    def test_rows_spanning_several_chunks(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        rows = [
+            {
+                "sport_key": "nfl",
+                "event_id": f"e{i}",
+                "event_name": f"A{i} @ B{i}",
+                "home_team": f"B{i}",
+                "away_team": f"A{i}",
+                "commence_time": "2026-01-01T00:00:00Z",
+                "bookmaker": "FanDuel",
+                "market": "h2h",
+                "outcome_name": f"B{i}",
+                "price": i,
+                "point": 1.5 if i % 2 else None,
+                "fetched_at": "2026-01-01T12:00:00Z",
+            }
+            for i in range(250)
+        ]
+        with patch("app.database.settings", mock_settings):
+            save_odds(rows)
+            conn = sqlite3.connect(db_path)
+            count, total = conn.execute("SELECT COUNT(*), SUM(price) FROM odds_snapshots").fetchone()
+            point = conn.execute("SELECT point FROM odds_snapshots WHERE event_id = 'e249'").fetchone()[0]
+            conn.close()
+            assert count == 250
+            assert total == sum(range(250))
+            assert point == 1.5
+
+    def test_bulk_rebuilds_indexes(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        row = {
+            "sport_key": "nfl", "event_id": "e1", "event_name": "A @ B",
+            "home_team": "B", "away_team": "A",
+            "commence_time": "2026-01-01T00:00:00Z", "bookmaker": "FanDuel",
+            "market": "h2h", "outcome_name": "B", "price": -110, "point": None,
+            "fetched_at": "2026-01-01T12:00:00Z",
+        }
+        rows = [{**row, "event_id": f"e{i}"} for i in range(300)]
+        with patch("app.database.settings", mock_settings):
+            save_odds_bulk(rows)
+            # Same unique key: replaced, not duplicated
+            save_odds_bulk([{**row, "price": 120}])
+            conn = sqlite3.connect(db_path)
+            count = conn.execute("SELECT COUNT(*) FROM odds_snapshots").fetchone()[0]
+            price = conn.execute("SELECT price FROM odds_snapshots WHERE event_id = 'e1'").fetchone()[0]
+            indexes = {r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'odds_snapshots'"
+            )}
+            conn.close()
+            assert count == 300
+            assert price == 120
+            assert {"idx_odds_event", "idx_odds_sport_fetched", "idx_odds_fetched_order"} <= indexes
+
 
 class TestSaveArbitrage:
     """Tests for save_arbitrage."""
@@ -192,6 +365,74 @@ class TestSaveArbitrage:
             assert live == 1
             assert stale == 1
 
+    def test_legs_stored_as_rows(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        legs = [
+            {"outcome": "A", "bookmaker": "B1", "price": 150, "implied_prob": 0.4, "stake_pct": 48.0},
+            {"outcome": "B", "bookmaker": "B2", "price": 110, "implied_prob": 0.476, "stake_pct": 52.0},
+        ]
+        opp = {
+            "sport_key": "nfl", "event_id": "e1", "event_name": "A @ B",
+            "home_team": "B", "away_team": "A",
+            "commence_time": "2026-01-01T00:00:00Z", "market": "h2h",
+            "profit_pct": 2.5, "legs": legs, "total_implied_prob": 0.876,
+            "detected_at": "2026-01-01T12:00:00Z",
+        }
+        with patch("app.database.settings", mock_settings):
+            save_arbitrage([opp])
+            save_arbitrage([{**opp, "event_id": "e2", "legs": json.dumps(legs[:1])}])
+            conn = sqlite3.connect(db_path)
+            count = conn.execute("SELECT COUNT(*) FROM arbitrage_legs").fetchone()[0]
+            conn.close()
+            assert count == 3
+            assert get_live_arbitrage()[0]["legs"] == legs[:1]
+            history = get_arbitrage_history()
+            assert [a["event_id"] for a in history] == ["e1", "e2"]
+            assert history[0]["legs"] == legs
+
+    def test_batch_legs_follow_their_opportunity(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        opps = [
+            {
+                "sport_key": "nfl", "event_id": f"e{i}", "event_name": "A @ B",
+                "home_team": "B", "away_team": "A",
+                "commence_time": "2026-01-01T00:00:00Z", "market": "h2h",
+                "profit_pct": float(i), "total_implied_prob": 0.9,
+                "detected_at": "2026-01-01T12:00:00Z",
+                "legs": [{"outcome": f"O{i}-{j}", "bookmaker": "B", "price": 100 + j}
+                         for j in range(i + 1)],
+            }
+            for i in range(4)
+        ]
+        with patch("app.database.settings", mock_settings):
+            save_arbitrage(opps[:1])
+            # A deleted newest row leaves a gap that AUTOINCREMENT never reuses
+            with get_db() as conn:
+                conn.execute("DELETE FROM arbitrage_opportunities")
+            save_arbitrage(opps)
+            live = get_live_arbitrage()
+        assert {a["event_id"]: [leg["outcome"] for leg in a["legs"]] for a in live} == {
+            f"e{i}": [f"O{i}-{j}" for j in range(i + 1)] for i in range(4)
+        }
+        conn = sqlite3.connect(db_path)
+        blobs = {row[0] for row in conn.execute("SELECT legs FROM arbitrage_opportunities")}
+        conn.close()
+        assert blobs == {"[]"}
+
+    def test_legacy_rows_keep_json_legs(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            INSERT INTO arbitrage_opportunities
+            (sport_key, event_id, event_name, home_team, away_team, commence_time,
+             market, profit_pct, legs, total_implied_prob)
+            VALUES ('nfl', 'e1', 'A @ B', 'B', 'A', '', 'h2h', 1.0, '[{"outcome": "A"}]', 0.99)
+        """)
+        conn.commit()
+        conn.close()
+        with patch("app.database.settings", mock_settings):
+            assert get_live_arbitrage()[0]["legs"] == '[{"outcome": "A"}]'
+
 
 class TestGetLiveArbitrage:
     """Tests for get_live_arbitrage."""
@@ -349,6 +590,351 @@ class TestGetApiUsage:
             save_api_usage(10, 490)
             result = get_api_usage()
             assert result is not None
-            # The latest insert is the one returned (by recorded_at DESC, id DESC)
-            assert isinstance(result["requests_used"], int)
-            assert isinstance(result["requests_remaining"], int)
+            assert result["requests_used"] == 10
+            assert result["requests_remaining"] == 490
+
+    def test_keeps_single_row(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            for used in range(5):
+                save_api_usage(used, 500 - used)
+            conn = sqlite3.connect(db_path)
+            count = conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0]
+            conn.close()
+            assert count == 1
+
+    def test_old_log_collapsed_on_init(self, tmp_db):
+        db_path, mock_settings = tmp_db
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE api_usage")
+        conn.execute("""
+            CREATE TABLE api_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                requests_used INTEGER,
+                requests_remaining INTEGER,
+                recorded_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO api_usage (requests_used, requests_remaining, recorded_at) VALUES (?, ?, ?)",
+            [(1, 499, "2026-01-01 00:00:00"), (3, 497, "2026-01-03 00:00:00"),
+             (2, 498, "2026-01-02 00:00:00")],
+        )
+        conn.commit()
+        conn.close()
+        close_all()
+        with patch("app.database.settings", mock_settings):
+            init_db()
+            assert get_api_usage()["requests_used"] == 3
+            save_api_usage(4, 496)
+            assert get_api_usage()["requests_used"] == 4
+
+    def test_interrupted_collapse_rolls_back(self, tmp_db):
+        import app.database as database
+
+        db_path, mock_settings = tmp_db
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE api_usage")
+        conn.execute("""
+            CREATE TABLE api_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                requests_used INTEGER,
+                requests_remaining INTEGER,
+                recorded_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO api_usage (requests_used, requests_remaining, recorded_at) VALUES (?, ?, ?)",
+            [(1, 499, "2026-01-01 00:00:00"), (3, 497, "2026-01-03 00:00:00")],
+        )
+        conn.commit()
+        conn.close()
+        close_all()
+
+        class CrashBeforeIdRewrite:
+            """Connection proxy that fails between the DELETE and the UPDATE."""
+
+            def __init__(self, conn):
+                self._conn = conn
+
+            def execute(self, sql, *args):
+                if sql.startswith("UPDATE api_usage"):
+                    raise RuntimeError("crash")
+                return self._conn.execute(sql, *args)
+
+            def __getattr__(self, name):
+                return getattr(self._conn, name)
+
+        with patch("app.database.settings", mock_settings):
+            real = database._pooled_connection()
+            with patch("app.database._pooled_connection", return_value=CrashBeforeIdRewrite(real)):
+                with pytest.raises(RuntimeError):
+                    init_db()
+            # The DELETE was rolled back with it, so the next start redoes both
+            rows = real.execute("SELECT id, requests_used FROM api_usage ORDER BY id").fetchall()
+            assert [tuple(r) for r in rows] == [(1, 1), (2, 3)]
+            init_db()
+            assert get_api_usage()["requests_used"] == 3
+
+
+def _bet(**overrides) -> dict:
+    bet = {
+        "sport": "NBA", "event_name": "Boston Celtics @ Detroit Pistons",
+        "home_team": "Detroit Pistons", "away_team": "Boston Celtics",
+        "bet_type": "moneyline", "pick": "Detroit Pistons",
+        "spread_line": None, "total_line": None, "odds": 150,
+        "stake": 10.0, "potential_win": 15.0, "our_confidence": None, "notes": None,
+    }
+    bet.update(overrides)
+    return bet
+
+
+class TestComputeSettlement:
+    """Tests for compute_settlement."""
+
+    def test_moneyline(self):
+        assert compute_settlement(_bet(), 100, 90) == ("win", 15.0)
+        assert compute_settlement(_bet(), 90, 100) == ("loss", -10.0)
+        assert compute_settlement(_bet(), 95, 95) == ("push", 0.0)
+
+    def test_spread(self):
+        bet = _bet(bet_type="spread", pick="Boston Celtics +3.5", spread_line=-3.5)
+        assert compute_settlement(bet, 100, 98) == ("win", 15.0)
+
+    def test_total(self):
+        bet = _bet(bet_type="total", pick="Over 200.5", total_line=200.5)
+        assert compute_settlement(bet, 100, 101)[0] == "win"
+        assert compute_settlement(bet, 100, 100)[0] == "loss"
+
+    def test_uses_stored_pick_side(self):
+        # Stored side wins over re-parsing the free-text pick
+        bet = _bet(pick="Pistons ML", pick_side="away")
+        assert compute_settlement(bet, 100, 90) == ("loss", -10.0)
+
+
+class TestPickSide:
+    """Tests for pick_side."""
+
+    def test_resolves_sides(self):
+        assert pick_side(_bet()) == "home"
+        assert pick_side(_bet(pick="Celtics")) == "away"
+        assert pick_side(_bet(bet_type="total", pick="Under 200.5")) == "under"
+        assert pick_side(_bet(pick="Lakers")) is None
+
+    def test_stored_on_add_bet(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            add_bet(_bet(bet_type="spread", pick="Boston Celtics +3.5", spread_line=-3.5))
+            assert get_pending_bets()[0]["pick_side"] == "away"
+
+    def test_backfilled_on_init(self, tmp_db):
+        _, mock_settings = tmp_db
+        conn = sqlite3.connect(mock_settings.DB_PATH)
+        conn.execute("ALTER TABLE bet_tracker DROP COLUMN pick_side")
+        conn.execute("""
+            INSERT INTO bet_tracker (sport, event_name, home_team, away_team,
+                                     bet_type, pick, odds, stake, potential_win)
+            VALUES ('NBA', 'B @ D', 'Detroit Pistons', 'Boston Celtics',
+                    'moneyline', 'Celtics', 150, 10, 15)
+        """)
+        conn.commit()
+        conn.close()
+        close_all()
+        with patch("app.database.settings", mock_settings):
+            init_db()
+            assert get_pending_bets()[0]["pick_side"] == "away"
+
+
+def _old_schema_bets(db_path: str, picks: list[str]):
+    """Turn bet_tracker back into its pre-pick_side shape, holding these moneyline picks."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("ALTER TABLE bet_tracker DROP COLUMN pick_side")
+    conn.executemany("""
+        INSERT INTO bet_tracker (sport, event_name, home_team, away_team,
+                                 bet_type, pick, odds, stake, potential_win)
+        VALUES ('NBA', 'B @ D', 'Detroit Pistons', 'Boston Celtics',
+                'moneyline', ?, 150, 10, 15)
+    """, [(pick,) for pick in picks])
+    conn.commit()
+    conn.close()
+    close_all()
+
+
+class TestMigrations:
+    """Upgrading databases created by older versions."""
+
+    def test_backfilled_bet_settles_on_its_side(self, tmp_db):
+        _, mock_settings = tmp_db
+        _old_schema_bets(mock_settings.DB_PATH, ["Celtics"])
+        with patch("app.database.settings", mock_settings):
+            init_db()
+            bet_id = get_pending_bets()[0]["id"]
+            # Away pick, away team won: a win, not the SQL fallback 'loss'
+            settled = auto_settle_with_score(bet_id, 90, 100)
+            assert (settled["result"], settled["actual_pnl"]) == ("win", 15.0)
+
+    def test_failed_backfill_rolls_back_and_reruns(self, tmp_db):
+        import app.database as database
+
+        _, mock_settings = tmp_db
+        _old_schema_bets(mock_settings.DB_PATH, ["Celtics", "Pistons"])
+        calls = []
+
+        def flaky_pick_side(bet):
+            calls.append(bet["id"])
+            if len(calls) == 2:
+                raise RuntimeError("interrupted")
+            return database.pick_side(bet)
+
+        with patch("app.database.settings", mock_settings):
+            with patch("app.database.pick_side", side_effect=flaky_pick_side):
+                with pytest.raises(RuntimeError):
+                    init_db()
+            conn = sqlite3.connect(mock_settings.DB_PATH)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(bet_tracker)")}
+            conn.close()
+            assert "pick_side" not in columns  # the ALTER was rolled back too
+            init_db()
+            assert [b["pick_side"] for b in get_pending_bets()] == ["away", "home"]
+
+    def test_backfill_completes_partially_migrated_rows(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            bet_id = add_bet(_bet(pick="Celtics"))
+        conn = sqlite3.connect(mock_settings.DB_PATH)
+        conn.execute("UPDATE bet_tracker SET pick_side = NULL")
+        conn.commit()
+        conn.close()
+        close_all()
+        with patch("app.database.settings", mock_settings):
+            init_db()
+            assert auto_settle_with_score(bet_id, 90, 100)["result"] == "win"
+
+
+class TestAutoSettle:
+    """Tests for auto_settle_with_score / auto_settle_bulk."""
+
+    def test_with_score(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            bet_id = add_bet(_bet())
+            settled = auto_settle_with_score(bet_id, 100, 90)
+            assert settled["result"] == "win"
+            assert settled["actual_pnl"] == 15.0
+            assert get_pending_bets() == []
+            # Already settled: returned unchanged
+            assert auto_settle_with_score(bet_id, 90, 100)["result"] == "win"
+            assert auto_settle_with_score(9999, 1, 0) is None
+
+    def test_with_score_matches_compute_settlement(self, tmp_db):
+        _, mock_settings = tmp_db
+        bets = [
+            _bet(pick="Celtics"),
+            _bet(bet_type="spread", pick="Boston Celtics +3.5", spread_line=-3.5),
+            _bet(bet_type="spread", pick="Detroit Pistons -3", spread_line=-3.0),
+            _bet(bet_type="total", pick="Over 200", total_line=200.0),
+            _bet(bet_type="total", pick="Under 200", total_line=200.0),
+            _bet(pick="Lakers"),
+        ]
+        scores = [(100, 90), (97, 100), (103, 100), (100, 100)]
+        with patch("app.database.settings", mock_settings):
+            for bet in bets:
+                for home, away in scores:
+                    settled = auto_settle_with_score(add_bet(bet), home, away)
+                    expected = compute_settlement(bet, home, away)
+                    assert (settled["result"], settled["actual_pnl"]) == expected
+
+    def test_settle_bet(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            bet_id = add_bet(_bet())
+            assert settle_bet(bet_id, "win")["actual_pnl"] == 15.0
+            assert settle_bet(bet_id, "loss")["actual_pnl"] == -10.0
+            pushed = settle_bet(bet_id, "push")
+            assert pushed["result"] == "push"
+            assert pushed["actual_pnl"] == 0.0
+            assert pushed["settled_at"] is not None
+            assert settle_bet(9999, "win") is None
+
+    def test_bulk_updates_pending_only(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            first = add_bet(_bet())
+            second = add_bet(_bet(pick="Boston Celtics"))
+            auto_settle_with_score(first, 100, 90)
+            updated = auto_settle_bulk([
+                (first, "loss", -10.0, 80, 90),
+                (second, "loss", -10.0, 100, 90),
+            ])
+            assert updated == [second]
+            conn = sqlite3.connect(mock_settings.DB_PATH)
+            rows = conn.execute("SELECT id, result, home_score FROM bet_tracker ORDER BY id").fetchall()
+            conn.close()
+            assert rows == [(first, "win", 100), (second, "loss", 100)]
+
+    def test_settle_all_pending(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            first = add_bet(_bet())
+            second = add_bet(_bet(event_name="Other @ Game", pick="Other"))
+            settled = settle_all_pending({"Boston Celtics @ Detroit Pistons": (100, 90)})
+            assert settled == [{"id": first, "result": "win", "actual_pnl": 15.0,
+                                "home_score": 100, "away_score": 90}]
+            assert [b["id"] for b in get_pending_bets()] == [second]
+
+    def test_bulk_empty_no_op(self, tmp_db):
+        assert auto_settle_bulk([]) == []
+
+    @pytest.mark.asyncio
+    async def test_auto_settle_bets_reports_only_written_bets(self, tmp_db):
+        from app import auto_settle
+
+        _, mock_settings = tmp_db
+        game = {
+            "completed": True, "home_team": "Detroit Pistons", "away_team": "Boston Celtics",
+            "home_score": "100", "away_score": "90",
+        }
+        with patch("app.database.settings", mock_settings), \
+                patch.object(auto_settle, "ESPNClient") as espn:
+            espn.return_value.get_scoreboard = AsyncMock(return_value=[game])
+            espn.return_value.close = AsyncMock()
+            first = add_bet(_bet())
+            second = add_bet(_bet(pick="Boston Celtics"))
+            stale = get_pending_bets()
+            # Settled by someone else after the pending list was read
+            auto_settle_with_score(first, 100, 90)
+            with patch.object(auto_settle, "get_pending_bets", return_value=stale):
+                summary = await auto_settle.auto_settle_bets()
+        assert (summary["settled"], summary["pending"]) == (1, 1)
+        assert [r["bet_id"] for r in summary["results"]] == [second]
+
+
+class TestGetBetSummary:
+    """Tests for get_bet_summary."""
+
+    def test_empty(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            summary = get_bet_summary()
+            assert summary["total_bets"] == 0
+            assert summary["settled"] == 0
+            assert summary["total_pnl"] == 0
+            assert summary["roi"] == 0.0
+
+    def test_aggregates(self, tmp_db):
+        _, mock_settings = tmp_db
+        with patch("app.database.settings", mock_settings):
+            won = add_bet(_bet())
+            lost = add_bet(_bet())
+            add_bet(_bet())
+            auto_settle_with_score(won, 100, 90)
+            auto_settle_with_score(lost, 90, 100)
+            summary = get_bet_summary()
+            assert summary["total_bets"] == 3
+            assert summary["settled"] == 2
+            assert summary["pending"] == 1
+            assert (summary["wins"], summary["losses"], summary["pushes"]) == (1, 1, 0)
+            assert summary["win_rate"] == 50.0
+            assert summary["total_staked"] == 20.0
+            assert summary["total_pnl"] == 5.0
+            assert summary["roi"] == 25.0
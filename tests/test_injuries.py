@@ -0,0 +1,351 @@
+"""Tests for app.injuries — injury reports and team-name matching."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+from rapidfuzz import fuzz, utils
+
+from app import injuries
+from app.injuries import (
+    FUZZY_MATCH_CUTOFF,
+    ESPNInjuryClient,
+    InjuryReport,
+    InjuryReports,
+    _best_match,
+    _classify_status,
+    _fuzzy_match,
+    _match_team,
+)
+
+NBA = [
+    "Los Angeles Lakers", "LA Clippers", "New York Knicks", "Brooklyn Nets",
+    "Detroit Pistons", "Golden State Warriors",
+]
+MLB = ["Boston Red Sox", "Chicago White Sox", "New York Yankees", "New York Mets"]
+
+
+def _player(name: str, status: str = "Out") -> dict:
+    return {"name": name, "position": "G", "status": status, "injury": "Knee", "detail": ""}
+
+
+def _espn_injuries(teams: dict[str, list[tuple[str, str]]]) -> dict:
+    """ESPN injuries payload; ``teams`` maps team -> [(player, status)]."""
+    return {"injuries": [
+        {
+            "team": {"displayName": team},
+            "injuries": [
+                {
+                    "athlete": {"displayName": name, "position": {"abbreviation": "G"}},
+                    "status": status,
+                    "details": {"type": "Knee", "detail": "Sprain"},
+                }
+                for name, status in players
+            ],
+        }
+        for team, players in teams.items()
+    ]}
+
+
+def _mock_http(payload: dict) -> MagicMock:
+    resp = MagicMock()
+    resp.content = orjson.dumps(payload)
+    http = MagicMock()
+    http.get = AsyncMock(return_value=resp)
+    return http
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    injuries._INJURY_CACHE.clear()
+    injuries._ROSTER_CACHE.clear()
+    yield
+    injuries._INJURY_CACHE.clear()
+    injuries._ROSTER_CACHE.clear()
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# InjuryReport
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestInjuryReport:
+    """Derived fields are right however the report was built."""
+
+    def test_empty_report(self):
+        report = InjuryReport("Detroit Pistons")
+        assert (report.total_out, report.total_questionable, report.impact_score) == (0, 0, 0.0)
+        assert report.summary() == "No significant injuries"
+
+    def test_built_from_lists(self):
+        report = InjuryReport(
+            "Detroit Pistons",
+            out=[_player("A"), _player("B")],
+            doubtful=[_player("C", "Doubtful")],
+            questionable=[_player("D", "Questionable")],
+            probable=[_player("E", "Probable")],
+            day_to_day=[_player("F", "Day-To-Day")],
+        )
+        assert report.total_out == 3
+        assert report.total_questionable == 2
+        # (2 * 1.0 + 0.8 + 0.4 + 0.3 + 0.1) / 5
+        assert report.impact_score == pytest.approx(0.72)
+        assert report.summary() == "OUT: A, B; DOUBTFUL: C; 1 questionable"
+
+    def test_filled_after_construction(self):
+        # The fallback path in get_game_injuries builds an empty report and
+        # callers may fill it before anything reads the derived fields
+        report = InjuryReport("Detroit Pistons")
+        report.out.extend(_player(n) for n in "ABCDE")
+        assert report.total_out == 5
+        assert report.impact_score == 1.0
+        assert report.summary() == "OUT: A, B, C +2 more"
+
+    def test_impact_is_capped(self):
+        report = InjuryReport("Detroit Pistons", out=[_player(str(i)) for i in range(8)])
+        assert report.impact_score == 1.0
+
+    def test_to_dict_is_built_once(self):
+        report = InjuryReport("Detroit Pistons", out=[_player("A")])
+        d = report.to_dict()
+        assert d is report.to_dict()
+        assert d["total_out"] == 1
+        assert d["impact_score"] == 0.2
+        assert d["summary"] == "OUT: A"
+        assert d["out"] is report.out
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Status classification and parsing
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestClassifyStatus:
+    """Tests for _classify_status."""
+
+    @pytest.mark.parametrize("raw,bucket", [
+        ("Out", "out"), ("Injured Reserve", "out"), ("IR", "out"), ("Suspension", "out"),
+        ("Doubtful", "doubtful"), ("Questionable", "questionable"), ("Probable", "probable"),
+        ("Available", "probable"), ("Day-To-Day", "day_to_day"), ("day to day", "day_to_day"),
+        ("Game-Time Decision", "questionable"), ("", "questionable"),
+    ])
+    def test_buckets(self, raw, bucket):
+        assert _classify_status(raw) == (raw, bucket)
+
+    def test_status_is_interned(self):
+        raw = "".join(["Day-", "To-", "Day"])
+        status, _ = _classify_status(raw)
+        again, _ = _classify_status("".join(["Day-", "To-", "Day"]))
+        assert again is status
+
+
+class TestParseInjuries:
+    """Tests for ESPNInjuryClient._parse_injuries."""
+
+    def test_players_bucketed_per_team(self):
+        reports = ESPNInjuryClient._parse_injuries(_espn_injuries({
+            "Detroit Pistons": [("A", "Out"), ("B", "Doubtful"), ("C", "Day-To-Day"), ("D", "Weird")],
+            "Boston Celtics": [],
+        }))
+        assert isinstance(reports, InjuryReports)
+        pistons = reports["Detroit Pistons"]
+        assert [p["name"] for p in pistons.out] == ["A"]
+        assert [p["name"] for p in pistons.doubtful] == ["B"]
+        assert [p["name"] for p in pistons.day_to_day] == ["C"]
+        assert [p["name"] for p in pistons.questionable] == ["D"]
+        assert pistons.out[0] == {
+            "name": "A", "position": "G", "status": "Out", "injury": "Knee", "detail": "Sprain",
+        }
+        assert (pistons.total_out, pistons.total_questionable) == (2, 2)
+        assert reports["Boston Celtics"].summary() == "No significant injuries"
+
+    def test_missing_fields(self):
+        reports = ESPNInjuryClient._parse_injuries({"injuries": [
+            {"injuries": [{"athlete": None, "details": None}]},
+        ]})
+        player = reports["Unknown"].questionable[0]
+        assert player == {"name": "Unknown", "position": "", "status": "", "injury": "", "detail": ""}
+
+    def test_empty_payload(self):
+        assert ESPNInjuryClient._parse_injuries({}) == {}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# In-process caching
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestClientCaching:
+    """Tests for the injury and roster caches and the SPORT_PATHS probe."""
+
+    @pytest.mark.asyncio
+    async def test_injuries_cached_for_ttl(self):
+        http = _mock_http(_espn_injuries({"Detroit Pistons": [("A", "Out")]}))
+        client = ESPNInjuryClient(http)
+        first = await client.get_injuries("basketball_nba")
+        assert await client.get_injuries("basketball_nba") is first
+        assert http.get.call_count == 1
+
+        # Past the TTL the reports are fetched and parsed again
+        fetched_at, reports = injuries._INJURY_CACHE["basketball_nba"]
+        injuries._INJURY_CACHE["basketball_nba"] = (fetched_at - injuries.INJURIES_TTL, reports)
+        assert await client.get_injuries("basketball_nba") is not first
+        assert http.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_roster_cached_per_team(self):
+        http = _mock_http({"athletes": [{"items": [{"displayName": "A", "jersey": "1"}]}]})
+        client = ESPNInjuryClient(http)
+        players = await client.get_team_roster_stats("basketball_nba", "8")
+        assert players[0]["name"] == "A"
+        assert await client.get_team_roster_stats("basketball_nba", "8") is players
+        await client.get_team_roster_stats("basketball_nba", "9")
+        assert http.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unsupported_sport_is_not_fetched(self):
+        http = _mock_http({})
+        client = ESPNInjuryClient(http)
+        assert await client.get_injuries("curling") == {}
+        assert await client.get_team_roster_stats("curling", "1") == []
+        http.get.assert_not_called()
+        assert not injuries._INJURY_CACHE and not injuries._ROSTER_CACHE
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_not_cached(self):
+        http = _mock_http({})
+        http.get.side_effect = RuntimeError("boom")
+        client = ESPNInjuryClient(http)
+        assert await client.get_injuries("basketball_nba") == {}
+        assert "basketball_nba" not in injuries._INJURY_CACHE
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Fuzzy team-name matching
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestBestMatch:
+    """Tests for _best_match."""
+
+    @pytest.mark.parametrize("team,expected", [
+        ("Los Angeles Lakers", "Los Angeles Lakers"),
+        ("Lakers", "Los Angeles Lakers"),
+        ("Pistons", "Detroit Pistons"),
+        ("Detroit", "Detroit Pistons"),
+        ("detroit pistons ", "Detroit Pistons"),
+    ])
+    def test_exact_and_partial_names(self, team, expected):
+        assert _best_match(team, NBA) == expected
+
+    @pytest.mark.parametrize("team,expected", [
+        ("LA Lakers", "Los Angeles Lakers"),
+        ("L.A. Clippers", "LA Clippers"),
+        ("Los Angeles Clippers", "LA Clippers"),
+        ("NY Knicks", "New York Knicks"),
+        ("GS Warriors", "Golden State Warriors"),
+    ])
+    def test_abbreviations(self, team, expected):
+        assert _best_match(team, NBA) == expected
+
+    @pytest.mark.parametrize("team,expected", [
+        ("Red Sox", "Boston Red Sox"),
+        ("White Sox", "Chicago White Sox"),
+        ("NY Mets", "New York Mets"),
+        ("New York Yankees", "New York Yankees"),
+    ])
+    def test_prefers_right_team_over_close_names(self, team, expected):
+        assert _best_match(team, MLB) == expected
+
+    @pytest.mark.parametrize("team,names", [
+        # City rivals score above the cutoff but are different teams
+        ("Los Angeles Clippers", ["Los Angeles Lakers"]),
+        ("New York Rangers", ["New York Knicks", "New York Mets"]),
+        ("Manchester City", ["Manchester United"]),
+        ("Chicago Cubs", ["Chicago White Sox"]),
+    ])
+    def test_close_but_wrong_team_is_rejected(self, team, names):
+        assert _best_match(team, names) is None
+
+    @pytest.mark.parametrize("team", ["Boston Celtics", "Miami Heat", ""])
+    def test_below_cutoff(self, team):
+        assert _best_match(team, NBA) is None
+
+    def test_no_candidates(self):
+        assert _best_match("Lakers", []) is None
+
+    def test_score_at_cutoff_still_needs_same_team(self):
+        # "LA Lakers" / "LA Clippers" scores exactly the cutoff but the
+        # nicknames differ
+        assert fuzz.token_set_ratio("LA Lakers", "LA Clippers", processor=utils.default_process) == FUZZY_MATCH_CUTOFF
+        assert _best_match("LA Lakers", ["LA Clippers"]) is None
+        assert _best_match("LA Lakers", ["LA Clippers", "Lakers"]) == "Lakers"
+
+
+class TestFuzzyMatch:
+    """_fuzzy_match agrees with _best_match on a single candidate."""
+
+    @pytest.mark.parametrize("a,b", [
+        ("Lakers", "Los Angeles Lakers"), ("NY Knicks", "New York Knicks"),
+        ("Los Angeles Clippers", "Los Angeles Lakers"), ("Boston Celtics", "Boston Red Sox"),
+        ("", "Detroit Pistons"),
+    ])
+    def test_agrees_with_best_match(self, a, b):
+        assert _fuzzy_match(a, b) == (_best_match(a, [b]) == b)
+
+
+class TestMatchTeam:
+    """_match_team on a plain dict falls straight through to the fuzzy scorer."""
+
+    def test_plain_dict(self):
+        reports = dict.fromkeys(NBA)
+        assert _match_team("LA Lakers", reports) == "Los Angeles Lakers"
+        assert _match_team("Los Angeles Clippers", {"Los Angeles Lakers": None}) is None
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# InjuryReports name index
+# ═══════════════════════════════════════════════════════════════════════
+
+QUERIES = [
+    "Boston Red Sox", "boston red sox ", "Red Sox", "White Sox", "Sox", "NY Mets",
+    "Chicago Cubs", "Chicago", "New York", "Yankees", "New York Giants", "",
+]
+
+
+class TestInjuryReports:
+    """The index and fuzzy cache must agree with a scan over every name."""
+
+    @pytest.mark.parametrize("names", [
+        MLB,
+        ["Chicago White Sox", "New York Mets"],  # Boston has no report
+        ["Boston Red Sox", "New York Yankees"],  # Chicago has no report
+        [],
+    ])
+    @pytest.mark.parametrize("team", QUERIES)
+    def test_same_as_linear_scan(self, names, team):
+        reports = InjuryReports(dict.fromkeys(names))
+        assert _match_team(team, reports) == _best_match(team, names)
+        # Second lookup answers from the index or the memo
+        assert _match_team(team, reports) == _best_match(team, names)
+
+    def test_shared_nickname_with_one_team_missing(self):
+        # "sox" is unique among these reports, but the Red Sox must not
+        # pick up the White Sox's injuries
+        reports = InjuryReports(dict.fromkeys(["Chicago White Sox", "New York Mets"]))
+        assert _match_team("Boston Red Sox", reports) is None
+        assert _match_team("White Sox", reports) == "Chicago White Sox"
+
+    def test_index_is_case_folded(self):
+        reports = InjuryReports(dict.fromkeys(MLB))
+        assert reports.name_index["boston red sox"] == "Boston Red Sox"
+        assert len(reports.name_index) == len(MLB)
+        with patch("app.injuries._best_match") as scan:
+            assert _match_team("  BOSTON RED SOX ", reports) == "Boston Red Sox"
+        scan.assert_not_called()
+
+    def test_fuzzy_results_are_memoized(self):
+        reports = InjuryReports(dict.fromkeys(MLB))
+        with patch("app.injuries._best_match", wraps=_best_match) as scan:
+            assert _match_team("NY Mets", reports) == "New York Mets"
+            assert _match_team("NY Mets", reports) == "New York Mets"
+            assert _match_team("Miami Marlins", reports) is None
+            assert _match_team("Miami Marlins", reports) is None
+        assert scan.call_count == 2
+        assert reports.fuzzy_cache == {"NY Mets": "New York Mets", "Miami Marlins": None}
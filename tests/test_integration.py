@@ -139,7 +139,7 @@ class TestOddsClientRequest:
         with (
             patch("app.odds_client.settings") as mock_s,
             patch("app.odds_client.save_api_usage") as mock_save_usage,
-            patch("app.odds_client.save_odds"),
+            patch("app.odds_client.save_odds_rows"),
         ):
             mock_s.ODDS_API_BASE_URL = "https://mock.api"
             mock_s.ODDS_API_KEY = "key"
@@ -6,7 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from fastapi.testclient import TestClient
 
-from app.models import RefreshResult
+from app.models import RefreshResult, TeamRecord
 
 
 @pytest.fixture
@@ -136,6 +136,77 @@ class TestApiRefresh:
         assert data["arbitrage_found"] == 1
 
 
+class TestApiPredictions:
+    """Tests for GET /api/predictions."""
+
+    def test_serializes_prediction_models(self, client):
+        from app.models import GamePrediction
+
+        pred = GamePrediction(
+            event_id="e1", sport_key="nfl", home_team="B", away_team="A",
+            commence_time="", predicted_winner="B", home_win_prob=0.6,
+            away_win_prob=0.4, confidence=0.2, confidence_label="lean",
+        )
+        espn = MagicMock()
+        espn.get_team_stats = AsyncMock(return_value={
+            "A": TeamRecord(team="A", wins=5), "B": TeamRecord(team="B", wins=8),
+        })
+        espn.get_scoreboard = AsyncMock(return_value=[])
+        injuries = MagicMock()
+        injuries.get_injuries = AsyncMock(return_value={})
+        with (
+            patch("app.main.ESPNClient", return_value=espn),
+            patch("app.main.ESPNInjuryClient", return_value=injuries),
+            patch("app.main.predict_events", return_value=[pred]),
+            patch("app.main.find_value_bets", return_value=[]),
+        ):
+            resp = client.get("/api/predictions?sport=NFL")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["prediction_count"] == 1
+        assert data["predictions"][0]["predicted_winner"] == "B"
+        assert data["value_bets"] == []
+
+    def test_scoreboard_fallback_without_odds(self, client):
+        espn = MagicMock()
+        espn.get_team_stats = AsyncMock(return_value={
+            "A": TeamRecord(team="A", wins=5), "B": TeamRecord(team="B", wins=8),
+        })
+        espn.get_scoreboard = AsyncMock(return_value=[
+            {"event_id": "g1", "home_team": "B", "away_team": "A", "completed": False},
+        ])
+        injuries = MagicMock()
+        injuries.get_injuries = AsyncMock(side_effect=RuntimeError("espn down"))
+        with (
+            patch("app.main.ESPNClient", return_value=espn),
+            patch("app.main.ESPNInjuryClient", return_value=injuries),
+            patch("app.main.predict_events", return_value=[]) as mock_predict,
+        ):
+            resp = client.get("/api/predictions?sport=NFL")
+        assert resp.status_code == 200
+        assert resp.json()["injuries_loaded"] == 0
+        events = mock_predict.call_args.args[0]
+        assert [e.id for e in events] == ["g1"]
+
+    def test_no_team_stats_skips_predictor(self, client):
+        espn = MagicMock()
+        espn.get_team_stats = AsyncMock(return_value={})
+        injuries = MagicMock()
+        injuries.get_injuries = AsyncMock(return_value={})
+        with (
+            patch("app.main.ESPNClient", return_value=espn),
+            patch("app.main.ESPNInjuryClient", return_value=injuries),
+            patch("app.main.predict_events") as mock_predict,
+        ):
+            resp = client.get("/api/predictions?sport=NFL")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["predictions"] == []
+        assert data["teams_with_stats"] == 0
+        assert data["note"] == "no team stats available"
+        mock_predict.assert_not_called()
+
+
 class TestApiStatus:
     """Tests for GET /api/status."""
 
@@ -11,8 +11,14 @@ from app.models import (
     ArbitrageOpportunity,
     BookmakerOdds,
     Event,
+    GamePrediction,
     OddsOutcome,
+    RawArbLeg,
+    RawArbOpportunity,
     RefreshResult,
+    TeamRecord,
+    ValueBet,
+    iso_now,
 )
 
 
@@ -37,6 +43,11 @@ class TestOddsOutcome:
         with pytest.raises(ValidationError):
             OddsOutcome(name="Chiefs")
 
+    def test_frozen(self):
+        o = OddsOutcome(name="Chiefs", price=-150)
+        with pytest.raises(ValidationError):
+            o.price = -160
+
 
 class TestBookmakerOdds:
     """Tests for BookmakerOdds."""
@@ -109,6 +120,16 @@ class TestEvent:
                 commence_time="2026-01-01T00:00:00Z",
             )
 
+    def test_h2h_bookmakers(self, bookmaker_fanduel):
+        spreads = bookmaker_fanduel.model_copy(update={"market": "spreads"})
+        e = Event(
+            id="e3", sport_key="nba", sport_title="NBA", home_team="H", away_team="A",
+            commence_time="", bookmakers=[spreads, bookmaker_fanduel],
+        )
+        assert e.h2h_bookmakers == [bookmaker_fanduel]
+        assert e.model_copy(update={"bookmakers": [spreads]}).h2h_bookmakers == []
+        assert "h2h_bookmakers" not in e.model_dump()
+
 
 class TestArbLeg:
     """Tests for ArbLeg."""
@@ -171,6 +192,132 @@ class TestArbitrageOpportunity:
         assert isinstance(d["legs"], list)
 
 
+class TestRawArbOpportunity:
+    """Tests for RawArbOpportunity / RawArbLeg."""
+
+    def test_to_pydantic(self):
+        raw = RawArbOpportunity(
+            sport_key="nfl",
+            event_id="e1",
+            event_name="A @ H",
+            home_team="H",
+            away_team="A",
+            commence_time="2026-01-01T00:00:00Z",
+            market="h2h",
+            profit_pct=1.0,
+            total_implied_prob=0.99,
+            legs=(RawArbLeg(outcome="H", bookmaker="B1", price=150, implied_prob=0.4, stake_pct=40.0),),
+        )
+        opp = raw.to_pydantic()
+        assert isinstance(opp, ArbitrageOpportunity)
+        assert isinstance(opp.legs[0], ArbLeg)
+        assert opp.detected_at == raw.detected_at
+        assert opp.model_dump()["legs"][0]["price"] == 150
+
+    def test_frozen(self):
+        leg = RawArbLeg(outcome="H", bookmaker="B1", price=150, implied_prob=0.4, stake_pct=40.0)
+        with pytest.raises(AttributeError):
+            leg.price = 200
+
+
+class TestGamePrediction:
+    """Tests for GamePrediction.cover_reasoning."""
+
+    FIELDS = dict(
+        event_id="e1", sport_key="nfl", home_team="B", away_team="A",
+        commence_time="", predicted_winner="B", home_win_prob=0.6,
+        away_win_prob=0.4, confidence=0.2, confidence_label="lean",
+    )
+
+    COVER = dict(book_spread=-3.5, spread_prediction=6.0, cover_side="home", cover_edge=2.5, reasoning_code=2)
+    TEXT = (
+        "Book spread: B -3.5. Our model projects B winning by +6.0. "
+        "Moderate edge: B has about 2.5 points of cushion beyond the spread."
+    )
+
+    def test_formatted_from_fields(self):
+        pred = GamePrediction(**self.FIELDS, **self.COVER)
+        assert pred.cover_reasoning == self.TEXT
+        assert pred.model_dump()["cover_reasoning"] == self.TEXT
+
+    def test_none_without_code(self):
+        pred = GamePrediction(**self.FIELDS, book_spread=-3.5)
+        assert pred.cover_reasoning is None
+        assert pred.model_dump()["cover_reasoning"] is None
+
+    def test_pick_em_and_away_cover(self):
+        pred = GamePrediction(
+            **self.FIELDS, book_spread=0.0, spread_prediction=-0.3, cover_side="away",
+            cover_edge=0.3, reasoning_code=0,
+        )
+        assert pred.cover_reasoning == (
+            "Book spread: B PK. Our model projects B winning by -0.3. "
+            "Market is very efficient here — our model agrees with the spread."
+        )
+
+    def test_model_copy_update_reformats(self):
+        pred = GamePrediction(**self.FIELDS, **self.COVER)
+        assert pred.cover_reasoning == self.TEXT
+        copy = pred.model_copy(update={"cover_side": "away", "cover_edge": 5.0, "reasoning_code": 3})
+        assert copy.cover_reasoning.endswith(
+            "Strong edge: our margin is 5.0 points beyond the spread — A should cover comfortably."
+        )
+        assert pred.cover_reasoning == self.TEXT
+
+    def test_model_construct(self):
+        pred = GamePrediction.model_construct(**self.FIELDS, **self.COVER)
+        assert pred.cover_reasoning == self.TEXT
+        assert pred.model_dump() == GamePrediction(**self.FIELDS, **self.COVER).model_dump()
+
+    def test_inputs_in_validation_schema(self):
+        properties = GamePrediction.model_json_schema()["properties"]
+        assert {"cover_edge", "reasoning_code"} <= properties.keys()
+        assert "cover_reasoning" in GamePrediction.model_json_schema(mode="serialization")["properties"]
+
+
+class TestTeamRecord:
+    """Tests for TeamRecord derived rates."""
+
+    def test_rates_are_cached(self):
+        r = TeamRecord(team="A", wins=3, losses=1, points_for=100.0, points_against=60.0)
+        assert r.win_pct == 0.75
+        assert r.point_diff == 10.0
+        assert r.__dict__["win_pct"] == 0.75
+        assert r.model_dump().keys() == TeamRecord.model_fields.keys()
+
+    def test_copy_with_update_recomputes(self):
+        r = TeamRecord(team="A", wins=3, losses=1)
+        assert r.win_pct == 0.75
+        assert r.model_copy(update={"wins": 1}).win_pct == 0.5
+
+    def test_last_5_packed_into_bits(self):
+        r = TeamRecord(team="A", last_5=["W", "L", "W", "W", "L"])
+        assert (r.last_5_bits, r.last_5_len) == (0b10110, 5)
+        assert r.last_5 == ["W", "L", "W", "W", "L"]
+        assert r.last_5_win_pct == 0.6
+        assert TeamRecord(team="A").last_5_win_pct == 0.5
+
+
+class TestValueBet:
+    """Tests for ValueBet."""
+
+    FIELDS = dict(
+        event_id="e1", sport_key="nfl", event_name="A @ B", commence_time="",
+        team="B", our_prob=0.6, book_implied_prob=0.5, best_price=100,
+        best_bookmaker="FanDuel", edge_pct=0.1, confidence=0.2,
+        confidence_label="lean", kelly_fraction=0.05,
+    )
+
+    def test_frozen(self):
+        vb = ValueBet(**self.FIELDS)
+        with pytest.raises(ValidationError):
+            vb.edge_pct = 0.5
+
+    def test_extra_fields_rejected(self):
+        with pytest.raises(ValidationError):
+            ValueBet(**self.FIELDS, note="x")
+
+
 class TestRefreshResult:
     """Tests for RefreshResult."""
 
@@ -195,6 +342,26 @@ class TestRefreshResult:
         assert "timestamp" in d
 
 
+class TestIsoNow:
+    """Tests for iso_now."""
+
+    def test_second_resolution_utc(self):
+        parsed = datetime.fromisoformat(iso_now())
+        assert parsed.tzinfo == UTC
+        assert parsed.microsecond == 0
+        assert abs((datetime.now(UTC) - parsed).total_seconds()) < 2
+
+    def test_cached_within_second(self):
+        from unittest.mock import patch
+
+        with patch("app.models.time.time", return_value=1_800_000_000.25):
+            first = iso_now()
+        with patch("app.models.time.time", return_value=1_800_000_000.75):
+            assert iso_now() is first
+        with patch("app.models.time.time", return_value=1_800_000_001.0):
+            assert iso_now() != first
+
+
 class TestApiUsage:
     """Tests for ApiUsage."""
 
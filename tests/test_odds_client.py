@@ -1,8 +1,10 @@
 """Tests for app.odds_client — The Odds API client."""
 
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.database import ODDS_COLUMNS
 from app.models import BookmakerOdds, Event, OddsOutcome
 from app.odds_client import OddsClient
 
@@ -48,6 +50,17 @@ class TestParseEvents:
         assert "Chiefs" in names
         assert "Bills" in names
 
+    def test_team_and_outcome_names_share_one_string(self):
+        data = orjson.loads(orjson.dumps([{
+            "id": "i1", "home_team": "Kansas City Chiefs", "away_team": "Buffalo Bills",
+            "commence_time": "2026-01-01T00:00:00Z",
+            "bookmakers": [{"key": "fd", "title": "FanDuel", "markets": [{
+                "key": "h2h", "outcomes": [{"name": "Kansas City Chiefs", "price": -110}],
+            }]}],
+        }]))
+        ev = OddsClient._parse_events(data, "nfl")[0]
+        assert ev.bookmakers[0].outcomes[0].name is ev.home_team
+
     def test_empty_data(self):
         events = OddsClient._parse_events([], "nfl")
         assert events == []
@@ -119,14 +132,14 @@ class TestParseEvents:
 class TestPersistEvents:
     """Tests for OddsClient.persist_events."""
 
-    @patch("app.odds_client.save_odds")
+    @patch("app.odds_client.save_odds_rows")
     def test_empty_events(self, mock_save):
         with patch("app.odds_client.settings"):
             client = OddsClient()
             client.persist_events([])
             mock_save.assert_called_once_with([])
 
-    @patch("app.odds_client.save_odds")
+    @patch("app.odds_client.save_odds_rows")
     def test_flattens_events_to_rows(self, mock_save, sample_event):
         with patch("app.odds_client.settings"):
             client = OddsClient()
@@ -134,7 +147,8 @@ class TestPersistEvents:
             mock_save.assert_called_once()
             rows = mock_save.call_args[0][0]
             assert len(rows) > 0
-            row = rows[0]
+            assert all(len(r) == len(ODDS_COLUMNS) for r in rows)
+            row = dict(zip(ODDS_COLUMNS, rows[0]))
             assert "sport_key" in row
             assert "event_id" in row
             assert "bookmaker" in row
@@ -142,13 +156,13 @@ class TestPersistEvents:
             assert "price" in row
             assert "fetched_at" in row
 
-    @patch("app.odds_client.save_odds")
+    @patch("app.odds_client.save_odds_rows")
     def test_event_name_format(self, mock_save, sample_event):
         with patch("app.odds_client.settings"):
             client = OddsClient()
             client.persist_events([sample_event])
             rows = mock_save.call_args[0][0]
-            assert rows[0]["event_name"] == "Team B @ Team A"
+            assert dict(zip(ODDS_COLUMNS, rows[0]))["event_name"] == "Team B @ Team A"
 
 
 class TestGetOdds:
@@ -234,6 +248,41 @@ class TestFetchAllSports:
             events, usage = await client.fetch_all_sports()
             assert events == []
 
+    @pytest.mark.asyncio
+    async def test_one_failing_sport_keeps_the_others(self, sample_event):
+        with patch("app.odds_client.settings") as mock_s:
+            mock_s.ODDS_API_BASE_URL = "https://api.example.com/v4"
+            mock_s.ODDS_API_KEY = "key"
+
+            client = OddsClient()
+            client.get_odds = AsyncMock(side_effect=[
+                ([sample_event], {"remaining": "8"}),
+                Exception("network error"),
+                ([], {"remaining": "9"}),
+            ])
+
+            events, usage = await client.fetch_all_sports(sport_keys=["nfl", "nba", "nhl"])
+            assert events == [sample_event]
+            assert usage == {"remaining": "8"}
+
+    @pytest.mark.asyncio
+    async def test_usage_with_fewest_requests_remaining(self):
+        with patch("app.odds_client.settings") as mock_s:
+            mock_s.ODDS_API_BASE_URL = "https://api.example.com/v4"
+            mock_s.ODDS_API_KEY = "key"
+
+            client = OddsClient()
+            # Responses finish in any order; the last sport's need not be newest
+            client.get_odds = AsyncMock(side_effect=[
+                ([], {"used": "11", "remaining": "489"}),
+                ([], {"used": "13", "remaining": "487"}),
+                ([], {"used": "12", "remaining": "488"}),
+                ([], {"used": None, "remaining": None}),
+            ])
+
+            _, usage = await client.fetch_all_sports(sport_keys=["nfl", "nba", "nhl", "mlb"])
+            assert usage == {"used": "13", "remaining": "487"}
+
 
 class TestGetSports:
     """Tests for OddsClient.get_sports (async)."""
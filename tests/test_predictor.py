@@ -0,0 +1,210 @@
+"""Tests for app.predictor — scoring, batch prediction and the prediction cache."""
+
+import numpy as np
+import pytest
+
+from app import predictor
+from app.injuries import InjuryReport
+from app.models import BookmakerOdds, Event, OddsOutcome, TeamRecord
+from app.predictor import bump_stats_version, predict_events, predict_game
+
+
+def _event(i: int = 0, home: str = "Home", away: str = "Away", spread: float = -3.5) -> Event:
+    return Event(
+        id=f"e{i}", sport_key="basketball_nba", sport_title="NBA",
+        home_team=home, away_team=away, commence_time="2026-02-16T20:00:00Z",
+        bookmakers=[
+            BookmakerOdds(
+                bookmaker_key="book", bookmaker_title="Book", market="spreads",
+                outcomes=[
+                    OddsOutcome(name=home, price=-110, point=spread),
+                    OddsOutcome(name=away, price=-110, point=-spread),
+                ],
+            )
+        ],
+    )
+
+
+def _record(team: str, wins: int, losses: int, points_for: float = 5500.0) -> TeamRecord:
+    return TeamRecord(
+        team=team, sport_key="basketball_nba", wins=wins, losses=losses,
+        home_wins=wins // 2, home_losses=losses // 2,
+        away_wins=wins - wins // 2, away_losses=losses - losses // 2,
+        points_for=points_for, points_against=5400.0,
+        streak=2, last_5=["W", "W", "L", "W", "L"],
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    bump_stats_version()
+    yield
+    bump_stats_version()
+
+
+@pytest.fixture
+def stats():
+    return {"Home": _record("Home", 30, 20), "Away": _record("Away", 22, 28, 5300.0)}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Scoring
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestScoreBatch:
+    """Tests for _score_batch, the one scorer behind both predict paths."""
+
+    @pytest.fixture
+    def vectors(self):
+        rng = np.random.default_rng(7)
+        scale = rng.choice([0.1, 1.0, 10.0], size=len(predictor.FEATURE_ORDER))
+        return [tuple(row) for row in (rng.normal(size=(500, len(scale))) * scale).tolist()]
+
+    def test_matches_weighted_sum(self, vectors):
+        for vector, prob in zip(vectors, predictor._score_batch(vectors).tolist()):
+            score = sum(v * predictor.FEATURE_WEIGHTS[k] for k, v in zip(predictor.FEATURE_ORDER, vector))
+            assert prob == pytest.approx(predictor._sigmoid(score), abs=1e-12)
+
+    def test_same_bits_alone_and_in_batch(self, vectors):
+        batch = predictor._score_batch(vectors)
+        alone = np.array([predictor._score_batch([v]).item() for v in vectors])
+        np.testing.assert_array_equal(alone, batch)
+
+    def test_empty(self):
+        assert predictor._score_batch([]).size == 0
+
+    def test_single_and_batch_predictions_agree(self):
+        teams = {t: _record(t, w, 50 - w, 5200.0 + 15 * w) for t, w in zip("ABCDEFGH", range(10, 50, 5))}
+        events = [_event(i, h, a, spread=-0.5 * i) for i, (h, a) in enumerate(zip("ABCDEFGH", "HGFEDCBA"))]
+        injuries = {"B": InjuryReport("B", out=[{"name": "P"}]), "G": InjuryReport("G", doubtful=[{"name": "Q"}])}
+        batch = {p.event_id: p for p in predict_events(events, teams, injuries)}
+        for event in events:
+            bump_stats_version()  # score each game afresh
+            single = predict_game(event, teams, injuries.get(event.home_team), injuries.get(event.away_team))
+            expected = batch[event.id].model_dump(exclude={"predicted_at"})
+            assert single.model_dump(exclude={"predicted_at"}) == expected
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Prediction cache
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestPredictionCache:
+    """Tests for the cache shared by predict_game and predict_events."""
+
+    def test_hit_returns_equal_copy(self, stats):
+        first = predict_game(_event(), stats, predicted_at="t1")
+        second = predict_game(_event(), stats, predicted_at="t2")
+        assert len(predictor._PRED_CACHE) == 1
+        assert second is not first
+        assert second.model_dump(exclude={"predicted_at"}) == first.model_dump(exclude={"predicted_at"})
+        assert (first.predicted_at, second.predicted_at) == ("t1", "t2")
+
+    def test_mutation_does_not_leak(self, stats):
+        first = predict_game(_event(), stats)
+        first.confidence = 0.0
+        first.reasoning = "edited"
+        first.reasoning_code = 0
+        second = predict_game(_event(), stats)
+        assert second.confidence != 0.0
+        assert second.reasoning != "edited"
+        assert second.cover_reasoning != first.cover_reasoning
+
+    def test_shared_between_single_and_batch(self, stats):
+        single = predict_game(_event(), stats)
+        [batch] = predict_events([_event()], stats)
+        assert len(predictor._PRED_CACHE) == 1
+        assert batch.model_dump(exclude={"predicted_at"}) == single.model_dump(exclude={"predicted_at"})
+
+    def test_miss_after_new_stats(self, stats):
+        before = predict_game(_event(), stats)
+        bump_stats_version()
+        assert not predictor._PRED_CACHE
+        # Same objects, but ingested again: the old entry must not be served
+        stats["Home"] = stats["Home"].model_copy(update={"wins": 45, "losses": 5})
+        after = predict_game(_event(), stats)
+        assert after.home_win_prob > before.home_win_prob
+
+    def test_miss_on_new_record_object(self, stats):
+        predict_game(_event(), stats)
+        stats["Home"] = _record("Home", 45, 5)
+        predict_game(_event(), stats)
+        assert len(predictor._PRED_CACHE) == 2
+
+    def test_miss_on_new_injury_report(self, stats):
+        healthy = InjuryReport("Home")
+        hurt = InjuryReport("Home", out=[{"name": f"P{i}"} for i in range(5)])
+        a = predict_game(_event(), stats, healthy)
+        b = predict_game(_event(), stats, hurt)
+        assert b.home_win_prob < a.home_win_prob
+
+    def test_miss_on_spread_move(self, stats):
+        a = predict_game(_event(spread=-3.5), stats)
+        b = predict_game(_event(spread=-7.5), stats)
+        assert (a.book_spread, b.book_spread) == (-3.5, -7.5)
+
+    def test_identity_checked_not_just_id(self, stats):
+        key, refs = predictor._prediction_key(_event(), stats, None, None)
+        assert predictor._cache_get(key, refs, "t") is None
+        predict_game(_event(), stats)
+        assert predictor._cache_get(key, refs, "t") is not None
+        # An entry stored for other objects (as if an id() were reused) is not a hit
+        stale = (_record("Home", 1, 49), *refs[1:])
+        predictor._PRED_CACHE[key] = (stale, predictor._PRED_CACHE[key][1])
+        assert predictor._cache_get(key, refs, "t") is None
+
+    def test_evicts_least_recently_used(self, stats, monkeypatch):
+        monkeypatch.setattr(predictor, "_PRED_CACHE_SIZE", 3)
+        for i in range(3):
+            predict_game(_event(i), stats)
+        predict_game(_event(0), stats)  # refresh e0
+        predict_game(_event(3), stats)  # evicts e1
+        cached = [key[1] for key in predictor._PRED_CACHE]
+        assert cached == ["e2", "e0", "e3"]
+        assert len(predictor._PRED_CACHE) == 3
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# predict_events
+# ═══════════════════════════════════════════════════════════════════════
+
+def _dump(predictions) -> list[dict]:
+    return [p.model_dump(exclude={"predicted_at"}) for p in predictions]
+
+
+class TestPredictEvents:
+    """Tests for predict_events."""
+
+    @pytest.fixture
+    def slate(self):
+        """Six games, three pairs of which tie on confidence."""
+        teams = {
+            "A": _record("A", 40, 10), "B": _record("B", 10, 40, 5300.0),
+            "C": _record("C", 26, 24), "D": _record("D", 24, 26, 5450.0),
+        }
+        pairs = [("A", "B"), ("C", "D"), ("A", "B"), ("B", "A"), ("C", "D"), ("D", "C")]
+        return [_event(i, home, away, spread=-1.5) for i, (home, away) in enumerate(pairs)], teams
+
+    def test_sorted_by_confidence(self, slate):
+        predictions = predict_events(*slate)
+        assert len(predictions) == 6
+        confidences = [p.confidence for p in predictions]
+        assert confidences == sorted(confidences, reverse=True)
+        assert len(set(confidences)) < len(confidences)  # the fixture has ties
+
+    @pytest.mark.parametrize("warm", [False, True])
+    @pytest.mark.parametrize("k", [0, 1, 2, 3, 5, 6, 10])
+    def test_top_k_matches_full_sort(self, slate, k, warm):
+        full = predict_events(*slate)
+        if not warm:
+            bump_stats_version()
+        # Ties keep event order, as in the stable full sort
+        assert _dump(predict_events(*slate, top_k=k)) == _dump(full[:k])
+
+    def test_top_k_builds_only_kept_predictions(self, slate):
+        predict_events(*slate, top_k=2)
+        assert len(predictor._PRED_CACHE) == 2
+
+    def test_empty(self):
+        assert predict_events([], {}) == []
+        assert predict_events([], {}, top_k=3) == []
@@ -48,6 +48,7 @@ class TestRefreshOdds:
             assert result.events_fetched == 0
             assert result.arbitrage_found == 0
             assert result.api_requests_remaining == 495
+            mock_client.persist_events.assert_called_once_with([])
             mock_client.close.assert_awaited_once()
 
     @pytest.mark.asyncio
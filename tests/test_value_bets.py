@@ -0,0 +1,177 @@
+"""Tests for app.value_bets — Kelly sizing and the value-bet kernels."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app._value_kernels import (
+    _kelly_batch_loop,
+    _kelly_batch_numpy,
+    _value_edges_loop,
+    _value_edges_numpy,
+    kelly_batch,
+)
+from app.models import BookmakerOdds, Event, GamePrediction, OddsOutcome, ValueBet
+from app.value_bets import _best_h2h_prices, find_value_bets, kelly_criterion
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# kelly_criterion
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestKellyCriterion:
+    """Tests for kelly_criterion."""
+
+    def test_quarter_kelly(self):
+        # p=0.6 at even money: full Kelly 0.2, quarter Kelly 0.05
+        assert kelly_criterion(0.6, 2.0) == pytest.approx(0.05)
+
+    def test_no_edge_is_zero(self):
+        assert kelly_criterion(0.4, 2.0) == 0.0
+
+    def test_never_exceeds_quarter_bankroll(self):
+        assert 0.0 < kelly_criterion(0.99, 50.0) <= 0.25
+
+    @pytest.mark.parametrize("prob,decimal", [(0.0, 2.0), (1.0, 2.0), (0.6, 1.0), (0.6, 0.5)])
+    def test_out_of_range_inputs(self, prob, decimal):
+        assert kelly_criterion(prob, decimal) == 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# _best_h2h_prices
+# ═══════════════════════════════════════════════════════════════════════
+
+def _game(lines: dict[str, list[tuple[int, int]]]) -> tuple[GamePrediction, Event]:
+    """A Home vs Away game; ``lines`` maps bookmaker -> [(home price, away price)]."""
+    pred = GamePrediction(
+        event_id="e1", sport_key="nba", home_team="Home", away_team="Away",
+        commence_time="", predicted_winner="Home", home_win_prob=0.6,
+        away_win_prob=0.4, confidence=0.2, confidence_label="lean",
+    )
+    event = Event(
+        id="e1", sport_key="nba", sport_title="NBA", home_team="Home",
+        away_team="Away", commence_time="",
+        bookmakers=[
+            BookmakerOdds(
+                bookmaker_key=book.lower(), bookmaker_title=book, market=market,
+                outcomes=[OddsOutcome(name="Home", price=home), OddsOutcome(name="Away", price=away)],
+            )
+            for book, (home, away) in lines.items()
+            for market in ("h2h", "spreads")
+        ],
+    )
+    return pred, event
+
+
+class TestBestH2HPrices:
+    """Tests for the best-price reduction behind find_value_bets."""
+
+    def test_best_price_per_side(self):
+        prices, books = _best_h2h_prices([_game({"A": (-150, 130), "B": (-140, 120), "C": (-160, 135)})])
+        assert prices.tolist() == [-140, 135]
+        assert books == ["B", "C"]
+
+    def test_even_money_tie_keeps_first_book(self):
+        prices, books = _best_h2h_prices([_game({"A": (-100, -110), "B": (100, -110)})])
+        assert (prices.tolist(), books) == ([-100, -110], ["A", "A"])
+
+    def test_out_of_range_prices(self):
+        prices, _ = _best_h2h_prices([_game({"A": (50, -50), "B": (150, 12000)})])
+        assert prices.tolist() == [150, 12000]
+
+    def test_unquoted_side(self):
+        prices, books = _best_h2h_prices([_game({})])
+        assert (prices.tolist(), books) == ([0, 0], ["", ""])
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# find_value_bets
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestFindValueBets:
+    """Tests for find_value_bets."""
+
+    @pytest.fixture
+    def slate(self):
+        games = []
+        for i, (home, away) in enumerate([(-110, 150), (120, 200), (-300, 400)]):
+            pred, event = _game({"A": (home, away)})
+            pred = pred.model_copy(update={"event_id": f"e{i}", "home_win_prob": 0.55, "away_win_prob": 0.45})
+            games.append((pred, event.model_copy(update={"id": f"e{i}"})))
+        return [p for p, _ in games], [e for _, e in games]
+
+    def test_sorted_by_edge(self, slate):
+        bets = find_value_bets(*slate, min_confidence=0.0)
+        assert [(b.event_id, b.team) for b in bets] == [
+            ("e2", "Away"), ("e1", "Away"), ("e1", "Home"), ("e0", "Away"),
+        ]
+        assert bets[0].best_bookmaker == "A"
+
+    @pytest.mark.parametrize("k", [0, 1, 3, 10])
+    def test_top_k_matches_full_sort(self, slate, k):
+        full = find_value_bets(*slate, min_confidence=0.0)
+        assert find_value_bets(*slate, min_confidence=0.0, top_k=k) == full[:k]
+
+    def test_first_bet_validated_in_debug_mode(self, slate):
+        with patch.object(ValueBet, "model_validate", wraps=ValueBet.model_validate) as validate:
+            bets = find_value_bets(*slate, min_confidence=0.0)
+        validate.assert_called_once()
+        assert ValueBet.model_validate(validate.call_args.args[0]) in bets
+
+    def test_constructed_bets_pass_validation(self, slate):
+        for bet in find_value_bets(*slate, min_confidence=0.0):
+            assert ValueBet.model_validate(bet.model_dump()) == bet
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# kelly_batch kernel
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestKellyBatchKernel:
+    """The scalar (Numba) loop and the NumPy fallback must match kelly_criterion."""
+
+    @pytest.fixture
+    def inputs(self):
+        probs = np.array([0.6, 0.4, 0.99, 0.0, 1.0, 0.6, 0.55, 0.7, 0.3])
+        decimals = np.array([2.0, 2.0, 50.0, 2.0, 2.0, 1.0, 1.909, 1.5, 4.5])
+        return probs, decimals
+
+    def test_matches_scalar(self, inputs):
+        expected = [kelly_criterion(p, d) for p, d in zip(*inputs)]
+        for impl in (_kelly_batch_loop, _kelly_batch_numpy, kelly_batch):
+            assert impl(*inputs).tolist() == expected
+
+    def test_empty(self):
+        assert kelly_batch(np.array([]), np.array([])).size == 0
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# compute_value_edges kernel
+# ═══════════════════════════════════════════════════════════════════════
+
+class TestValueEdgesKernel:
+    """The fused (Numba) loop and the NumPy fallback must agree."""
+
+    @pytest.fixture
+    def sides(self):
+        prices = np.array([150, -200, 0, -110, 12000, 100], dtype=np.int64)
+        probs = np.array([0.45, 0.6, 0.9, 0.5, 0.02, 0.55])
+        return prices, probs
+
+    def test_loop_matches_numpy(self, sides):
+        loop = _value_edges_loop(*sides, 0.03)
+        vec = _value_edges_numpy(*sides, 0.03)
+        assert loop[3].tolist() == vec[3].tolist()
+        hits = vec[3]
+        for a, b in zip(loop[:3], vec[:3]):
+            np.testing.assert_array_equal(a[hits], b[hits])
+
+    def test_edges_and_kelly(self, sides):
+        implied, edges, kellys, hits = _value_edges_numpy(*sides, 0.03)
+        # +150 → 0.4 implied, 5% edge; the unquoted side never surfaces
+        assert hits.tolist() == [True, False, False, False, False, True]
+        assert implied[0] == pytest.approx(0.4)
+        assert edges[0] == pytest.approx(0.05)
+        assert kellys[0] == kelly_criterion(0.45, 2.5)
+        assert kellys[1] == 0.0